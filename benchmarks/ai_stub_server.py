@@ -0,0 +1,440 @@
+"""Local OpenAI-compatible chat-completions server for offline load testing.
+
+Answers ``POST /v1/chat/completions`` with canned, template-filled JSON for
+each kind of prompt the game sends (enemy, puzzle, treasure, trap, NPC,
+dialogue, quest, NPC reply, chat summary, class and art), with configurable
+latency and injected failures. Point the game at it with ``OPENAI_BASE_URL``:
+
+    python -m benchmarks.ai_stub_server --port 8089 \\
+        --latency lognormal:0.6,0.5 --error-rate 0.05 --malformed-rate 0.1
+    OPENAI_BASE_URL=http://127.0.0.1:8089/v1 python main.py
+
+Requests with ``"stream": true`` are answered as server-sent events, one
+small chunk every ``--chunk-interval`` seconds after the initial latency.
+Requests with a ``response_format`` are never malformed, as a provider
+enforcing JSON output would; ``--structured`` limits the accepted modes
+and rejects the rest with a 400, like models without structured output.
+``GET /stats`` returns request counts by prompt kind and outcome.
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+NAMES = ["Hollow Warden", "Sister Vell", "The Lantern Saint", "Ashgrave", "Mirelle"]
+ADJECTIVES = ["ashen", "hollow", "gilded", "weeping", "fractured", "luminous"]
+ART_CHARACTERS = "░▒▓█▀▄╱╲"
+STREAM_CHUNK_CHARS = 4  # Roughly one token per streamed chunk
+STRUCTURED_MODES = ["json_schema", "json_object", "none"]
+# JSON modes return objects, so list answers are wrapped under these keys
+LIST_KEYS = {"dialogue": "dialogues", "quest": "quests"}
+
+# Checked in order; the first marker found in the prompt decides its kind
+PROMPT_KINDS: List[Tuple[str, str]] = [
+    ("art", "ascii art"),
+    ("dialogue", "dialogue options"),
+    ("quest", "quests that npc"),
+    ("npc_response", "generate a response from npc"),
+    ("summary", "summarize a conversation"),
+    ("npc", "generate a unique npc"),
+    ("puzzle", "puzzle encounter"),
+    ("treasure", "hidden treasure"),
+    ("trap", "trap the player"),
+    ("enemy", "unique enemy"),
+    ("class", "character class"),
+]
+
+
+def classify(prompt: str) -> str:
+    lowered = prompt.lower()
+    for kind, marker in PROMPT_KINDS:
+        if marker in lowered:
+            return kind
+    return "generic"
+
+
+def _phrase(rng: random.Random) -> str:
+    return f"A {rng.choice(ADJECTIVES)} figure bathed in false light"
+
+
+def _enemy(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "name": rng.choice(NAMES),
+        "description": _phrase(rng),
+        "health": rng.randint(70, 140),
+        "attack": rng.randint(10, 20),
+        "defense": rng.randint(4, 10),
+        "level": rng.randint(1, 5),
+    }
+
+
+def _npc(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "name": rng.choice(NAMES),
+        "description": _phrase(rng),
+        "lore": "They once tended the lamps of the cathedral. Now they tend to nothing.",
+        "faction": rng.choice(["Corrupted", "Resistance", "Neutral", "Transformed"]),
+        "level": rng.randint(1, 5),
+        "greeting": "Another pilgrim chasing the light?",
+    }
+
+
+def _dialogue(rng: random.Random) -> List[Dict[str, Any]]:
+    return [
+        {
+            "text": f"The {rng.choice(ADJECTIVES)} bells rang again last night.",
+            "responses": [
+                {
+                    "text": f"Response {n}",
+                    "action": "You learn a little more",
+                    "relationship_change": rng.randint(-10, 10),
+                }
+                for n in range(1, 4)
+            ],
+        }
+        for _ in range(3)
+    ]
+
+
+def _quest(rng: random.Random) -> List[Dict[str, Any]]:
+    return [
+        {
+            "name": f"The {rng.choice(ADJECTIVES).title()} Relic",
+            "description": "Recover what the faithful buried.",
+            "objective": "Collect corrupted relics",
+            "dialogue": "Bring me what they took, and I will remember you.",
+            "reward_gold": rng.randint(20, 80),
+            "reward_exp": rng.randint(40, 160),
+            "required_progress": rng.randint(1, 3),
+            "min_level": 1,
+        }
+    ]
+
+
+def _class(rng: random.Random) -> Dict[str, Any]:
+    skill = lambda name: {
+        "name": name,
+        "damage": rng.randint(15, 30),
+        "mana_cost": rng.randint(10, 25),
+        "cooldown": rng.randint(1, 3),
+        "description": "A strike wreathed in twisted hope",
+    }
+    return {
+        "name": f"{rng.choice(ADJECTIVES).title()} Harbinger",
+        "description": _phrase(rng),
+        "base_health": rng.randint(90, 120),
+        "base_attack": rng.randint(14, 18),
+        "base_defense": rng.randint(4, 7),
+        "base_mana": rng.randint(70, 100),
+        "skills": [skill("Gloam Strike"), skill("Hollow Prayer")],
+    }
+
+
+def _art(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "ascii_art": [
+            "".join(rng.choice(ART_CHARACTERS + "  ") for _ in range(30))
+            for _ in range(15)
+        ]
+    }
+
+
+TEMPLATES: Dict[str, Callable[[random.Random], Any]] = {
+    "enemy": _enemy,
+    "puzzle": lambda rng: {
+        "scene": "A door of bone bears three empty sockets.",
+        "puzzle": "I am given to the hopeless and taken from the faithful. What am I?",
+        "solution": "despair",
+        "reward": {"type": "gold", "amount": rng.randint(10, 30)},
+        "hints": ["It is a feeling", "The God of Hope feeds on its absence"],
+    },
+    "treasure": lambda rng: {
+        "description": f"Beneath a {rng.choice(ADJECTIVES)} shrine lies a purse."
+    },
+    "trap": lambda rng: {
+        "description": "Threads of light cross the corridor.",
+        "triggered_text": "The threads tighten and burn.",
+        "evaded_text": "You slip between the strands.",
+    },
+    "npc": _npc,
+    "dialogue": _dialogue,
+    "quest": _quest,
+    "class": _class,
+    "art": _art,
+    "generic": lambda rng: {"description": _phrase(rng)},
+}
+
+
+def malform(content: str, rng: random.Random) -> str:
+    """Break JSON the ways models tend to: quotes, commas, fences, truncation"""
+    mode = rng.choice(["quotes", "comma", "fence", "truncate"])
+    if mode == "quotes":
+        return content.replace('"', "'")
+    if mode == "comma":
+        return content[:-1] + ",}" if content.endswith("}") else content + ","
+    if mode == "fence":
+        return f"```json\n{content}\n```\nHope this helps!"
+    return content[: max(1, len(content) // 2)]
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """``fixed:S``, ``uniform:LO,HI``, ``normal:MEAN,SD`` or ``lognormal:MEDIAN,SIGMA``"""
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",") if v]
+    if kind == "fixed":
+        return lambda rng: values[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal":
+        return lambda rng: rng.lognormvariate(math.log(values[0]), values[1])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+class StubState:
+    """Configuration and counters shared by the handler threads"""
+
+    def __init__(
+        self,
+        latency: Callable[[random.Random], float],
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        malformed_rate: float = 0.0,
+        seed: Optional[int] = None,
+        chunk_interval: float = 0.02,
+        structured: str = "json_schema",
+    ):
+        self.latency = latency
+        # Modes from ``structured`` down are accepted
+        self.response_formats = set(
+            STRUCTURED_MODES[STRUCTURED_MODES.index(structured) :]
+        )
+        self.chunk_interval = chunk_interval
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.malformed_rate = malformed_rate
+        self.rng = random.Random(seed)
+        self.counts: Counter = Counter()
+        # System prompts already sent, to report prefix cache hits
+        self.seen_prefixes: set = set()
+        self.lock = threading.Lock()
+
+    def decide(self) -> Tuple[float, bool, bool, random.Random]:
+        """Draw latency and failure injection for one request"""
+        with self.lock:
+            delay = self.latency(self.rng)
+            fail = self.rng.random() < self.error_rate
+            broken = self.rng.random() < self.malformed_rate
+            rng = random.Random(self.rng.random())
+        return delay, fail, broken, rng
+
+    def count(self, kind: str, outcome: str):
+        with self.lock:
+            self.counts[f"{kind}:{outcome}"] += 1
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server_version = "TerminalQuestAIStub/1.0"
+    state: StubState
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body: Dict[str, Any]):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/stats":
+            with self.state.lock:
+                counts = dict(self.state.counts)
+            self._send_json(200, counts)
+        else:
+            self._send_json(404, {"error": {"message": "Not found"}})
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "Not found"}})
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        messages = request.get("messages", [])
+        prompt = messages[-1].get("content", "") if messages else ""
+        kind = classify(prompt)
+
+        delay, fail, broken, rng = self.state.decide()
+        time.sleep(delay)
+
+        if fail:
+            self.state.count(kind, "error")
+            self._send_json(
+                self.state.error_status,
+                {"error": {"message": "Injected failure", "type": "server_error"}},
+            )
+            return
+
+        response_format = (request.get("response_format") or {}).get("type")
+        if response_format and response_format not in self.state.response_formats:
+            self.state.count(kind, "rejected")
+            self._send_json(
+                400,
+                {
+                    "error": {
+                        "message": f"Invalid parameter: 'response_format' of type "
+                        f"'{response_format}' is not supported with this model.",
+                        "type": "invalid_request_error",
+                        "param": "response_format",
+                    }
+                },
+            )
+            return
+
+        if kind == "npc_response":
+            content = "The light lies, traveler. It always has."
+        elif kind == "summary":
+            content = "The pilgrim asked about the bells and swore to find the relic."
+        else:
+            data = TEMPLATES[kind](rng)
+            if response_format and isinstance(data, list):
+                data = {LIST_KEYS[kind]: data}
+            content = json.dumps(data)
+        if response_format:
+            self.state.count(kind, response_format)
+        elif broken:
+            content = malform(content, rng)
+            self.state.count(kind, "malformed")
+        else:
+            self.state.count(kind, "ok")
+
+        prompt_tokens = sum(len(m.get("content", "")) for m in messages) // 4
+        completion_tokens = len(content) // 4
+        system = messages[0].get("content", "") if len(messages) > 1 else ""
+        with self.state.lock:
+            cached = len(system) // 4 if system in self.state.seen_prefixes else 0
+            self.state.seen_prefixes.add(system)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached},
+        }
+        if request.get("stream"):
+            include_usage = (request.get("stream_options") or {}).get("include_usage")
+            self._send_stream(request, content, usage if include_usage else None)
+            return
+        self._send_json(
+            200,
+            {
+                "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "stub"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": usage,
+            },
+        )
+
+    def _send_stream(
+        self, request: Dict[str, Any], content: str, usage: Optional[Dict[str, int]]
+    ):
+        """Send ``content`` as chat.completion.chunk events, a few characters each"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        base = {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": request.get("model", "stub"),
+        }
+
+        def event(choices: List[Dict[str, Any]], **extra):
+            body = dict(base, choices=choices, **extra)
+            self.wfile.write(f"data: {json.dumps(body)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        event([{"index": 0, "delta": {"role": "assistant"}, "finish_reason": None}])
+        for start in range(0, len(content), STREAM_CHUNK_CHARS):
+            time.sleep(self.state.chunk_interval)
+            piece = content[start : start + STREAM_CHUNK_CHARS]
+            event([{"index": 0, "delta": {"content": piece}, "finish_reason": None}])
+        event([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+        if usage:
+            event([], usage=usage)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+def make_server(host: str, port: int, state: StubState) -> ThreadingHTTPServer:
+    """Build a server whose handlers share ``state``; port 0 picks a free one"""
+    handler = type("BoundStubHandler", (StubHandler,), {"state": state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", default="fixed:0", help=parse_latency.__doc__)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument(
+        "--chunk-interval",
+        type=float,
+        default=0.02,
+        help="Seconds between streamed chunks",
+    )
+    parser.add_argument(
+        "--structured",
+        choices=STRUCTURED_MODES,
+        default="json_schema",
+        help="Strongest response_format accepted (none rejects them all)",
+    )
+    args = parser.parse_args()
+
+    state = StubState(
+        parse_latency(args.latency),
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        malformed_rate=args.malformed_rate,
+        seed=args.seed,
+        chunk_interval=args.chunk_interval,
+        structured=args.structured,
+    )
+    server = make_server(args.host, args.port, state)
+    print(f"Serving on http://{args.host}:{server.server_address[1]}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(dict(sorted(state.counts.items())), indent=2))
+
+
+if __name__ == "__main__":
+    main()
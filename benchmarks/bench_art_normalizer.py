@@ -0,0 +1,91 @@
+"""Benchmark vectorized art normalization against the per-character loop.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_art_normalizer --count 20000
+"""
+
+import argparse
+import random
+import time
+from typing import List
+
+from src.services.art_generator import ArtGenerationConfig
+from src.utils.art_normalizer import ArtNormalizer
+
+
+def legacy_normalize(art: str, config: ArtGenerationConfig) -> str:
+    """The original line-by-line loop from ``_generate_art``"""
+    lines = art.split("\n")
+    if len(lines) > config.height:
+        lines = lines[: config.height]
+
+    valid_chars = set(config.characters)
+    filtered_lines = []
+    for line in lines:
+        line = line[: config.width]
+        filtered_line = "".join(
+            c if c in valid_chars or c in "║╔╗╚╝ " else " " for c in line
+        )
+        filtered_line = filtered_line.ljust(config.width)
+        filtered_lines.append(filtered_line)
+
+    while len(filtered_lines) < config.height:
+        filtered_lines.append(" " * config.width)
+
+    return "\n".join(filtered_lines)
+
+
+def make_arts(count: int, config: ArtGenerationConfig, seed: int) -> List[str]:
+    """Build noisy art samples with ragged lines and out-of-palette characters"""
+    rng = random.Random(seed)
+    alphabet = config.characters + "║╔╗╚╝ abcXYZ#@═"
+    arts = []
+    for _ in range(count):
+        rows = rng.randint(config.height - 3, config.height + 3)
+        arts.append(
+            "\n".join(
+                "".join(
+                    rng.choice(alphabet)
+                    for _ in range(rng.randint(0, config.width + 8))
+                )
+                for _ in range(rows)
+            )
+        )
+    return arts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    config = ArtGenerationConfig(width=30, height=15)
+    normalizer = ArtNormalizer(config.width, config.height, config.characters)
+    arts = make_arts(args.count, config, args.seed)
+
+    start = time.perf_counter()
+    expected = [legacy_normalize(art, config) for art in arts]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    grids = normalizer.to_array_batch(arts)
+    batch_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rendered = [normalizer.to_text(grid) for grid in grids]
+    render_time = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(expected, rendered) if a != b)
+
+    print(f"arts:              {args.count}")
+    print(f"legacy loop:       {legacy_time * 1000:9.1f} ms")
+    print(f"vectorized batch:  {batch_time * 1000:9.1f} ms")
+    print(f"array -> text:     {render_time * 1000:9.1f} ms")
+    print(f"speedup (arrays):  {legacy_time / batch_time:9.1f}x")
+    print(f"mismatches:        {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
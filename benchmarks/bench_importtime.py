@@ -0,0 +1,112 @@
+"""Report cold-start import cost of main.py from ``python -X importtime``.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_importtime --repeat 5 --top 25
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Third-party modules whose presence at startup is a regression
+WATCHED_MODULES = ("openai", "psycopg2", "numpy", "httpx")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """Parse importtime lines into (module, self_us, cumulative_us, depth)"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        fields = line[len("import time:") :].split("|")
+        self_us, cumulative_us, name = fields[0], fields[1], fields[2]
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def measure(target: str) -> List[Tuple[str, int, int, int]]:
+    """Import ``target`` in a fresh interpreter and return its import tree"""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"Importing {target} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", default="main")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--json", help="Write the table to this JSON file")
+    args = parser.parse_args()
+
+    cumulative: Dict[str, List[int]] = defaultdict(list)
+    self_time: Dict[str, List[int]] = defaultdict(list)
+    depths: Dict[str, int] = {}
+    for _ in range(args.repeat):
+        for name, self_us, cumulative_us, depth in measure(args.target):
+            cumulative[name].append(cumulative_us)
+            self_time[name].append(self_us)
+            depths.setdefault(name, depth)
+
+    rows = sorted(
+        (
+            (
+                name,
+                statistics.median(cumulative[name]) / 1000,
+                statistics.median(self_time[name]) / 1000,
+                depths[name],
+            )
+            for name in cumulative
+        ),
+        key=lambda row: row[1],
+        reverse=True,
+    )
+    total_ms = statistics.median(cumulative[args.target]) / 1000
+    loaded = set(cumulative)
+
+    print(f"import {args.target}: {total_ms:.1f} ms (median of {args.repeat})")
+    print(f"modules imported:  {len(loaded)}")
+    for module in WATCHED_MODULES:
+        print(f"  {module:<10} {'LOADED' if module in loaded else 'not loaded'}")
+    print()
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, cumulative_ms, self_ms, depth in rows[: args.top]:
+        print(f"{cumulative_ms:14.1f} {self_ms:9.1f}  {'  ' * depth}{name}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {
+                    "target": args.target,
+                    "total_ms": total_ms,
+                    "watched": {m: m in loaded for m in WATCHED_MODULES},
+                    "modules": [
+                        {"module": n, "cumulative_ms": c, "self_ms": s}
+                        for n, c, s, _ in rows
+                    ],
+                },
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""Fuzz and benchmark JSON extraction from AI responses.
+
+Generates response documents for each schema, breaks them the ways models
+do, and checks ``parse_response`` against the original data:
+
+* lossless mutations (fences, single quotes, trailing commas, Python
+  literals, raw newlines, unescaped quotes, bare keys, missing commas)
+  must round-trip exactly;
+* lossy ones (truncation, random character damage) may fail, but only
+  with ``ValueError``.
+
+Then times the old pipeline (``JSONCleaner`` blind replacement, then a
+re-parse in ``generate_content`` and another in the caller) against the
+single-pass parser. Exits non-zero on a crash or a lossless mismatch.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_json_extract --count 2000
+"""
+
+import argparse
+import dataclasses
+import json
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.services.ai_schemas import ArtData, EnemyData, NPCData, PuzzleData
+from src.utils.response_parser import parse_response
+
+WORDS = [
+    "hollow",
+    "ashen",
+    "the God's light",
+    "naïve",
+    "lantern—saint",
+    'said "hope"',
+    "50% brighter",
+    "{braces}",
+    "[brackets]",
+    "colon: here",
+    "comma, there",
+    "back\\slash",
+]
+ART_CHARACTERS = "░▒▓█▀▄╱╲ "
+
+
+def sentence(rng: random.Random, words: int = 6) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, words)))
+
+
+def make_document(rng: random.Random) -> Tuple[type, Dict[str, Any]]:
+    kind = rng.choice([EnemyData, PuzzleData, NPCData, ArtData])
+    if kind is EnemyData:
+        data = {
+            "name": sentence(rng, 2),
+            "description": sentence(rng),
+            "health": rng.randint(60, 400),
+            "attack": rng.randint(8, 60),
+            "defense": rng.randint(3, 30),
+            "level": rng.randint(1, 20),
+        }
+    elif kind is PuzzleData:
+        data = {
+            "scene": sentence(rng),
+            "puzzle": sentence(rng, 12),
+            "solution": sentence(rng, 1),
+            "reward": {"type": rng.choice(["gold", "mana"]), "amount": 15},
+            "hints": [sentence(rng, 3) for _ in range(rng.randint(0, 3))],
+        }
+    elif kind is NPCData:
+        data = {
+            "name": sentence(rng, 2),
+            "description": sentence(rng),
+            "lore": sentence(rng, 20),
+            "faction": rng.choice(["Corrupted", "Resistance"]),
+            "level": rng.randint(1, 20),
+            "greeting": sentence(rng),
+        }
+    else:
+        data = {
+            "ascii_art": [
+                "".join(rng.choice(ART_CHARACTERS) for _ in range(30))
+                for _ in range(rng.randint(4, 12))
+            ]
+        }
+    return kind, data
+
+
+@dataclasses.dataclass
+class Style:
+    """How ``dump`` deviates from strict JSON"""
+
+    quote: str = '"'
+    trailing_commas: bool = False
+    python_literals: bool = False
+    raw_newlines: bool = False
+    escape_quotes: bool = True
+    bare_keys: bool = False
+    separator: str = ", "
+
+
+def dump_string(text: str, style: Style) -> str:
+    body = text.replace("\\", "\\\\")
+    if style.escape_quotes and style.quote == '"':
+        body = body.replace('"', '\\"')
+    if not style.raw_newlines:
+        body = body.replace("\n", "\\n")
+    return f"{style.quote}{body}{style.quote}"
+
+
+def dump(value: Any, style: Style) -> str:
+    """Serialize like a careless model would, according to ``style``"""
+    trailing = style.separator.strip() if style.trailing_commas else ""
+    if isinstance(value, dict):
+        items = [
+            f"{key if style.bare_keys else dump_string(key, style)}: "
+            f"{dump(item, style)}"
+            for key, item in value.items()
+        ]
+        return "{" + style.separator.join(items) + (trailing if items else "") + "}"
+    if isinstance(value, list):
+        items = [dump(item, style) for item in value]
+        return "[" + style.separator.join(items) + (trailing if items else "") + "]"
+    if isinstance(value, str):
+        return dump_string(value, style)
+    if style.python_literals and (value is None or isinstance(value, bool)):
+        return repr(value)
+    return json.dumps(value)
+
+
+def with_flags(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Add literals the schemas ignore, to exercise True/False/None"""
+    return dict(data, alive=True, cursed=False, owner=None)
+
+
+LOSSLESS: Dict[str, Callable[[Dict[str, Any], random.Random], str]] = {
+    "strict": lambda d, rng: json.dumps(d, ensure_ascii=False),
+    "fenced": lambda d, rng: (
+        f"Here is the JSON:\n```json\n{json.dumps(d, indent=2)}\n```\nHope this helps!"
+    ),
+    "single_quotes": lambda d, rng: dump(d, Style(quote="'")),
+    "trailing_commas": lambda d, rng: dump(d, Style(trailing_commas=True)),
+    "python_literals": lambda d, rng: dump(
+        with_flags(d), Style(quote="'", python_literals=True)
+    ),
+    "raw_newlines": lambda d, rng: dump(
+        {k: v.replace(" ", "\n", 1) if isinstance(v, str) else v for k, v in d.items()},
+        Style(raw_newlines=True),
+    ),
+    "unescaped_quotes": lambda d, rng: dump(d, Style(escape_quotes=False)),
+    "bare_keys": lambda d, rng: dump(d, Style(bare_keys=True)),
+    "missing_commas": lambda d, rng: dump(d, Style(separator="\n")),
+}
+
+
+def truncate(text: str, rng: random.Random) -> str:
+    return text[: rng.randint(1, max(1, len(text) - 1))]
+
+
+def damage(text: str, rng: random.Random) -> str:
+    chars = list(text)
+    for _ in range(rng.randint(1, 4)):
+        chars[rng.randrange(len(chars))] = rng.choice("{}[]\"',:\\ x")
+    return "".join(chars)
+
+
+LOSSY: Dict[str, Callable[[str, random.Random], str]] = {
+    "truncated": truncate,
+    "damaged": damage,
+}
+
+
+def expected(kind: type, data: Dict[str, Any]) -> Any:
+    """What a perfect parse of ``data`` produces, newline edits aside"""
+    return parse_response(json.dumps(data), kind)
+
+
+def fuzz(count: int, seed: int) -> bool:
+    rng = random.Random(seed)
+    results: Dict[str, List[int]] = {}  # name -> [ok, failed, crashed]
+    clean = True
+    for _ in range(count):
+        kind, data = make_document(rng)
+        for name, mutate in LOSSLESS.items():
+            text = mutate(data, rng)
+            target = data
+            if name == "raw_newlines":
+                target = json.loads(text.replace("\n", "\\n"))
+            tally = results.setdefault(name, [0, 0, 0])
+            try:
+                ok = parse_response(text, kind) == expected(kind, target)
+            except ValueError:
+                ok = False
+            except Exception as e:
+                tally[2] += 1
+                clean = False
+                print(f"CRASH {name}: {e!r}\n  {text[:200]!r}")
+                continue
+            tally[0 if ok else 1] += 1
+            if not ok:
+                clean = False
+                print(f"MISMATCH {name}:\n  {text[:200]!r}")
+        for name, mutate in LOSSY.items():
+            text = mutate(json.dumps(data, ensure_ascii=False), rng)
+            tally = results.setdefault(name, [0, 0, 0])
+            try:
+                parse_response(text, kind)
+                tally[0] += 1
+            except ValueError:
+                tally[1] += 1
+            except Exception as e:
+                tally[2] += 1
+                clean = False
+                print(f"CRASH {name}: {e!r}\n  {text[:200]!r}")
+
+    print(f"{'mutation':<18}{'parsed':>8}{'failed':>8}{'crashed':>9}")
+    for name, (ok, failed, crashed) in results.items():
+        print(f"{name:<18}{ok:>8}{failed:>8}{crashed:>9}")
+    return clean
+
+
+def legacy_clean_content(content: str) -> Optional[str]:
+    """``JSONCleaner.clean_content`` before the single-pass parser"""
+    try:
+        json.loads(content)
+        return content
+    except json.JSONDecodeError:
+        try:
+            cleaned = content.strip()
+            cleaned = cleaned.replace("'", '"')
+            cleaned = cleaned.replace("\n", " ")
+            cleaned = cleaned.replace(",}", "}")
+            cleaned = cleaned.replace(",]", "]")
+            data = json.loads(cleaned)
+
+            def clean_value(val):
+                if isinstance(val, str):
+                    return val.strip().strip('"')
+                elif isinstance(val, dict):
+                    return {k.strip(): clean_value(v) for k, v in val.items()}
+                elif isinstance(val, list):
+                    return [clean_value(item) for item in val]
+                return val
+
+            return json.dumps(clean_value(data), indent=2)
+        except Exception:
+            return None
+
+
+def legacy_pipeline(text: str) -> Optional[Dict[str, Any]]:
+    """Clean, re-parse in ``generate_content``, then parse again in the caller"""
+    cleaned = legacy_clean_content(text.strip())
+    if not cleaned:
+        return None
+    try:
+        json.loads(cleaned)
+        return json.loads(cleaned)
+    except json.JSONDecodeError:
+        return None
+
+
+def throughput(count: int, seed: int):
+    rng = random.Random(seed)
+    corpora: Dict[str, List[Tuple[type, str]]] = {"valid": [], "malformed": []}
+    for _ in range(count):
+        kind, data = make_document(rng)
+        corpora["valid"].append((kind, json.dumps(data, ensure_ascii=False)))
+        mutate = rng.choice([m for n, m in LOSSLESS.items() if n != "strict"])
+        corpora["malformed"].append((kind, mutate(data, rng)))
+
+    print(f"\n{'corpus':<11}{'pipeline':<13}{'us/call':>9}{'MB/s':>8}{'parsed':>8}")
+    for corpus, docs in corpora.items():
+        size = sum(len(text.encode()) for _, text in docs) / 1e6
+        for name, run in (
+            ("legacy", lambda kind, text: legacy_pipeline(text)),
+            ("single-pass", lambda kind, text: parse_response(text, kind)),
+        ):
+            parsed = 0
+            start = time.perf_counter()
+            for kind, text in docs:
+                try:
+                    parsed += run(kind, text) is not None
+                except ValueError:
+                    pass
+            elapsed = time.perf_counter() - start
+            print(
+                f"{corpus:<11}{name:<13}{elapsed / len(docs) * 1e6:>9.1f}"
+                f"{size / elapsed:>8.1f}{parsed:>8}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    clean = fuzz(args.count, args.seed)
+    throughput(args.count, args.seed)
+    sys.exit(0 if clean else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark run-length ANSI rendering against per-pixel escape codes.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_pixel_art --size 60x30 --repeat 200
+"""
+
+import argparse
+import time
+
+from src.utils.art_utils import add_highlights, add_shadows, draw_circle
+from src.utils.art_utils import draw_rectangle
+from src.utils.pixel_art import PixelArt
+
+
+def legacy_render(art: PixelArt) -> str:
+    """The original renderer: two full color escapes for every pixel"""
+    output = []
+    for row in art.pixels.tolist():
+        line = []
+        for char, fg, bg, _ in row:
+            line.append(
+                f"\033[38;2;{fg[0]};{fg[1]};{fg[2]}m"
+                f"\033[48;2;{bg[0]};{bg[1]};{bg[2]}m{char}"
+            )
+        output.append("".join(line) + "\033[0m")
+    return "\n".join(output)
+
+
+def make_art(width: int, height: int) -> PixelArt:
+    """A sprite-like scene: a body, a couple of limbs and lighting effects"""
+    art = PixelArt(width, height)
+    draw_circle(art, width // 2, height // 3, min(width, height) // 5, (180, 40, 40))
+    draw_rectangle(art, width // 3, height // 2, width // 3, height // 3, (90, 90, 160))
+    draw_rectangle(
+        art, width // 4, height // 2, width // 12, height // 4, (90, 90, 160)
+    )
+    add_highlights(art, (255, 255, 255))
+    add_shadows(art, (30, 30, 30))
+    return art
+
+
+def time_it(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", default="60x30", help="WIDTHxHEIGHT")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.lower().split("x"))
+
+    start = time.perf_counter()
+    art = make_art(width, height)
+    draw_time = time.perf_counter() - start
+
+    legacy = legacy_render(art)
+    rendered = art.render()
+    legacy_time = time_it(lambda: legacy_render(art), args.repeat)
+    render_time = time_it(art.render, args.repeat)
+
+    legacy_bytes = len(legacy.encode("utf-8"))
+    rendered_bytes = len(rendered.encode("utf-8"))
+
+    print(f"canvas:            {width}x{height}")
+    print(f"draw + effects:    {draw_time * 1000:9.2f} ms")
+    print(f"legacy render:     {legacy_time * 1000:9.2f} ms  {legacy_bytes:8d} bytes")
+    print(f"run-length render: {render_time * 1000:9.2f} ms  {rendered_bytes:8d} bytes")
+    print(f"output reduction:  {legacy_bytes / rendered_bytes:9.1f}x")
+    print(f"render speedup:    {legacy_time / render_time:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,668 @@
+"""Bot players for soak testing whole game sessions.
+
+Each session runs ``main.main`` headless with a ``BotDisplay``: a bot reads
+every screen the way a player would and answers the prompts. It explores,
+rests when hurt, shops (``Shop.buy_item``/``sell_item``), equips its
+best drops, fights with skills and potions, talks to NPCs and faces the
+boss once the corruption manifests. Sessions run in parallel, one process
+each, against the local AI stub server (started here unless ``--ai-url``
+is given).
+
+Long sessions surface what short tests cannot: unbounded histories and
+caches show up as memory growth per encounter, and rare states as crashes.
+The report also gives encounters/s and how much of each session was spent
+waiting on the AI backend or its client-side rate limits. Run from the
+repository root:
+
+    python -m benchmarks.bot_player                        # 8 sessions
+    python -m benchmarks.bot_player --sessions 32 --encounters 200
+    python -m benchmarks.bot_player --no-rate-limit --tracemalloc --json soak.json
+
+A crashed or stuck session prints its seed; replay it alone with
+``--sessions 1 --seed SEED``. Exits non-zero if any session crashed or got
+stuck.
+"""
+
+import argparse
+import gc
+import json
+import logging
+import multiprocessing
+import os
+import random
+import re
+import statistics
+import sys
+import threading
+import time
+import traceback
+import tracemalloc
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+from src.display.base.display import ScriptedDisplay
+
+if TYPE_CHECKING:
+    from benchmarks.ai_stub_server import StubState
+
+RARITIES = ["Common", "Uncommon", "Rare", "Epic", "Legendary"]
+PUZZLE_STEPS = ["2", "1", "3"]  # Hint, one guess, then skip
+NPC_STEPS = ["1", "5", "4", "0"]  # Talk, chat, ask about tasks, leave
+QUEST_STEPS = ["1", "1", "0"]  # Pick the first quest, accept, go back
+CHAT_LINES = ["What happened here?", "Tell me about the God of Hope."]
+
+HEALTH = re.compile(r"Health:?\s+(\d+)/(\d+)")
+MANA = re.compile(r"Mana:?\s+(\d+)/(\d+)")
+GOLD = re.compile(r"Gold:?\s+(\d+)")
+LEVEL = re.compile(r"Level\s+(\d+)")
+OFFER = re.compile(r"\[(\d+)\] (.+?)(?: x\d+)?\n\s*\S+ Price: (\d+)")
+LISTED = re.compile(r"\[(\d+)\] (.+)")
+SKILL = re.compile(
+    r"(\d+)\. (.+?) \[(Ready|Cooldown: \d+)\]\n.*?Power: (\d+)\n.*?Cost: (\d+)"
+)
+EQUIPPABLE = re.compile(r"(\d+)\. (.+) \((\w+)\)\n")
+
+
+class BotStuck(Exception):
+    """The bot answered too many prompts without reaching the main menu"""
+
+
+class BotDisplay(ScriptedDisplay):
+    """Scripted display that keeps only the current screen.
+
+    A session can print hundreds of megabytes, so the captured text,
+    prompts and events are dropped whenever the screen is cleared; the
+    bot only ever needs what is on screen now.
+    """
+
+    def __init__(self, bot: "BotPlayer"):
+        super().__init__(bot)
+        self.event_counts: Counter = Counter()
+        self._answered_at = 0
+
+    def clear(self, debug_mode: bool = False):
+        super().clear(debug_mode)
+        self.output.seek(0)
+        self.output.truncate()
+        self.prompts.clear()
+        self._answered_at = 0
+
+    def emit(self, name: str, data: Dict):
+        self.event_counts[name] += 1
+
+    def read_input(self, prompt: str = "") -> str:
+        answer = super().read_input(prompt)
+        self._answered_at = self.output.tell()
+        return answer
+
+    @property
+    def fresh(self) -> str:
+        """Text printed since the last answer (or the last clear)"""
+        return self.output.getvalue()[self._answered_at :]
+
+
+def current_memory() -> int:
+    """Traced Python heap with ``--tracemalloc``, else resident set size"""
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[0]
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class BotPlayer:
+    """Answers every prompt of a session from what is on screen.
+
+    Called by ``BotDisplay`` as ``bot(prompt, display)``. Screens are
+    recognised by their prompt or by text the views print; anything else
+    is answered with Enter and counted in ``unhandled``.
+    """
+
+    def __init__(
+        self,
+        seed: int,
+        encounters: int,
+        path: int = 1,
+        sample_every: int = 10,
+        max_inputs: int = 400,
+        boss_level: int = 10,
+        keep_items: int = 8,
+    ):
+        self.rng = random.Random(seed)
+        self.target = encounters
+        self.path = path
+        self.sample_every = sample_every
+        self.max_inputs = max_inputs
+        self.boss_level = boss_level
+        self.keep_items = keep_items
+
+        self.encounters = 0
+        self.inputs = 0
+        self.exited = False
+        self.memory: List[Tuple[int, int]] = []
+        self.unhandled: Counter = Counter()
+        self.actions: Counter = Counter()
+
+        self._since_menu = 0
+        self._since_shop = 0
+        self._since_inventory = 0
+        self._check_equipment = False
+        self._context = ""
+        self._steps: List[str] = []
+        self._shop_plan: List[str] = []
+        self._offers: List[Tuple[int, str, int]] = []
+        self._gold = 0
+        self._skip_skill = False
+        self._no_potions = False
+        self._chat_lines: List[str] = []
+        self._equipped = 0
+        self._mana = 0
+
+    def __call__(self, prompt: str, display: BotDisplay) -> str:
+        self.inputs += 1
+        self._since_menu += 1
+        if self._since_menu > self.max_inputs:
+            raise BotStuck(f"{self.max_inputs} inputs without the main menu")
+        answer = self.answer(prompt, display.fresh)
+        self.actions[answer[:12]] += 1
+        return answer
+
+    def answer(self, prompt: str, fresh: str) -> str:
+        if "Choose your path (1-3)" in prompt:
+            return str(self.path)
+        if "Speak thy name" in fresh:
+            return f"Bot{self.path}"
+        if "New Game" in fresh:
+            return "1"
+        if "Save before exit?" in fresh:
+            return "2"
+        if "Choose your path, dark one" in fresh:
+            return self.main_menu(fresh)
+        if "Enter your choice (1-4)" in fresh:
+            return self.shop_menu(fresh)
+        if "item number to buy" in prompt:
+            return self.buy()
+        if "item number to sell" in prompt:
+            return self.sell(fresh)
+        if prompt == "\nChoose action: ":
+            return self._next_step("4")
+        if prompt == "\nChoice: ":
+            return self.equip(fresh)
+        if "to use (0 to cancel)" in prompt:
+            return self.heal_outside_combat(fresh)
+        if "Choose your action" in prompt:
+            return self.action(fresh)
+        if "Choose skill" in prompt:
+            return self.skill(fresh)
+        if "Choose item" in prompt:
+            return self.combat_item(fresh)
+        if "Enter your solution" in prompt:
+            return "hope"
+        if "Choose your response" in prompt:
+            return "1" if self.rng.random() < 0.7 else "0"
+        if "Enter your choice: " in prompt:
+            return self._steps.pop(0) if self._steps else "0"
+        if prompt.endswith("You: "):
+            return self._chat_lines.pop(0) if self._chat_lines else "/exit"
+        if "to unequip" in prompt:
+            return "0"
+        if "(1-2)" in prompt:  # Never overwrite a save
+            return "2"
+        if prompt and "enter" not in prompt.lower():
+            self.unhandled[prompt.strip()[:40]] += 1
+        return ""
+
+    # Main menu
+
+    def main_menu(self, fresh: str) -> str:
+        self._since_menu = 0
+        self._context = ""
+        health, max_health = self._stat(HEALTH, fresh)
+        mana, max_mana = self._stat(MANA, fresh)
+        gold = self._stat(GOLD, fresh)[0]
+        level = self._stat(LEVEL, fresh)[0]
+
+        if self.encounters % self.sample_every == 0 and (
+            not self.memory or self.memory[-1][0] != self.encounters
+        ):
+            gc.collect()
+            self.memory.append((self.encounters, current_memory()))
+
+        if self.encounters >= self.target:
+            self.exited = True
+            return "5"
+        if health < 0.9 * max_health or mana < 0.25 * max_mana:
+            return "3"
+        if (
+            "has manifested" in fresh
+            and level >= self.boss_level
+            and health >= 0.9 * max_health
+        ):
+            self.encounters += 1
+            return "6"
+        if self._check_equipment or self._since_inventory >= 10:  # Loot drops too
+            self._check_equipment = False
+            self._since_inventory = 0
+            self._steps = ["1", "4"]
+            self._equipped = 0
+            return "4"
+        if gold >= 40 and self._since_shop >= 4:
+            self._since_shop = 0
+            self._shop_plan = []
+            return "2"
+        self.encounters += 1
+        self._since_shop += 1
+        self._since_inventory += 1
+        return "1"
+
+    # Shop: sell some junk, buy one thing, leave
+
+    def shop_menu(self, fresh: str) -> str:
+        self._offers = [(int(n), name, int(p)) for n, name, p in OFFER.findall(fresh)]
+        self._gold = self._stat(GOLD, fresh)[0]
+        if not self._shop_plan:
+            plan = ["1"]
+            if self.rng.random() < 0.5:
+                plan.insert(0, "2")
+            self._shop_plan = plan + ["4"]
+        answer = self._shop_plan.pop(0)
+        if answer == "4":
+            self._shop_plan = []
+        return answer
+
+    def buy(self) -> str:
+        affordable = [o for o in self._offers if o[2] <= self._gold]
+        if not affordable:
+            return "0"
+        potions = [o for o in affordable if "Potion" in o[1]]
+        number, name, _ = (
+            min(potions, key=lambda o: o[2])
+            if potions and self.rng.random() < 0.7
+            else self.rng.choice(affordable)
+        )
+        if "Potion" not in name:
+            self._check_equipment = True
+        self._no_potions = False
+        return str(number)
+
+    def sell(self, fresh: str) -> str:
+        items = fresh.split("Items", 1)[-1]
+        junk = [n for n, name in LISTED.findall(items) if "Potion" not in name]
+        if len(junk) > self.keep_items:
+            self._shop_plan.insert(0, "2")
+        return self.rng.choice(junk) if junk else "0"
+
+    # Inventory
+
+    def equip(self, fresh: str) -> str:
+        """Equip up to two of the rarest items, then leave"""
+        listed = EQUIPPABLE.findall(fresh)
+        if self._equipped >= 2 or not listed:
+            return "0"
+        self._equipped += 1
+        rank = {rarity: i for i, rarity in enumerate(RARITIES)}
+        number, _, _ = max(listed, key=lambda item: rank.get(item[2], 0))
+        return number
+
+    def heal_outside_combat(self, fresh: str) -> str:
+        potions = [n for n, name in LISTED.findall(fresh) if "Health" in name]
+        return potions[0] if potions else "0"
+
+    # Encounters
+
+    def action(self, fresh: str) -> str:
+        if "4. Run" in fresh:
+            return self.fight(fresh)
+        if "Chat freely" in fresh:
+            if self._context != "npc":
+                self._context = "npc"
+                self._steps = list(NPC_STEPS)
+                self._chat_lines = [self.rng.choice(CHAT_LINES)]
+            answer = self._steps.pop(0) if self._steps else "0"
+            if answer == "4":
+                self._steps = list(QUEST_STEPS)
+            return answer
+        if "disarm the trap" in fresh:
+            return self.rng.choice(["1", "2", "3"])
+        if "Solve the puzzle" in fresh:
+            self._context = "puzzle"
+            self._steps = list(PUZZLE_STEPS)
+        if self._context == "puzzle":
+            return self._next_step("3")
+        self.unhandled["Choose your action"] += 1
+        return "0"
+
+    def fight(self, fresh: str) -> str:
+        """Potions when low, skills while mana lasts, run when desperate"""
+        bars = HEALTH.findall(fresh)
+        health, max_health = map(int, bars[-1]) if bars else (1, 1)
+        self._mana = self._stat(MANA, fresh)[0]
+        if health < 0.4 * max_health and not self._no_potions:
+            return "3"
+        if health < 0.3 * max_health:
+            return "4"
+        if self._mana >= 15 and not self._skip_skill and self.rng.random() < 0.6:
+            return "2"
+        self._skip_skill = False
+        return "1"
+
+    def skill(self, fresh: str) -> str:
+        ready = [
+            (int(power), number)
+            for number, _, status, power, cost in SKILL.findall(fresh)
+            if status == "Ready" and int(cost) <= self._mana
+        ]
+        if not ready:
+            self._skip_skill = True
+            return "0"
+        return max(ready)[1]
+
+    def combat_item(self, fresh: str) -> str:
+        healing = [n for n, name in LISTED.findall(fresh) if "Health" in name]
+        if not healing:
+            self._no_potions = True
+            return "0"
+        return healing[0]
+
+    # Helpers
+
+    @staticmethod
+    def _stat(pattern: re.Pattern, text: str) -> Tuple[int, int]:
+        """Last ``current/maximum`` (or single value) matched on screen"""
+        found = pattern.findall(text)
+        if not found:
+            return 0, 1
+        value = found[-1]
+        if isinstance(value, str):
+            return int(value), 1
+        return int(value[0]), max(1, int(value[1]))
+
+    def _next_step(self, default: str) -> str:
+        return self._steps.pop(0) if self._steps else default
+
+
+@dataclass
+class SessionResult:
+    index: int
+    seed: int
+    path: int
+    outcome: str  # "completed", "died", "stuck" or "crashed"
+    encounters: int
+    inputs: int
+    seconds: float
+    memory_start: int = 0  # After the first ``sample_every`` encounters
+    memory_end: int = 0
+    measured_encounters: int = 0
+    ai_requests: int = 0
+    ai_seconds: float = 0.0  # Waiting on responses
+    ai_queued_seconds: float = 0.0  # Held back by the client-side rate limiter
+    logged_errors: int = 0
+    error: str = ""
+    unhandled: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def encounters_per_second(self) -> float:
+        return self.encounters / self.seconds if self.seconds else 0.0
+
+    @property
+    def memory_growth(self) -> int:
+        return self.memory_end - self.memory_start
+
+
+class _ErrorCounter(logging.Handler):
+    """Counts error records from the game's loggers"""
+
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord):
+        self.count += 1
+
+
+def _histogram_totals(name: str) -> Tuple[int, float]:
+    """Count and sum of a histogram over all its labels"""
+    from src.utils.metrics import metrics
+
+    histogram = metrics.histogram(name)
+    return sum(histogram.counts.values()), sum(histogram.sums.values())
+
+
+def run_session(job: Dict) -> SessionResult:
+    """Play one session in this process; never raises"""
+    if job["no_rate_limit"]:
+        from src.config.settings import AI_RATE_LIMITS
+
+        # Read once, when the game first imports the scheduler
+        AI_RATE_LIMITS["REQUESTS_PER_MINUTE"] = 10**9
+        AI_RATE_LIMITS["TOKENS_PER_MINUTE"] = 10**12
+    import main as game
+    from src.config.logging_config import shutdown_logging
+    from src.display.base.base_view import BaseView
+
+    if job["tracemalloc"]:
+        tracemalloc.start()
+    errors = _ErrorCounter()
+    loggers = [logging.getLogger(name) for name in ("src", "main", "display")]
+    for logger in loggers:
+        logger.addHandler(errors)
+
+    # The class follows the seed so that ``--seed`` alone reproduces a session
+    path = job["seed"] % 3 + 1
+    bot = BotPlayer(job["seed"], job["encounters"], path, max_inputs=job["max_inputs"])
+    display = BotDisplay(bot)
+    outcome, error = "died", ""
+    start = time.perf_counter()
+    try:
+        game.main(display=display, seed=job["seed"])
+        if bot.exited:
+            outcome = "completed"
+    except BotStuck as e:
+        outcome, error = (
+            "stuck",
+            f"{e}; last screen:\n{display.output.getvalue()[-600:]}",
+        )
+    except Exception as e:
+        outcome = "crashed"
+        frames = traceback.extract_tb(e.__traceback__)[-3:]
+        where = " <- ".join(
+            f"{Path(f.filename).name}:{f.lineno}" for f in reversed(frames)
+        )
+        error = f"{type(e).__name__}: {e} at {where}"
+    finally:
+        seconds = time.perf_counter() - start
+        BaseView.close_display()
+        shutdown_logging()
+        for logger in loggers:
+            logger.removeHandler(errors)
+
+    gc.collect()
+    samples = bot.memory + [(bot.encounters, current_memory())]
+    # The first encounters import modules and fill caches; measure after
+    # them, or not at all if the session ended that early
+    first = samples[1] if len(samples) > 2 else samples[-1]
+    ai_requests, ai_seconds = _histogram_totals("ai_request_seconds")
+    return SessionResult(
+        index=job["index"],
+        seed=job["seed"],
+        path=path,
+        outcome=outcome,
+        encounters=bot.encounters,
+        inputs=bot.inputs,
+        seconds=seconds,
+        memory_start=first[1],
+        memory_end=samples[-1][1],
+        measured_encounters=bot.encounters - first[0],
+        ai_requests=ai_requests,
+        ai_seconds=ai_seconds,
+        ai_queued_seconds=_histogram_totals("ai_scheduler_wait_seconds")[1],
+        logged_errors=errors.count,
+        error=error,
+        unhandled=dict(bot.unhandled),
+    )
+
+
+def start_stub_server(latency: str) -> Tuple[str, "StubState"]:
+    """Serve the AI stub from a thread of this process; returns its base URL"""
+    from benchmarks.ai_stub_server import StubState, make_server, parse_latency
+
+    state = StubState(parse_latency(latency))
+    server = make_server("127.0.0.1", 0, state)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}/v1", state
+
+
+def report(results: List[SessionResult], wall: float) -> Dict:
+    outcomes = Counter(r.outcome for r in results)
+    failed = [r for r in results if r.outcome in ("stuck", "crashed")]
+    encounters = sum(r.encounters for r in results)
+    growth = [r.memory_growth for r in results if r.measured_encounters] or [0]
+    per_100 = [
+        r.memory_growth * 100 / r.measured_encounters
+        for r in results
+        if r.measured_encounters >= 10
+    ]
+    unhandled: Counter = Counter()
+    for r in results:
+        unhandled.update(r.unhandled)
+
+    print(
+        f"\n{len(results)} sessions in {wall:.1f}s: "
+        + ", ".join(f"{count} {name}" for name, count in sorted(outcomes.items()))
+    )
+    print(f"  crash rate      {len(failed) / len(results):.1%}")
+    print(
+        f"  throughput      {encounters / wall:.1f} encounters/s overall, "
+        f"{statistics.median(r.encounters_per_second for r in results):.1f} "
+        "per session (median)"
+    )
+    print(
+        f"  encounters      {encounters} total, "
+        f"{statistics.median(r.encounters for r in results):.0f} per session (median)"
+    )
+    print(
+        f"  memory growth   {statistics.median(growth) / 1024:.0f} KiB median, "
+        f"{max(growth) / 1024:.0f} KiB max per session"
+        + (
+            f", {statistics.median(per_100) / 1024:.0f} KiB per 100 encounters"
+            if per_100
+            else ""
+        )
+    )
+    seconds = sum(r.seconds for r in results)
+    print(
+        f"  AI backend      {sum(r.ai_requests for r in results)} requests, "
+        f"{sum(r.ai_seconds for r in results) / seconds:.0%} of session time "
+        f"waiting, {sum(r.ai_queued_seconds for r in results) / seconds:.0%} "
+        "rate limited"
+    )
+    print(f"  logged errors   {sum(r.logged_errors for r in results)}")
+    if unhandled:
+        print(f"  unhandled       {dict(unhandled.most_common(5))}")
+    for r in failed:
+        print(f"\n{r.outcome.upper()} session {r.index} (--seed {r.seed}): {r.error}")
+
+    return {
+        "sessions": len(results),
+        "seconds": wall,
+        "outcomes": dict(outcomes),
+        "crash_rate": len(failed) / len(results),
+        "encounters_per_second": encounters / wall,
+        "results": [dict(asdict(r), memory_growth=r.memory_growth) for r in results],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument(
+        "--processes", type=int, default=os.cpu_count(), help="Sessions at once"
+    )
+    parser.add_argument(
+        "--encounters", type=int, default=50, help="Explorations per session"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=1, help="Seed of session 0; session i uses SEED+i"
+    )
+    parser.add_argument(
+        "--max-inputs",
+        type=int,
+        default=400,
+        help="Answers without reaching the main menu before a session is stuck",
+    )
+    parser.add_argument(
+        "--procedural",
+        action="store_true",
+        help="Generate enemies procedurally instead of through the AI backend",
+    )
+    parser.add_argument(
+        "--ai-url", help="OpenAI-compatible backend (default: a local stub server)"
+    )
+    parser.add_argument(
+        "--ai-latency", default="fixed:0", help="Latency of the local stub server"
+    )
+    parser.add_argument(
+        "--no-rate-limit",
+        action="store_true",
+        help="Lift the client-side AI rate limits, e.g. to load the stub harder",
+    )
+    parser.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help="Measure the traced Python heap instead of RSS (slower)",
+    )
+    parser.add_argument("--json", help="Write per-session results to this file")
+    args = parser.parse_args()
+
+    stub = None
+    if args.ai_url:
+        os.environ["OPENAI_BASE_URL"] = args.ai_url
+    else:
+        os.environ["OPENAI_BASE_URL"], stub = start_stub_server(args.ai_latency)
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    if args.procedural:
+        os.environ["ENEMY_GENERATION_MODE"] = "procedural"
+    print(f"AI backend: {os.environ['OPENAI_BASE_URL']}")
+
+    jobs = [
+        {
+            "index": i,
+            "seed": args.seed + i,
+            "encounters": args.encounters,
+            "max_inputs": args.max_inputs,
+            "tracemalloc": args.tracemalloc,
+            "no_rate_limit": args.no_rate_limit,
+        }
+        for i in range(args.sessions)
+    ]
+    results: List[SessionResult] = []
+    start = time.perf_counter()
+    # A fresh process per session: no state leaks between sessions and
+    # a crash takes down only its own session
+    with multiprocessing.Pool(args.processes, maxtasksperchild=1) as pool:
+        for result in pool.imap_unordered(run_session, jobs):
+            results.append(result)
+            print(
+                f"session {result.index:>3} {result.outcome:<9} "
+                f"{result.encounters:>4} encounters {result.seconds:6.1f}s "
+                f"{result.encounters_per_second:6.1f}/s "
+                f"memory {result.memory_growth / 1024:+8.0f} KiB"
+            )
+    wall = time.perf_counter() - start
+
+    summary = report(sorted(results, key=lambda r: r.index), wall)
+    if stub:
+        print(f"\nStub requests: {dict(sorted(stub.counts.items()))}")
+    if args.json:
+        Path(args.json).write_text(json.dumps(summary, indent=2))
+    sys.exit(1 if summary["crash_rate"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Replay recorded combats headless and check them against their logs.
+
+Every combat the game plays is logged to ``logs/combats/`` (see
+``src/services/combat_replay.py``). Replaying the corpus before and after
+a change to the combat rules shows whether fights still come out the
+same, and how fast the rules run without views or pacing. ``--show``
+prints a log turn by turn, e.g. to see how a player died.
+
+Run from the repository root:
+
+    python -m benchmarks.replay_combats                 # whole corpus
+    python -m benchmarks.replay_combats logs/combats/*-defeat.jsonl --show
+    python -m benchmarks.replay_combats --repeat 20     # timing only
+
+Exits non-zero if any combat diverges from its log.
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+from typing import List
+
+from src.config.settings import COMBAT_REPLAY_SETTINGS
+from src.services.combat_replay import load_log, replay_combat
+
+
+def show(path: str):
+    header, turns, end = load_log(path)
+    player, enemy = header["player"], header["enemy"]
+    print(
+        f"{path}\n  {player['name']} ({player['class']}, level {player['level']}) vs "
+        f"{enemy['name']} (level {enemy['level']}), seed {header['seed']}"
+    )
+    for turn in turns:
+        print(f"  turn {turn['turn']:>3}  inputs {turn['inputs']}  hash {turn['hash']}")
+        for method, value in turn["draws"]:
+            print(f"            draw {method} -> {value}")
+        for name, data in turn["events"]:
+            print(f"            {name} {data}")
+    if end:
+        print(f"  {end['outcome']} after {end['turns']} turns {end.get('error', '')}")
+    else:
+        print("  log ends without an outcome")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        help=f"Logs to replay (default: {COMBAT_REPLAY_SETTINGS['OUTPUT_DIR']}/)",
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="Replays per log")
+    parser.add_argument("--show", action="store_true", help="Print each log first")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    paths: List[str] = args.paths or sorted(
+        str(p) for p in Path(COMBAT_REPLAY_SETTINGS["OUTPUT_DIR"]).glob("*.jsonl")
+    )
+    if not paths:
+        print("No combat logs found")
+        return
+
+    diverged = turns = 0
+    seconds = 0.0
+    for path in paths:
+        if args.show:
+            show(path)
+        for _ in range(args.repeat):
+            try:
+                result = replay_combat(path)
+            except ValueError as e:
+                diverged += 1
+                print(f"UNREADABLE {e}")
+                break
+            turns += result.turns
+            seconds += result.seconds
+            if not result.ok:
+                diverged += 1
+                print(f"DIVERGED {path} ({result.outcome}): {result.divergence}")
+                break
+
+    replays = len(paths) * args.repeat
+    print(
+        f"{len(paths)} logs, {replays} replays, {turns} turns in {seconds:.3f}s "
+        f"({turns / seconds if seconds else 0:.0f} turns/s), {diverged} diverged"
+    )
+    sys.exit(1 if diverged else 0)
+
+
+if __name__ == "__main__":
+    main()
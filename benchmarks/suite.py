@@ -0,0 +1,439 @@
+"""Offline benchmark suite for the game's hot paths.
+
+Every AI call is answered by a canned stub, so the suite needs no network
+or API key. Results are written as JSON and compared against a stored
+baseline; a benchmark whose median slows down by more than the threshold
+is reported as a regression and the script exits non-zero.
+
+Timings on a shared machine drift by tens of percent from minute to
+minute, so the suite runs in rounds and reports each benchmark's median
+across them, and a benchmark that looks slower is re-measured before it
+counts as a regression. Record baselines with extra rounds.
+
+Run from the repository root:
+
+    python -m benchmarks.suite                          # compare with baseline
+    python -m benchmarks.suite --only shop,json --repeat 500
+    python -m benchmarks.suite --save-baseline --rounds 9   # after an intended change
+    python -m benchmarks.suite --db                     # include save/load
+
+``--db`` round-trips a character through save slot ``--db-slot`` of the
+database configured by the DB_* environment variables, overwriting that
+slot; point DB_NAME at a scratch database.
+"""
+
+import argparse
+import gc
+import json
+import logging
+import platform
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.bench_pixel_art import make_art
+from src.utils.rng import rng
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+SEED = 1234
+MIN_SAMPLE_SECONDS = 0.02
+# Fills caches (e.g. rendered enemy art) before anything is timed
+WARMUP_SECONDS = 0.1
+
+ENEMY_JSON = json.dumps(
+    {
+        "name": "Hollow Warden",
+        "description": "A sentinel whose hope curdled into iron resolve.",
+        "health": 60,
+        "attack": 12,
+        "defense": 4,
+        "level": 3,
+        "exp_reward": 40,
+    }
+)
+# Typical model output the cleaner has to repair: quotes, trailing commas
+MALFORMED_JSON = (
+    "{'name': 'Hollow Warden', 'description': 'A sentinel of rust',\n"
+    " 'stats': {'health': 60, 'attack': 12,}, 'tags': ['undead', 'void',],}"
+)
+ART_JSON = json.dumps(
+    {
+        "ascii_art": [
+            ("░▒▓█" * 8)[offset : offset + 30] + "  extra columns are trimmed"
+            for offset in range(18)
+        ]
+    }
+)
+
+
+def stub_generate_content(
+    prompt, retries: Optional[int] = None, schema: Optional[type] = None, **kwargs
+):
+    """Canned stand-in for ``ai_core.generate_content``"""
+    from src.utils.response_parser import parse_response
+
+    prompt = str(prompt)
+    content = ART_JSON if "ASCII" in prompt or "ascii" in prompt else ENEMY_JSON
+    return parse_response(content, schema) if schema else content
+
+
+def install_ai_stub():
+    """Point every module that imported generate_content at the stub"""
+    from src.services import (
+        ai_core,
+        ai_generator,
+        art_generator,
+        encounter,
+        npc_generator,
+    )
+
+    for module in (ai_core, ai_generator, art_generator, encounter, npc_generator):
+        module.generate_content = stub_generate_content
+
+
+def make_player():
+    from src.models.character import Player
+    from src.models.character_classes import get_default_classes
+
+    return Player("Bench", get_default_classes()[0])
+
+
+# Each benchmark factory does its setup and returns the operation to time
+
+
+def bench_shop_inventory() -> Callable:
+    from src.services.shop import Shop
+
+    shop = Shop()
+    return shop.generate_shop_inventory
+
+
+def bench_enemy_drops() -> Callable:
+    from src.models.character import get_fallback_enemy
+    from src.services.item import ItemService
+
+    enemy = get_fallback_enemy(8)
+    return lambda: ItemService.get_enemy_drops(enemy)
+
+
+def _equip_shadow_assassin(player):
+    """Equip two set pieces, enough for the first set bonus"""
+    from src.models.items.epic_items import (
+        SHADOW_ASSASSIN_ARMOR,
+        SHADOW_ASSASSIN_WEAPONS,
+    )
+
+    player.equipment["weapon"] = SHADOW_ASSASSIN_WEAPONS[0]
+    player.equipment["armor"] = SHADOW_ASSASSIN_ARMOR[0]
+
+
+def bench_damage_with_effects() -> Callable:
+    from src.models.character import get_fallback_enemy
+    from src.services.combat import calculate_damage
+
+    player = make_player()
+    _equip_shadow_assassin(player)
+    player.check_set_bonuses()
+    enemy = get_fallback_enemy(5)
+    enemy.health = enemy.max_health = 10**9
+    return lambda: calculate_damage(player, enemy, 5)
+
+
+def bench_set_bonuses() -> Callable:
+    player = make_player()
+    _equip_shadow_assassin(player)
+    return player.check_set_bonuses
+
+
+def bench_status_effect_tick() -> Callable:
+    from src.models.status_effects import StatusEffect
+
+    player = make_player()
+    player.health = 10**9
+    for name, damage in (("Bleeding", 3), ("Poisoned", 2), ("Corrupted", 5)):
+        player.status_effects[name] = StatusEffect(
+            name=name,
+            description=name,
+            duration=10**9,
+            tick_damage=damage,
+        )
+    return player.apply_status_effects
+
+
+def bench_json_clean_valid() -> Callable:
+    from src.utils.json_cleaner import JSONCleaner
+
+    return lambda: JSONCleaner.clean_content(ENEMY_JSON)
+
+
+def bench_json_clean_repair() -> Callable:
+    from src.utils.json_cleaner import JSONCleaner
+
+    return lambda: JSONCleaner.clean_content(MALFORMED_JSON)
+
+
+def bench_json_parse_valid() -> Callable:
+    from src.services.ai_schemas import EnemyData
+    from src.utils.response_parser import parse_response
+
+    return lambda: parse_response(ENEMY_JSON, EnemyData)
+
+
+def bench_json_extract_repair() -> Callable:
+    from src.utils.response_parser import extract_json
+
+    return lambda: extract_json(MALFORMED_JSON)
+
+
+def bench_art_generation() -> Callable:
+    from src.services.art_generator import _generate_art
+
+    return lambda: _generate_art("Create ASCII art for 'Hollow Warden'")
+
+
+def bench_procedural_enemy() -> Callable:
+    from src.services.enemy_generator import ProceduralEnemyGenerator
+
+    generator = ProceduralEnemyGenerator(SEED)
+    return lambda: generator.generate(5)
+
+
+def bench_prompt_render() -> Callable:
+    from src.models.npc import NPC
+    from src.services.npc_generator import NPCGenerator
+
+    npc = NPC(name="Sister Vell", description="A nun of ash", lore="She kept the lamps")
+    context = "Recent Conversation:\nYou: Where are the bells?"
+    return lambda: NPCGenerator._npc_response_prompt(npc, "Tell me more", context)
+
+
+def bench_pixel_render() -> Callable:
+    art = make_art(60, 30)
+    return art.render
+
+
+def bench_save_load() -> Callable:
+    from src.config.database import init_database
+    from src.services.character_storage import CharacterStorageService
+
+    if not init_database():
+        raise RuntimeError("database unavailable")
+    player = make_player()
+    _equip_shadow_assassin(player)
+    slot = ARGS.db_slot
+
+    def round_trip():
+        if not CharacterStorageService.save_character(player, slot):
+            raise RuntimeError("save failed")
+        if not CharacterStorageService.load_character(slot):
+            raise RuntimeError("load failed")
+
+    return round_trip
+
+
+BENCHMARKS: Dict[str, Callable[[], Callable]] = {
+    "shop.generate_inventory": bench_shop_inventory,
+    "items.enemy_drops": bench_enemy_drops,
+    "combat.damage_with_effects": bench_damage_with_effects,
+    "character.set_bonuses": bench_set_bonuses,
+    "effects.status_tick": bench_status_effect_tick,
+    "json.clean_valid": bench_json_clean_valid,
+    "json.clean_repair": bench_json_clean_repair,
+    "json.parse_valid": bench_json_parse_valid,
+    "json.extract_repair": bench_json_extract_repair,
+    "art.generate_validate": bench_art_generation,
+    "enemies.procedural": bench_procedural_enemy,
+    "prompts.render_npc_response": bench_prompt_render,
+    "pixel_art.render": bench_pixel_render,
+    "storage.save_load": bench_save_load,
+}
+DB_BENCHMARKS = {"storage.save_load"}
+
+ARGS: argparse.Namespace
+
+
+def _time_batch(operation: Callable, batch: int) -> float:
+    """Seconds for ``batch`` calls, with garbage collection held off"""
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(batch):
+            operation()
+        return time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def run_benchmark(factory: Callable[[], Callable], repeat: int) -> Dict[str, float]:
+    """Time ``repeat`` samples of a calibrated batch; per-call microseconds.
+
+    The operation first runs for ``WARMUP_SECONDS``. Fast operations are
+    then batched so each sample lasts at least ``MIN_SAMPLE_SECONDS``,
+    keeping timer resolution out of the numbers, and every sample starts
+    from a collected heap so a GC pause can't land in one at random.
+    """
+    random.seed(SEED)
+    rng.reseed(SEED)
+    operation = factory()
+
+    deadline = time.perf_counter() + WARMUP_SECONDS
+    while time.perf_counter() < deadline:
+        operation()
+
+    batch = 1
+    while _time_batch(operation, batch) < MIN_SAMPLE_SECONDS and batch < 1 << 16:
+        batch *= 2
+
+    timings = sorted(_time_batch(operation, batch) * 1e6 / batch for _ in range(repeat))
+    return {
+        "iterations": repeat * batch,
+        "median_us": statistics.median(timings),
+        "min_us": timings[0],
+        "p90_us": timings[int(0.9 * (len(timings) - 1))],
+    }
+
+
+def combine_rounds(rounds: List[Dict[str, float]]) -> Dict[str, float]:
+    """One result from several rounds of a benchmark: the median of each stat"""
+    return {
+        "iterations": sum(r["iterations"] for r in rounds),
+        "median_us": statistics.median(r["median_us"] for r in rounds),
+        "min_us": min(r["min_us"] for r in rounds),
+        "p90_us": statistics.median(r["p90_us"] for r in rounds),
+    }
+
+
+def run_rounds(
+    factories: Dict[str, Callable[[], Callable]],
+    count: int,
+    rounds: Dict[str, List[Dict]],
+):
+    """Add ``count`` rounds of every benchmark to ``rounds``.
+
+    Whole rounds rather than back-to-back runs of one benchmark, so a slow
+    patch on the machine doesn't hit every sample of the same one.
+    """
+    factories = dict(factories)
+    for _ in range(count):
+        for name, factory in list(factories.items()):
+            try:
+                rounds.setdefault(name, []).append(run_benchmark(factory, ARGS.repeat))
+            except Exception as e:
+                print(f"{name}: skipped ({e})", file=sys.stderr)
+                del factories[name]
+                rounds.pop(name, None)
+
+
+def is_slower(result: Dict, base: Optional[Dict], threshold: float) -> bool:
+    return bool(base) and result["median_us"] > base["median_us"] * (1 + threshold)
+
+
+def compare(
+    results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float
+) -> List[str]:
+    """Print each result against its baseline; returns regressed names"""
+    regressions = []
+    print(f"{'benchmark':<28} {'median':>12} {'p90':>12} {'baseline':>12}  change")
+    for name, result in results.items():
+        line = f"{name:<28} {result['median_us']:10.1f}us {result['p90_us']:10.1f}us"
+        base = baseline.get(name)
+        if base:
+            ratio = result["median_us"] / base["median_us"]
+            verdict = ""
+            if is_slower(result, base, threshold):
+                verdict = "  REGRESSION"
+                regressions.append(name)
+            elif ratio < 1 - threshold:
+                verdict = "  faster"
+            line += f" {base['median_us']:10.1f}us  {ratio - 1:+6.1%}{verdict}"
+        else:
+            line += f" {'-':>12}"
+        print(line)
+    return regressions
+
+
+def main():
+    global ARGS
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="Samples per round")
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=3,
+        help="Runs of the whole suite; each benchmark reports the median",
+    )
+    parser.add_argument(
+        "--only", default="", help="Comma separated name prefixes to run"
+    )
+    parser.add_argument("--db", action="store_true", help="Include save/load")
+    parser.add_argument("--db-slot", type=int, default=5)
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument(
+        "--threshold", type=float, default=0.4, help="Allowed median slowdown"
+    )
+    ARGS = parser.parse_args()
+
+    # Keep library warnings and spans out of the report
+    logging.disable(logging.WARNING)
+    from src.utils.tracing import tracer
+
+    tracer.enabled = False
+    install_ai_stub()
+
+    prefixes = [p.strip() for p in ARGS.only.split(",") if p.strip()]
+    selected = {
+        name: factory
+        for name, factory in BENCHMARKS.items()
+        if (not prefixes or any(name.startswith(p) for p in prefixes))
+        and (ARGS.db or name not in DB_BENCHMARKS)
+    }
+    rounds: Dict[str, List[Dict]] = {}
+    run_rounds(selected, ARGS.rounds, rounds)
+    results = {name: combine_rounds(runs) for name, runs in rounds.items()}
+
+    baseline_path = Path(ARGS.baseline)
+    baseline = {}
+    if baseline_path.exists() and not ARGS.save_baseline:
+        baseline = json.loads(baseline_path.read_text())["results"]
+
+    # A slow result is more often a slow minute than a slow change
+    suspects = {
+        name: BENCHMARKS[name]
+        for name, result in results.items()
+        if is_slower(result, baseline.get(name), ARGS.threshold)
+    }
+    if suspects:
+        print(f"Re-measuring {', '.join(suspects)}\n")
+        run_rounds(suspects, ARGS.rounds, rounds)
+        results.update(
+            {name: combine_rounds(rounds[name]) for name in suspects if name in rounds}
+        )
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": ARGS.repeat,
+        "rounds": ARGS.rounds,
+        "results": results,
+    }
+    regressions = compare(results, baseline, ARGS.threshold)
+
+    if ARGS.json:
+        report["regressions"] = regressions
+        Path(ARGS.json).write_text(json.dumps(report, indent=2))
+    if ARGS.save_baseline:
+        baseline_path.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nBaseline saved to {baseline_path}")
+    elif regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Print span trees from the JSONL trace export.
+
+Run from the repository root after a play session:
+
+    python -m benchmarks.trace_report --last 3
+    python -m benchmarks.trace_report --name explore --min-ms 5
+"""
+
+import argparse
+import json
+from collections import defaultdict
+from typing import Dict, List
+
+from src.config.settings import TRACING_SETTINGS
+
+
+def load_traces(path: str) -> Dict[str, List[dict]]:
+    """Group exported spans by trace id, preserving file order"""
+    traces: Dict[str, List[dict]] = defaultdict(list)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                span = json.loads(line)
+                traces[span["context"]["trace_id"]].append(span)
+    return traces
+
+
+def print_tree(spans: List[dict], min_ms: float = 0.0):
+    """Print a trace with each span's duration and share of its root"""
+    children: Dict[str, List[dict]] = defaultdict(list)
+    roots = []
+    for span in spans:
+        if span["parent_id"]:
+            children[span["parent_id"]].append(span)
+        else:
+            roots.append(span)
+
+    def walk(span: dict, depth: int, total_ms: float):
+        if span["duration_ms"] < min_ms:
+            return
+        share = span["duration_ms"] / total_ms * 100 if total_ms else 0
+        status = "" if span["status"]["status_code"] == "OK" else " [ERROR]"
+        attrs = " ".join(f"{k}={v}" for k, v in span["attributes"].items())
+        print(
+            f"{span['duration_ms']:10.1f} ms {share:5.1f}%  "
+            f"{'  ' * depth}{span['name']}{status} {attrs}".rstrip()
+        )
+        for child in sorted(
+            children[span["context"]["span_id"]], key=lambda s: s["start_time"]
+        ):
+            walk(child, depth + 1, total_ms)
+
+    for root in roots:
+        walk(root, 0, root["duration_ms"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--path", default=TRACING_SETTINGS["EXPORT_PATH"])
+    parser.add_argument("--name", help="Only show traces whose root has this name")
+    parser.add_argument("--last", type=int, default=1, help="Number of traces")
+    parser.add_argument("--min-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    traces = [
+        spans
+        for spans in load_traces(args.path).values()
+        if not args.name
+        or any(s["name"] == args.name and not s["parent_id"] for s in spans)
+    ]
+    for spans in traces[-args.last :]:
+        print(f"trace {spans[0]['context']['trace_id']}")
+        print_tree(spans, args.min_ms)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,39 +1,29 @@
 #!/usr/bin/env python3
 
 import logging
+import os
+from typing import List, Optional
 from dotenv import load_dotenv
 from src.models.items.consumable import Consumable
-from src.config.logging_config import setup_logging
-from src.services.character_creation import CharacterCreationService
-from src.services.combat import combat, handle_combat_rewards, handle_level_up
-from src.services.shop import Shop
-from src.display.main.main_view import GameView
-from src.display.inventory.inventory_view import InventoryView
-from src.display.character.character_view import CharacterView
+from src.config.logging_config import setup_logging, shutdown_logging
 from src.display.combat.combat_view import CombatView
-from src.display.shop.shop_view import ShopView
 from src.display.base.base_view import BaseView
+from src.display.base.display import Display
 from src.display.common.message_view import MessageView
-from src.config.settings import GAME_BALANCE, STARTING_INVENTORY
-from src.models.character import Player, get_fallback_enemy
-from src.services.ai_generator import generate_enemy
 from src.display.themes.dark_theme import DECORATIONS as dec
 from src.display.themes.dark_theme import SYMBOLS as sym
-from src.services.boss import BossService
-from src.display.boss.boss_view import BossView
-from src.services.encounter_handler import EncounterHandler
-from src.display.encounter.encounter_view import EncounterView
-from src.display.save.save_view import SaveView
 from src.services.save_manager import SaveManager
-import time
-from src.models.base_types import EffectResult
-
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    filename="game.log",
+from src.services.startup import startup
+from src.utils.metrics import metrics
+from src.utils.rng import configured_seed, rng
+from src.utils.tracing import tracer
+from src.utils.ascii_art import load_art_manifest
+from src.config.settings import (
+    ENABLE_AI_ART_GENERATION,
+    ENABLE_AI_CLASS_GENERATION,
+    ENABLE_AI_ITEM_GENERATION,
 )
+from src.models.base_types import EffectResult
 
 logger = logging.getLogger(__name__)
 
@@ -52,18 +42,60 @@ def handle_effect_result(result: EffectResult) -> None:
         CombatView.show_damage(result["damage"])
 
 
-def main():
-    """Main game loop"""
+def warm_ai_client():
+    """Create the shared OpenAI client if any AI generation is enabled"""
+    from src.services.enemy_generator import generation_mode
+
+    if not (
+        generation_mode() == "ai"
+        or ENABLE_AI_ITEM_GENERATION
+        or ENABLE_AI_CLASS_GENERATION
+        or ENABLE_AI_ART_GENERATION
+    ):
+        return None
+    from src.services.ai_core import get_client
+
+    return get_client()
+
+
+def warm_item_catalog():
+    """Import the item catalogs and index them by type and rarity"""
+    from src.services.item import ItemService
+
+    return ItemService.get_catalog_index()
+
+
+def main(display: Optional[Display] = None, seed: Optional[int] = None):
+    """Main game loop
+
+    Pass a display backend (e.g. ``ScriptedDisplay``) to drive the game
+    without a terminal; the caller closes it with ``BaseView.close_display``.
+    ``seed`` fixes the random streams (default: GAME_SEED or a fresh seed);
+    loading a save continues that save's streams instead.
+    """
     setup_logging()
     load_dotenv()
+    seed = rng.reseed(seed if seed is not None else configured_seed())
+    logger.info(f"Random seed: {seed} (replay with --seed {seed})")
+    if display:
+        BaseView.use_display(display)
+    else:
+        BaseView.open_display()
+
+    # Warm up slow services while the title screen is up; anything that
+    # needs one of them waits on just that stage
+    startup.start(
+        {
+            "database": SaveManager.initialize,
+            "ai_client": warm_ai_client,
+            "item_catalog": warm_item_catalog,
+            "art_manifest": load_art_manifest,
+        }
+    )
 
     # Display title screen and clear to ensure a fresh start
     BaseView.clear_screen()
 
-    # Initialize save system first
-    save_system_initialized = SaveManager.initialize()
-    logger.info(f"Save system initialized: {save_system_initialized}")
-
     # Show start menu and handle selection
     should_continue, loaded_player, save_slot = SaveManager.handle_start_menu()
 
@@ -71,6 +103,19 @@ def main():
         logger.info("User chose to exit from start menu")
         return
 
+    # Gameplay modules (AI generation, encounters, shop) are only imported
+    # once a game is actually starting, so the start menu never waits on them
+    from src.services.character_creation import CharacterCreationService
+    from src.services.shop import Shop
+    from src.services.boss import BossService
+    from src.services.encounter_handler import EncounterHandler
+    from src.display.main.main_view import GameView
+    from src.display.inventory.inventory_view import InventoryView
+    from src.display.character.character_view import CharacterView
+    from src.display.shop.shop_view import ShopView
+    from src.display.boss.boss_view import BossView
+    from src.display.encounter.encounter_view import EncounterView
+
     # Initialize views and services only after user has chosen to continue
     game_view = GameView()
     inventory_view = InventoryView()
@@ -94,7 +139,7 @@ def main():
         # Character creation flow
         base_view.clear_screen()
         character_view.show_character_creation()
-        player_name = input().strip()
+        player_name = BaseView.get_input().strip()
 
         # Use character creation service
         try:
@@ -129,32 +174,33 @@ def main():
         BaseView.clear_screen()
         game_view.show_main_status(player)
 
-        choice = input().strip()
+        choice = BaseView.get_input().strip()
 
         if choice == "1":  # Explore
             try:
-                # Use the encounter handler to manage all exploration encounters
-                explore_result = encounter_handler.handle_exploration(
-                    player, combat_view, boss_view, shop
-                )
-
-                if not explore_result:  # Player died
-                    game_view.show_game_over(player)
-                    break
-
-                # Show transition between encounters
-                EncounterView.show_encounter_transition()
+                with tracer.span("explore", autosave_slot=current_save_slot):
+                    # Use the encounter handler to manage all exploration encounters
+                    explore_result = encounter_handler.handle_exploration(
+                        player, combat_view, boss_view, shop
+                    )
 
-                # Increment autosave counter and save every 3 encounters if save system available
-                encounters_since_save += 1
-                if (
-                    encounters_since_save >= 3
-                    and SaveManager.save_system_available
-                    and current_save_slot
-                ):
-                    SaveManager.handle_autosave(player, current_save_slot)
-                    encounters_since_save = 0
-                    logger.info(f"Autosaved game to slot {current_save_slot}")
+                    if not explore_result:  # Player died
+                        game_view.show_game_over(player)
+                        break
+
+                    # Show transition between encounters
+                    EncounterView.show_encounter_transition()
+
+                    # Increment autosave counter and save every 3 encounters if save system available
+                    encounters_since_save += 1
+                    if (
+                        encounters_since_save >= 3
+                        and SaveManager.is_available()
+                        and current_save_slot
+                    ):
+                        SaveManager.handle_autosave(player, current_save_slot)
+                        encounters_since_save = 0
+                        logger.info(f"Autosaved game to slot {current_save_slot}")
 
             except Exception as e:
                 logger.error(f"Error during exploration: {str(e)}")
@@ -177,7 +223,7 @@ def main():
                 print(f"  {sym['CURSOR']} 3. Save Game")
                 print(f"  {sym['CURSOR']} 4. Back")
 
-                inv_choice = input("\nChoose action: ").strip()
+                inv_choice = BaseView.get_input("\nChoose action: ").strip()
                 BaseView.clear_screen()
 
                 if inv_choice == "1":  # Manage Equipment
@@ -195,7 +241,12 @@ def main():
                             print(f"  {sym['CURSOR']} {i}. {item.name}")
                         try:
                             item_choice = (
-                                int(input("\nChoose item to use (0 to cancel): ")) - 1
+                                int(
+                                    BaseView.get_input(
+                                        "\nChoose item to use (0 to cancel): "
+                                    )
+                                )
+                                - 1
                             )
                             if 0 <= item_choice < len(usable_items):
                                 idx, item = usable_items[item_choice]
@@ -218,13 +269,13 @@ def main():
 
         elif choice == "5":  # Exit
             # Offer to save before exiting if save system is available
-            if SaveManager.save_system_available:
+            if SaveManager.is_available():
                 print(
                     f"\n{dec['SECTION']['START']}Save before exit?{dec['SECTION']['END']}"
                 )
                 print(f"  {sym['CURSOR']} 1. Yes, save game")
                 print(f"  {sym['CURSOR']} 2. No, exit without saving")
-                save_choice = input().strip()
+                save_choice = BaseView.get_input().strip()
 
                 if save_choice == "1":
                     success, slot = SaveManager.handle_save_game(
@@ -257,11 +308,63 @@ def main():
                     logger.info("Boss counter reset after encounter.")
             else:
                 MessageView.show_error("The corruption is not yet fully manifest.")
-                time.sleep(1.5)
+                BaseView.pause("MESSAGE")
 
     if player.health <= 0:
         game_view.show_game_over(player)
 
 
+def parse_args(argv: Optional[List[str]] = None):
+    import argparse
+
+    from src.utils.profiling import PROFILE_MODES, SUBSYSTEMS, parse_filters
+
+    parser = argparse.ArgumentParser(description="Terminal Quest")
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="sample",
+        choices=PROFILE_MODES,
+        default=os.getenv("GAME_PROFILE") or None,
+        help="Profile the session and write the results to logs/ "
+        "(default mode: sample; env: GAME_PROFILE)",
+    )
+    parser.add_argument(
+        "--profile-filter",
+        default=os.getenv("GAME_PROFILE_FILTER", ""),
+        help=f"Comma separated subsystems to keep: {', '.join(SUBSYSTEMS)} "
+        "(env: GAME_PROFILE_FILTER)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Seed the game's random streams to reproduce a session "
+        "(env: GAME_SEED)",
+    )
+    args = parser.parse_args(argv)
+    try:
+        args.profile_filter = parse_filters(args.profile_filter)
+    except ValueError as e:
+        parser.error(str(e))
+    return args
+
+
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    profiler = None
+    if args.profile:
+        from src.utils.profiling import SessionProfiler
+
+        # Before the profiler so its start line reaches the log file
+        setup_logging()
+
+        profiler = SessionProfiler(args.profile, args.profile_filter).start()
+    try:
+        main(seed=args.seed)
+    finally:
+        if profiler:
+            profiler.stop()
+        BaseView.close_display()
+        metrics.export_on_exit()
+        shutdown_logging()
@@ -1,8 +1,12 @@
 import os
 import logging
 from typing import Dict, Any, Optional
-import psycopg2
-from psycopg2.extras import RealDictCursor
+from src.config.migrations import (
+    LATEST_VERSION,
+    MIGRATION_LOCK_ID,
+    MIGRATIONS,
+    SCHEMA_VERSION_TABLE,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +23,10 @@ DB_CONFIG = {
 def get_connection():
     """Get a database connection"""
     try:
+        # Deferred so the game starts without loading the driver
+        import psycopg2
+        from psycopg2.extras import RealDictCursor
+
         conn = psycopg2.connect(
             host=DB_CONFIG["host"],
             port=DB_CONFIG["port"],
@@ -60,71 +68,55 @@ def execute_query(query: str, params: tuple = None) -> Optional[list]:
             conn.close()
 
 
-def init_database():
-    """Initialize the database schema"""
-    create_tables_query = """
-    -- Create characters table
-    CREATE TABLE IF NOT EXISTS characters (
-        id SERIAL PRIMARY KEY,
-        name VARCHAR(50) NOT NULL,
-        char_class VARCHAR(50) NOT NULL,
-        level INTEGER NOT NULL DEFAULT 1,
-        exp INTEGER NOT NULL DEFAULT 0,
-        exp_to_level INTEGER NOT NULL DEFAULT 100,
-        health INTEGER NOT NULL,
-        max_health INTEGER NOT NULL,
-        attack INTEGER NOT NULL,
-        defense INTEGER NOT NULL,
-        mana INTEGER NOT NULL,
-        max_mana INTEGER NOT NULL,
-        gold INTEGER NOT NULL DEFAULT 0,
-        created_at TIMESTAMP NOT NULL DEFAULT NOW(),
-        updated_at TIMESTAMP NOT NULL DEFAULT NOW()
-    );
-
-    -- Create inventory table
-    CREATE TABLE IF NOT EXISTS inventory_items (
-        id SERIAL PRIMARY KEY,
-        character_id INTEGER NOT NULL REFERENCES characters(id) ON DELETE CASCADE,
-        item_type VARCHAR(20) NOT NULL,
-        item_name VARCHAR(100) NOT NULL,
-        item_data JSONB NOT NULL,
-        equipped BOOLEAN NOT NULL DEFAULT FALSE,
-        slot VARCHAR(20) NULL,
-        created_at TIMESTAMP NOT NULL DEFAULT NOW()
-    );
-
-    -- Create save slots table
-    CREATE TABLE IF NOT EXISTS save_slots (
-        id SERIAL PRIMARY KEY,
-        slot_number INTEGER NOT NULL CHECK (slot_number BETWEEN 1 AND 5),
-        character_id INTEGER REFERENCES characters(id) ON DELETE SET NULL,
-        last_saved_at TIMESTAMP NOT NULL DEFAULT NOW(),
-        UNIQUE (slot_number)
-    );
-
-    -- Create game state table
-    CREATE TABLE IF NOT EXISTS game_state (
-        id SERIAL PRIMARY KEY,
-        character_id INTEGER NOT NULL REFERENCES characters(id) ON DELETE CASCADE,
-        encounters_until_boss INTEGER NOT NULL DEFAULT 10,
-        total_boss_interval INTEGER NOT NULL DEFAULT 10,
-        encounter_count INTEGER NOT NULL DEFAULT 0,
-        created_at TIMESTAMP NOT NULL DEFAULT NOW(),
-        updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
-        UNIQUE (character_id)
-    );
-
-    -- Initialize save slots
-    INSERT INTO save_slots (slot_number)
-    SELECT generate_series(1, 5)
-    ON CONFLICT DO NOTHING;
-    """
+def get_schema_version(cursor) -> int:
+    """Highest applied migration version, 0 for a fresh database"""
+    cursor.execute("SELECT to_regclass('schema_version') IS NOT NULL AS present")
+    if not cursor.fetchone()["present"]:
+        return 0
+    cursor.execute("SELECT COALESCE(MAX(version), 0) AS version FROM schema_version")
+    return cursor.fetchone()["version"]
+
 
+def init_database():
+    """Bring the database schema up to date by applying pending migrations"""
+    conn = None
     try:
-        execute_query(create_tables_query)
-        logger.info("Database schema initialized successfully")
+        conn = get_connection()
+        if not conn:
+            logger.error("Failed to get database connection")
+            return False
+
+        with conn.cursor() as cursor:
+            current = get_schema_version(cursor)
+            if current >= LATEST_VERSION:
+                conn.rollback()
+                logger.info(f"Database schema is current (version {current})")
+                return True
+
+            # Serialize concurrent launches; re-read once we hold the lock
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", (MIGRATION_LOCK_ID,))
+            cursor.execute(SCHEMA_VERSION_TABLE)
+            current = get_schema_version(cursor)
+
+            for migration in MIGRATIONS:
+                if migration.version <= current:
+                    continue
+                logger.info(
+                    f"Applying migration {migration.version}: {migration.description}"
+                )
+                cursor.execute(migration.sql)
+                cursor.execute(
+                    "INSERT INTO schema_version (version, description) VALUES (%s, %s)",
+                    (migration.version, migration.description),
+                )
+        conn.commit()
+        logger.info(f"Database schema migrated to version {LATEST_VERSION}")
         return True
     except Exception as e:
         logger.error(f"Database initialization error: {str(e)}")
+        if conn:
+            conn.rollback()
         return False
+    finally:
+        if conn:
+            conn.close()
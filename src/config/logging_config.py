@@ -1,41 +1,99 @@
-"""Logging configuration for the game."""
+"""Logging configuration for the game.
 
+Records are put on a queue by the game thread and written to disk by a
+``QueueListener`` thread, so file I/O and rotation never stall a frame.
+"""
+
+import atexit
 import logging
-import os
-from datetime import datetime
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Optional
+
+from src.config.settings import LOGGING_SETTINGS
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Queue handler that drops records instead of blocking when full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
 
 
 def setup_logging(debug_mode: bool = False) -> None:
-    # Create logs directory
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
-
-    # Create timestamped log file
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_file = log_dir / f"debug_{timestamp}.log"
-
-    # Set up basic configuration
-    level = logging.DEBUG if debug_mode else logging.INFO
-
-    # Configure root logger
-    logging.basicConfig(
-        level=level,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler(),  # Also output to console
-        ],
-    )
+    """Route all logging through a background writer thread.
+
+    Safe to call more than once; later calls only adjust the level.
+    """
+    global _listener, _queue_handler
+
+    level = logging.DEBUG if debug_mode else LOGGING_SETTINGS["LEVEL"]
+    root = logging.getLogger()
+    root.setLevel(level)
 
     # Create loggers for different components
-    loggers = {
-        "ai": logging.getLogger("ai"),
-        "game": logging.getLogger("game"),
-        "combat": logging.getLogger("combat"),
-        "character": logging.getLogger("character"),
-    }
-
-    # Configure all loggers
-    for logger in loggers.values():
-        logger.setLevel(level)
+    for name in ("ai", "game", "combat", "character"):
+        logging.getLogger(name).setLevel(level)
+
+    if _listener is not None:
+        return
+
+    log_file = Path(LOGGING_SETTINGS["FILE"])
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+
+    formatter = logging.Formatter(LOGGING_SETTINGS["FORMAT"])
+    file_handler = RotatingFileHandler(
+        log_file,
+        maxBytes=LOGGING_SETTINGS["MAX_BYTES"],
+        backupCount=LOGGING_SETTINGS["BACKUP_COUNT"],
+        encoding="utf-8",
+    )
+    file_handler.setFormatter(formatter)
+    handlers = [file_handler]
+
+    if LOGGING_SETTINGS["CONSOLE"] or debug_mode:
+        console = logging.StreamHandler()
+        console.setFormatter(formatter)
+        console.setLevel(logging.WARNING)
+        handlers.append(console)
+
+    log_queue = queue.Queue(LOGGING_SETTINGS["QUEUE_SIZE"])
+    _queue_handler = DroppingQueueHandler(log_queue)
+
+    # Replace any handlers installed before setup (e.g. by basicConfig)
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(_queue_handler)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Drain the queue and close the log files"""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    if _queue_handler.dropped:
+        logging.getLogger(__name__).warning(
+            f"Dropped {_queue_handler.dropped} log records while the queue was full"
+        )
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    logging.getLogger().removeHandler(_queue_handler)
+    _listener = None
+    _queue_handler = None
@@ -0,0 +1,110 @@
+"""Numbered schema migrations, applied in order by ``init_database``."""
+
+from dataclasses import dataclass
+from typing import List
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    sql: str
+
+
+# Arbitrary key for pg_advisory_xact_lock while migrating
+MIGRATION_LOCK_ID = 7_301_001
+
+SCHEMA_VERSION_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    description TEXT NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+"""
+
+MIGRATIONS: List[Migration] = [
+    Migration(
+        1,
+        "Initial schema",
+        """
+    -- Create characters table
+    CREATE TABLE IF NOT EXISTS characters (
+        id SERIAL PRIMARY KEY,
+        name VARCHAR(50) NOT NULL,
+        char_class VARCHAR(50) NOT NULL,
+        level INTEGER NOT NULL DEFAULT 1,
+        exp INTEGER NOT NULL DEFAULT 0,
+        exp_to_level INTEGER NOT NULL DEFAULT 100,
+        health INTEGER NOT NULL,
+        max_health INTEGER NOT NULL,
+        attack INTEGER NOT NULL,
+        defense INTEGER NOT NULL,
+        mana INTEGER NOT NULL,
+        max_mana INTEGER NOT NULL,
+        gold INTEGER NOT NULL DEFAULT 0,
+        created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+        updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+    );
+
+    -- Create inventory table
+    CREATE TABLE IF NOT EXISTS inventory_items (
+        id SERIAL PRIMARY KEY,
+        character_id INTEGER NOT NULL REFERENCES characters(id) ON DELETE CASCADE,
+        item_type VARCHAR(20) NOT NULL,
+        item_name VARCHAR(100) NOT NULL,
+        item_data JSONB NOT NULL,
+        equipped BOOLEAN NOT NULL DEFAULT FALSE,
+        slot VARCHAR(20) NULL,
+        created_at TIMESTAMP NOT NULL DEFAULT NOW()
+    );
+
+    -- Create save slots table
+    CREATE TABLE IF NOT EXISTS save_slots (
+        id SERIAL PRIMARY KEY,
+        slot_number INTEGER NOT NULL CHECK (slot_number BETWEEN 1 AND 5),
+        character_id INTEGER REFERENCES characters(id) ON DELETE SET NULL,
+        last_saved_at TIMESTAMP NOT NULL DEFAULT NOW(),
+        UNIQUE (slot_number)
+    );
+
+    -- Create game state table
+    CREATE TABLE IF NOT EXISTS game_state (
+        id SERIAL PRIMARY KEY,
+        character_id INTEGER NOT NULL REFERENCES characters(id) ON DELETE CASCADE,
+        encounters_until_boss INTEGER NOT NULL DEFAULT 10,
+        total_boss_interval INTEGER NOT NULL DEFAULT 10,
+        encounter_count INTEGER NOT NULL DEFAULT 0,
+        created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+        updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+        UNIQUE (character_id)
+    );
+
+    -- Initialize save slots
+    INSERT INTO save_slots (slot_number)
+    SELECT generate_series(1, 5)
+    ON CONFLICT DO NOTHING;
+    """,
+    ),
+    Migration(
+        2,
+        "Index inventory items by character",
+        """
+    -- Loading a save and the ON DELETE CASCADE from characters both look
+    -- inventory up by character. game_state(character_id) is already
+    -- indexed through its UNIQUE constraint, so it needs nothing here.
+    CREATE INDEX IF NOT EXISTS idx_inventory_items_character_id
+        ON inventory_items (character_id);
+    """,
+    ),
+    Migration(
+        3,
+        "Store random stream state with the game state",
+        """
+    -- Seed and position of each src/utils/rng.py stream; NULL for saves
+    -- made before this migration, which keep the session's own seed.
+    ALTER TABLE game_state ADD COLUMN IF NOT EXISTS rng_state JSONB NULL;
+    """,
+    ),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
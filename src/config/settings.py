@@ -84,16 +84,121 @@ DISPLAY_SETTINGS = {
     "TYPE_SPEED": 0.03,
     "COMBAT_MESSAGE_DELAY": 1.0,
     "LEVEL_UP_DELAY": 2.0,
+    # Compose each screen off-screen and redraw only the lines that changed
+    "FRAME_BUFFER": True,
+}
+
+# Pacing: every on-screen wait is named after what it is for
+PACING_SETTINGS = {
+    "SPEED": 1.0,  # Multiplier for all delays; 0 disables waiting entirely
+    "SKIP_ON_KEYPRESS": True,  # Any key ends the current wait early
+    "DELAYS": {
+        "MESSAGE": 1.5,
+        "RESULT": 2.0,
+        "BRIEF": 1.0,
+        "TRANSITION": 1.5,
+        "COMBAT_MESSAGE": DISPLAY_SETTINGS["COMBAT_MESSAGE_DELAY"],
+        "COMBAT_ACTION": 2.0,
+        "COMBAT_TURN": 1.5,
+        "LEVEL_UP": DISPLAY_SETTINGS["LEVEL_UP_DELAY"],
+        "BOSS_ALERT": 1.5,
+        "BOSS_INTRO": 3.0,
+        "BOSS_VICTORY": 5.0,
+        "ANIMATION_FRAME": 0.3,
+        "ANIMATION_LINE": 0.15,
+    },
+}
+
+# Session metrics (see src/utils/metrics.py)
+METRICS_SETTINGS = {
+    "EXPORT_ON_EXIT": True,
+    "EXPORT_FORMAT": "json",  # "json" or "prometheus"
+    "EXPORT_PATH": "logs/metrics",  # Extension is added from the format
+}
+
+TRACING_SETTINGS = {
+    "ENABLED": True,
+    "EXPORT_PATH": "logs/traces.jsonl",  # One JSON span per line, appended
+    "MAX_BYTES": 5 * 1024 * 1024,  # Rotate the export file at this size
+    "BACKUP_COUNT": 2,
+}
+
+# Combat replay logs (see src/services/combat_replay.py)
+COMBAT_REPLAY_SETTINGS = {
+    "ENABLED": True,
+    "OUTPUT_DIR": "logs/combats",  # One JSONL file per combat
+    "KEEP": 50,  # Newest logs kept; defeats and errors are never pruned
+}
+
+# Session profiling (see src/utils/profiling.py)
+PROFILING_SETTINGS = {
+    "OUTPUT_DIR": "logs",
+    "SAMPLE_INTERVAL": 0.005,  # Seconds between stack samples
+    "REPORT_ROWS": 60,  # Rows in the cProfile text report
+}
+
+# Logging pipeline (see src/config/logging_config.py)
+LOGGING_SETTINGS = {
+    "LEVEL": "DEBUG",
+    "FILE": "logs/game.log",
+    "FORMAT": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    "MAX_BYTES": 5 * 1024 * 1024,  # Rotate the log file at this size
+    "BACKUP_COUNT": 3,
+    "CONSOLE": False,  # Console output draws over the game screen
+    "QUEUE_SIZE": 10000,  # Records beyond this are dropped, never blocking play
+    "AI_PAYLOAD_SAMPLE_RATE": 1.0,  # Share of AI calls whose payloads are logged
+    "AI_PAYLOAD_MAX_CHARS": 4000,  # Longer payloads are truncated in the log
 }
 
 # AI Generation settings
 AI_SETTINGS = {
+    # Structured output needs gpt-4o-mini or newer
+    "MODEL": "gpt-4o-mini",
     "TEMPERATURE": 0.7,
     "MAX_TOKENS": 800,
     "MAX_RETRIES": 3,
     "PRESENCE_PENALTY": 0.2,
     "FREQUENCY_PENALTY": 0.3,
     "TIMEOUT": 30,
+    # OpenAI-compatible endpoint, e.g. benchmarks/ai_stub_server.py; None uses
+    # the official API. The OPENAI_BASE_URL environment variable overrides it.
+    "BASE_URL": None,
+    # Provider-side JSON enforcement: "json_schema" (strict, from the
+    # src/services/ai_schemas.py dataclasses), "json_object" or "off".
+    # Steps down automatically if the endpoint rejects a mode.
+    "STRUCTURED_OUTPUT": "json_schema",
+}
+
+# Failure handling for AI requests (see src/services/ai_resilience.py)
+AI_RESILIENCE_SETTINGS = {
+    "BACKOFF_BASE": 0.5,  # Seconds; doubles per retry, with full jitter
+    "BACKOFF_MAX": 4.0,
+    "BREAKER_WINDOW": 20,  # Recent requests considered by the breaker
+    "BREAKER_FAILURE_RATE": 0.5,  # Open when this share of them failed...
+    "BREAKER_MIN_CALLS": 5,  # ...and at least this many were recorded
+    "BREAKER_COOLDOWN": 30,  # Seconds to serve fallbacks before a trial request
+    "HEDGE_ENABLED": False,  # Send a duplicate request for slow calls
+    "HEDGE_PERCENTILE": 0.95,  # Hedge once a request outlives this percentile
+    "HEDGE_MIN_SAMPLES": 20,  # Latencies needed before hedging starts
+    "HEDGE_MIN_DELAY": 0.5,
+}
+
+# Client-side limits on AI requests (see src/services/ai_scheduler.py)
+AI_RATE_LIMITS = {
+    "REQUESTS_PER_MINUTE": 500,
+    "TOKENS_PER_MINUTE": 200000,
+    "SPECULATIVE_RESERVE": 0.2,  # Share of capacity speculative work must leave
+}
+
+# NPC free-chat prompt context (see src/services/npc_context.py)
+NPC_CHAT_SETTINGS = {
+    "RECENT_MESSAGES": 6,  # Kept verbatim; older ones are summarized
+    "SUMMARIZE_EVERY": 6,  # Messages that must age out before re-summarizing
+    "SUMMARY_MAX_CHARS": 600,
+    "SUMMARY_WAIT": 2.0,  # Seconds leaving a chat waits for a summary in flight
+    "MEMORY_ITEMS": 5,  # Most recent NPC.memory entries included
+    # Whole response prompt, including the ~800-token shared lore prefix
+    "PROMPT_TOKEN_BUDGET": 2000,
 }
 
 # AI Generation Settings
@@ -104,7 +209,7 @@ ENABLE_AI_ART_GENERATION = True  # Master switch for all AI art generation
 
 # AI Generation Retry Settings
 MAX_GENERATION_ATTEMPTS = 3  # Maximum number of retry attempts for generation
-GENERATION_TIMEOUT = 30  # Timeout in seconds for each generation attempt
+GENERATION_TIMEOUT = 30  # Deadline in seconds for a generation, retries included
 
 # Enemy Generation Settings
 ENEMY_GENERATION = {
@@ -117,6 +222,20 @@ ENEMY_GENERATION = {
         "DEFENSE_PER_LEVEL": 1,
     },
     "EXP_REWARD": {"BASE": 10, "MULTIPLIER": 1.0},
+    # "ai" asks the model and falls back to the procedural generator;
+    # "procedural" never touches the network (src/services/enemy_generator.py).
+    # The ENEMY_GENERATION_MODE environment variable overrides it.
+    "MODE": "ai",
+    # Enemy level relative to the player's, picked uniformly from this list
+    "LEVEL_SPREAD": (-1, 0, 0, 1),
+}
+
+# Random number generation (src/utils/rng.py). Every subsystem draws from
+# its own stream derived from this seed; None picks a fresh one per session.
+# It is logged at startup and stored with each save. The GAME_SEED
+# environment variable and the --seed flag override it.
+RNG_SETTINGS = {
+    "SEED": None,
 }
 
 # Shop settings
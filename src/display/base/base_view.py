@@ -1,5 +1,5 @@
-import time
 from typing import Dict, Any
+from src.display.base.display import Display, TerminalDisplay
 from src.display.themes.dark_theme import SYMBOLS as sym
 from src.display.themes.dark_theme import DECORATIONS as dec
 import os
@@ -11,6 +11,7 @@ class BaseView:
 
     DEBUG_MODE = os.getenv("DEBUG_MODE", False)
     logger = logging.getLogger("display")
+    display: Display = TerminalDisplay()
 
     @classmethod
     def initialize(cls, debug_mode: bool = False):
@@ -18,14 +19,43 @@ class BaseView:
         cls.DEBUG_MODE = debug_mode
         cls.logger.debug(f"BaseView initialized with DEBUG_MODE: {debug_mode}")
 
+    @classmethod
+    def use_display(cls, display: Display):
+        """Swap the active display backend"""
+        cls.display.close()
+        cls.display = display
+        display.open(cls.DEBUG_MODE)
+        cls.logger.debug(f"Display backend: {type(display).__name__}")
+
+    @classmethod
+    def open_display(cls) -> bool:
+        """Activate the current display backend"""
+        return cls.display.open(cls.DEBUG_MODE)
+
+    @classmethod
+    def close_display(cls):
+        """Release the current display backend"""
+        cls.display.close()
+
+    @classmethod
+    def get_input(cls, prompt: str = "") -> str:
+        """Read a line of player input through the active display"""
+        return cls.display.read_input(prompt)
+
+    @classmethod
+    def pause(cls, category: str = "MESSAGE"):
+        """Show everything printed so far, then wait for a pacing category"""
+        cls.display.pause(category)
+
+    @classmethod
+    def emit(cls, name: str, **data: Any):
+        """Report a structured event to the active display"""
+        cls.display.emit(name, data)
+
     @classmethod
     def clear_screen(cls):
         """Clear screen if not in debug mode"""
-        if not cls.DEBUG_MODE:
-            os.system("cls" if os.name == "nt" else "clear")
-        else:
-            cls.logger.debug("Screen clear skipped (DEBUG_MODE)")
-            print("\n" + "=" * 50 + "\n")  # Visual separator in debug mode
+        cls.display.clear(cls.DEBUG_MODE)
 
     @staticmethod
     def display_error(message: str):
@@ -44,4 +74,4 @@ class BaseView:
         print(f"  {sym['HEALTH']} Health restored: {healing}")
         print(f"  {sym['MANA']} Mana recharged: {healing}")
         print("\nYour dark powers are refreshed...")
-        time.sleep(1.5)
+        BaseView.pause("MESSAGE")
@@ -0,0 +1,206 @@
+"""Pluggable display backends used by every view through ``BaseView``."""
+
+import io
+import logging
+import os
+import sys
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO, Union
+
+from src.config.settings import DISPLAY_SETTINGS
+from src.display.base import frame_buffer
+from src.display.base.frame_buffer import FrameBuffer
+from src.utils.pacing import Pacer
+
+logger = logging.getLogger("display")
+
+
+@dataclass
+class DisplayEvent:
+    """A structured view event, e.g. damage dealt or a level gained"""
+
+    name: str
+    data: Dict[str, Any] = field(default_factory=dict)
+
+
+class Display(ABC):
+    """Where views send output, read input and wait.
+
+    Views keep using ``print`` for text; a backend decides where
+    ``sys.stdout`` points while it is active. Everything else goes
+    through these methods so that non-interactive backends can run
+    the game at full speed.
+    """
+
+    def open(self, debug_mode: bool = False) -> bool:
+        """Called when the backend becomes the active display"""
+        return False
+
+    def close(self):
+        """Called when the backend stops being the active display"""
+
+    def clear(self, debug_mode: bool = False):
+        """Start a fresh screen"""
+
+    @abstractmethod
+    def read_input(self, prompt: str = "") -> str:
+        """Show ``prompt`` and return the player's answer"""
+
+    def pause(self, category: str):
+        """Let the player read what is on screen (see ``PACING_SETTINGS``)"""
+
+    def emit(self, name: str, data: Dict[str, Any]):
+        """Receive a structured event alongside the printed text"""
+
+
+class TerminalDisplay(Display):
+    """Interactive terminal: real input, real sleeps, optional frame buffer"""
+
+    def __init__(self, pacer: Optional[Pacer] = None):
+        self.frame: Optional[FrameBuffer] = None
+        self.pacer = pacer or Pacer()
+
+    def open(self, debug_mode: bool = False) -> bool:
+        """Compose screens off-screen and flush only changed lines"""
+        if self.frame or debug_mode or not DISPLAY_SETTINGS["FRAME_BUFFER"]:
+            return False
+        if not sys.stdout.isatty():
+            logger.debug("Frame buffer disabled: stdout is not a terminal")
+            return False
+        self.frame = frame_buffer.install()
+        logger.debug("Frame buffer display enabled")
+        return True
+
+    def close(self):
+        """Present the last frame and restore direct terminal output"""
+        if self.pacer.stats:
+            logger.info(self.pacer.summary())
+        if self.frame:
+            frame_buffer.uninstall(self.frame)
+            logger.debug(
+                f"Frame buffer wrote {self.frame.bytes_written} bytes "
+                f"in {self.frame.frames} frames"
+            )
+            self.frame = None
+
+    def clear(self, debug_mode: bool = False):
+        if self.frame:
+            self.frame.begin_frame()
+        elif not debug_mode:
+            os.system("cls" if os.name == "nt" else "clear")
+        else:
+            logger.debug("Screen clear skipped (DEBUG_MODE)")
+            print("\n" + "=" * 50 + "\n")  # Visual separator in debug mode
+
+    def read_input(self, prompt: str = "") -> str:
+        return input(prompt)
+
+    def pause(self, category: str):
+        sys.stdout.flush()
+        self.pacer.wait(category)
+
+
+class RecordingDisplay(Display):
+    """Headless backend: captures text and events, never sleeps.
+
+    Reading input raises ``EOFError``, the same as a closed stdin, so use
+    ``ScriptedDisplay`` for anything that prompts the player. Once the
+    captured text passes ``max_output`` characters, the next ``clear``
+    drops it, so long sessions don't grow the buffer without bound.
+    """
+
+    def __init__(self, capture_output: bool = True, max_output: int = 1_000_000):
+        self.capture_output = capture_output
+        self.max_output = max_output
+        self.events: List[DisplayEvent] = []
+        self.output = io.StringIO()
+        self.screens = 0
+        # Zero-delay pacer: counts what an interactive session would wait
+        self.pacer = Pacer(speed=0)
+        self._stdout: Optional[TextIO] = None
+        self._devnull: Optional[TextIO] = None
+
+    def open(self, debug_mode: bool = False) -> bool:
+        self._stdout = sys.stdout
+        if self.capture_output:
+            sys.stdout = self.output
+        else:
+            self._devnull = open(os.devnull, "w")
+            sys.stdout = self._devnull
+        return True
+
+    def close(self):
+        if self._stdout is not None:
+            sys.stdout = self._stdout
+            self._stdout = None
+        if self._devnull is not None:
+            self._devnull.close()
+            self._devnull = None
+
+    def clear(self, debug_mode: bool = False):
+        self.screens += 1
+        if self.output.tell() > self.max_output:
+            self.output.seek(0)
+            self.output.truncate()
+
+    def read_input(self, prompt: str = "") -> str:
+        print(prompt, end="")
+        raise EOFError("RecordingDisplay has no input")
+
+    def pause(self, category: str):
+        self.pacer.wait(category)
+
+    @property
+    def paused_seconds(self) -> float:
+        return self.pacer.total_requested
+
+    def emit(self, name: str, data: Dict[str, Any]):
+        self.events.append(DisplayEvent(name, dict(data)))
+
+    def events_named(self, name: str) -> List[DisplayEvent]:
+        return [event for event in self.events if event.name == name]
+
+    @property
+    def text(self) -> str:
+        return self.output.getvalue()
+
+
+InputSource = Union[Iterable[str], Callable[[str, "ScriptedDisplay"], str]]
+
+
+class ScriptedDisplay(RecordingDisplay):
+    """Headless backend that answers prompts from a script.
+
+    ``inputs`` is either a sequence of answers consumed in order, or a
+    callable ``(prompt, display) -> str`` that can inspect the recorded
+    text and events to decide. Running out of answers raises
+    ``EOFError``.
+    """
+
+    def __init__(
+        self,
+        inputs: InputSource,
+        capture_output: bool = True,
+        max_output: int = 1_000_000,
+    ):
+        super().__init__(capture_output, max_output)
+        if callable(inputs):
+            self._responder = inputs
+            self._answers = None
+        else:
+            self._responder = None
+            self._answers = iter(inputs)
+        self.prompts: List[str] = []
+
+    def read_input(self, prompt: str = "") -> str:
+        print(prompt, end="")
+        self.prompts.append(prompt)
+        if self._responder:
+            answer = self._responder(prompt, self)
+        else:
+            answer = next(self._answers, None)
+        if answer is None:
+            raise EOFError("ScriptedDisplay ran out of input")
+        print(answer)
+        return answer
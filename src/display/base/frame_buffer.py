@@ -0,0 +1,173 @@
+"""Off-screen frame composition with diff-based terminal updates."""
+
+import io
+import re
+import shutil
+import sys
+import unicodedata
+from typing import List, Optional, Set, TextIO
+
+# Cursor/erase sequences used when presenting a frame
+HOME_AND_CLEAR = "\x1b[H\x1b[2J"
+CLEAR_TO_EOL = "\x1b[K"
+CLEAR_TO_EOS = "\x1b[J"
+
+# CSI sequences (colors, cursor moves) take up no columns on screen
+_CSI_PATTERN = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
+
+
+def _char_width(char: str) -> int:
+    if unicodedata.combining(char):
+        return 0
+    # Emoji and CJK take two columns
+    return 2 if unicodedata.east_asian_width(char) in "WF" else 1
+
+
+def visible_width(line: str) -> int:
+    """Number of terminal columns a line occupies, ignoring escape codes"""
+    text = _CSI_PATTERN.sub("", line)
+    if text.isascii():
+        return len(text)
+    return sum(_char_width(char) for char in text)
+
+
+def _move_to(row: int) -> str:
+    return f"\x1b[{row + 1};1H"
+
+
+class FrameBuffer(io.TextIOBase):
+    """Stand-in for ``sys.stdout`` that composes output into frames.
+
+    ``begin_frame`` replaces the old clear-screen call: the new frame is
+    built off-screen and nothing reaches the terminal until ``flush``.
+    Flushing compares the frame line by line with what the terminal is
+    showing and rewrites only the lines that changed, using absolute
+    cursor positioning, in a single write. Frames that would scroll the
+    terminal fall back to a full clear and redraw.
+    """
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self._lines: List[str] = [""]
+        # What the terminal currently shows; None means unknown
+        self._screen: Optional[List[str]] = None
+        # Lines that changed on screen without going through the buffer
+        self._dirty: Set[int] = set()
+        self.frames = 0
+        self.bytes_written = 0
+
+    def writable(self) -> bool:
+        return True
+
+    @property
+    def encoding(self):
+        return getattr(self.stream, "encoding", "utf-8")
+
+    def write(self, text: str) -> int:
+        parts = text.replace("\r\n", "\n").split("\n")
+        self._lines[-1] += parts[0]
+        self._lines.extend(parts[1:])
+        return len(text)
+
+    def begin_frame(self):
+        """Start composing a new frame in place of clearing the screen"""
+        self._lines = [""]
+
+    def note_input(self, line: str):
+        """Record text the terminal echoed while reading user input"""
+        self.write(line if line.endswith("\n") else line + "\n")
+        if self._screen is not None:
+            # The echo landed after the prompt and moved the cursor down
+            row = len(self._lines) - 2
+            self._screen[row:] = [self._lines[row], ""]
+            self._dirty.add(row)
+
+    def flush(self):
+        output = self._render()
+        if output:
+            self.stream.write(output)
+            self.bytes_written += len(output.encode("utf-8", "replace"))
+        self.stream.flush()
+
+    def close(self):
+        self.flush()
+        super().close()
+
+    def invalidate(self):
+        """Force the next flush to redraw the whole frame"""
+        self._screen = None
+
+    def _fits_terminal(self) -> bool:
+        columns, rows = shutil.get_terminal_size()
+        return len(self._lines) <= rows and all(
+            visible_width(line) < columns for line in self._lines
+        )
+
+    def _render(self) -> str:
+        lines = self._lines
+        if lines == self._screen and not self._dirty:
+            return ""
+
+        self.frames += 1
+        fits = self._fits_terminal()
+        if self._screen is None or not fits:
+            # Unknown or scrolling screen: positions can't be trusted
+            self._screen = list(lines) if fits else None
+            self._dirty.clear()
+            return HOME_AND_CLEAR + "\n".join(lines)
+
+        screen = self._screen
+        out = []
+        last = len(lines) - 1
+        for row, line in enumerate(lines):
+            # The last line is always rewritten to leave the cursor after it
+            if (
+                row == last
+                or row >= len(screen)
+                or screen[row] != line
+                or row in self._dirty
+            ):
+                out.append(_move_to(row) + line)
+                if row != last:
+                    out.append(CLEAR_TO_EOL)
+        # Erase the tail of the last line and anything below it
+        out.append(CLEAR_TO_EOL)
+        if len(screen) > len(lines):
+            out.append(_move_to(len(lines)) + CLEAR_TO_EOS + _move_to(last))
+            out.append(lines[last])
+
+        self._screen = list(lines)
+        self._dirty.clear()
+        return "".join(out)
+
+
+class EchoingInput:
+    """Wraps ``sys.stdin`` so the frame buffer knows what input echoed"""
+
+    def __init__(self, stream: TextIO, frame: FrameBuffer):
+        self._stream = stream
+        self._frame = frame
+
+    def readline(self, *args) -> str:
+        line = self._stream.readline(*args)
+        self._frame.note_input(line)
+        return line
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+def install(stream: Optional[TextIO] = None) -> FrameBuffer:
+    """Route ``sys.stdout``/``sys.stdin`` through a new frame buffer"""
+    frame = FrameBuffer(stream or sys.stdout)
+    sys.stdout = frame
+    sys.stdin = EchoingInput(sys.stdin, frame)
+    return frame
+
+
+def uninstall(frame: FrameBuffer):
+    """Present any pending output and restore the original streams"""
+    frame.flush()
+    sys.stdout = frame.stream
+    if isinstance(sys.stdin, EchoingInput):
+        sys.stdin = sys.stdin._stream
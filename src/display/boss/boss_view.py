@@ -2,7 +2,6 @@ from typing import Optional
 from ..base.base_view import BaseView
 from ..themes.dark_theme import DECORATIONS as dec, SYMBOLS as sym
 from ...models.boss import Boss
-import time
 
 
 class BossView(BaseView):
@@ -16,7 +15,7 @@ class BossView(BaseView):
         print(
             f"{dec['BOSS_ALERT']['START']} A Powerful Curse Approaches {dec['BOSS_ALERT']['END']}"
         )
-        time.sleep(1.5)
+        BaseView.pause("BOSS_ALERT")
 
         # Corruption visual effect
         for _ in range(3):
@@ -24,13 +23,13 @@ class BossView(BaseView):
                 f"\n{sym['CORRUPTION']} {sym['HOPE']} {sym['TAINT']} {sym['VOID']}",
                 end="",
             )
-            time.sleep(0.3)
+            BaseView.pause("ANIMATION_FRAME")
             BaseView.clear_screen()
             print(
                 f"\n{sym['VOID']} {sym['TAINT']} {sym['HOPE']} {sym['CORRUPTION']}",
                 end="",
             )
-            time.sleep(0.3)
+            BaseView.pause("ANIMATION_FRAME")
             BaseView.clear_screen()
 
         # Boss name and title with thematic formatting
@@ -41,13 +40,13 @@ class BossView(BaseView):
         art_lines = boss.art.split("\n")
         for line in art_lines:
             print(f"{sym['VOID']}{line}{sym['VOID']}")
-            time.sleep(0.15)
+            BaseView.pause("ANIMATION_LINE")
 
         # Warning message matching the lore
         print(
             f"\n{dec['WARNING']['START']} Beware the touch of false hope! {dec['WARNING']['END']}"
         )
 
-        input(
+        BaseView.get_input(
             f"\n{sym['VOID']} Steel your resolve and press Enter to face this corruption..."
         )
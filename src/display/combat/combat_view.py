@@ -1,12 +1,10 @@
 from typing import List, Optional
-from src.config.settings import DISPLAY_SETTINGS
 from src.models.items.consumable import Consumable
 from src.display.base.base_view import BaseView
 from src.display.themes.dark_theme import SYMBOLS as sym
 from src.display.themes.dark_theme import DECORATIONS as dec
 from src.models.character import Player, Enemy, Character
 import random
-import time
 from src.models.effects.base import BaseEffect
 from src.models.base_types import EffectTrigger
 
@@ -108,7 +106,15 @@ class CombatView(BaseView):
                 rune = random.choice(dec["RUNES"])
                 print(f"  {rune} {item.name} ({item.rarity.value})")
 
-        time.sleep(2)
+        BaseView.emit(
+            "show_battle_result",
+            player=player.name,
+            enemy=enemy.name,
+            exp=rewards.get("exp", 0),
+            gold=rewards.get("gold", 0),
+            items=[item.name for item in rewards.get("items") or []],
+        )
+        BaseView.pause("RESULT")
 
     @staticmethod
     def show_level_up(player: Player):
@@ -121,7 +127,19 @@ class CombatView(BaseView):
         print(f"  {sym['MANA']} Mana increased")
         print(f"  {sym['ATTACK']} Attack improved")
         print(f"  {sym['DEFENSE']} Defense improved")
-        time.sleep(2)
+        BaseView.emit("show_level_up", player=player.name, level=player.level)
+        BaseView.pause("LEVEL_UP")
+
+    @staticmethod
+    def show_damage(damage: int, target: Optional[Character] = None):
+        """Display damage dealt outside the regular combat log"""
+        if target:
+            print(f"  {sym['ATTACK']} {target.name} takes {damage} damage")
+        else:
+            print(f"  {sym['ATTACK']} {damage} damage dealt")
+        BaseView.emit(
+            "show_damage", damage=damage, target=target.name if target else None
+        )
 
     @staticmethod
     def show_status_effect(character: Character, effect_name: str, damage: int = 0):
@@ -176,7 +194,7 @@ class CombatView(BaseView):
             print(f"  {sym['ATTACK']} {enemy_name} strikes you as you flee")
             print(f"  {sym['HEALTH']} You take {damage_taken} damage")
 
-        time.sleep(2)  # Give time to read the message
+        BaseView.pause("RESULT")  # Give time to read the message
 
     @staticmethod
     def show_effect_trigger(
@@ -197,4 +215,4 @@ class CombatView(BaseView):
             message += f" on {target.name}"
 
         print(message)
-        time.sleep(DISPLAY_SETTINGS["COMBAT_MESSAGE_DELAY"])
+        BaseView.pause("COMBAT_MESSAGE")
@@ -4,7 +4,6 @@ from src.display.themes.dark_theme import DECORATIONS as dec
 from src.display.themes.dark_theme import SYMBOLS as sym
 from src.models.base_types import EncounterType
 from src.models.character import Player
-import time
 import random
 
 
@@ -165,4 +164,4 @@ class EncounterView(BaseView):
         ]
 
         print(f"\n{random.choice(transitions)}")
-        time.sleep(1.5)
+        BaseView.pause("TRANSITION")
@@ -1,5 +1,4 @@
 from typing import Dict, List, Any, Optional
-import time
 import random
 
 from src.display.base.base_view import BaseView
@@ -9,6 +8,7 @@ from src.models.npc import NPC, NPCQuest, NPCDialogue
 from src.models.character import Player
 from src.services.npc_generator import NPCGenerator
 from src.display.common.message_view import MessageView
+from src.services.npc_context import ConversationContext
 
 
 class NPCView(BaseView):
@@ -155,6 +155,8 @@ class NPCView(BaseView):
     def handle_npc_interaction(npc: NPC, player: Player):
         """Handle complete NPC interaction session"""
         conversation_history = []
+        # Shared by every free chat in this interaction, so summaries carry over
+        chat_context = ConversationContext(npc)
         current_dialogue = None
 
         while True:
@@ -164,7 +166,7 @@ class NPCView(BaseView):
             if current_dialogue:
                 # We're in a specific dialogue
                 NPCView.show_dialogue_options(npc, current_dialogue)
-                choice = input("\nChoose your response: ").strip()
+                choice = BaseView.get_input("\nChoose your response: ").strip()
 
                 if choice == "0":
                     # Go back to main menu
@@ -198,7 +200,7 @@ class NPCView(BaseView):
                         # Display action result
                         if "action" in response:
                             print(f"\n{response['action']}")
-                            time.sleep(2)
+                            BaseView.pause("RESULT")
 
                         # Add to conversation history
                         conversation_history.append(f"You: {response['text']}")
@@ -222,12 +224,12 @@ class NPCView(BaseView):
                 except ValueError:
                     MessageView.show_error("Please enter a number.")
 
-                input("\nPress Enter to continue...")
+                BaseView.get_input("\nPress Enter to continue...")
 
             else:
                 # Main interaction menu
                 NPCView.show_dialogue_options(npc)
-                choice = input("\nChoose your action: ").strip()
+                choice = BaseView.get_input("\nChoose your action: ").strip()
 
                 if choice == "0":
                     # Exit the interaction
@@ -239,7 +241,7 @@ class NPCView(BaseView):
 
                 elif choice == "5":
                     # Free chat mode
-                    NPCView.handle_free_chat(npc, conversation_history)
+                    NPCView.handle_free_chat(npc, conversation_history, chat_context)
 
                 else:
                     try:
@@ -254,13 +256,13 @@ class NPCView(BaseView):
                             conversation_history.append(
                                 f"{npc.name}: {current_dialogue.text}"
                             )
-                            time.sleep(1)
+                            BaseView.pause("BRIEF")
                         else:
                             MessageView.show_error("Invalid choice.")
                     except ValueError:
                         MessageView.show_error("Please enter a number.")
 
-                    input("\nPress Enter to continue...")
+                    BaseView.get_input("\nPress Enter to continue...")
 
     @staticmethod
     def handle_quest_menu(npc: NPC, player: Player):
@@ -268,7 +270,7 @@ class NPCView(BaseView):
         while True:
             NPCView.show_quest_list(npc, player)
 
-            choice = input("\nEnter your choice: ").strip()
+            choice = BaseView.get_input("\nEnter your choice: ").strip()
 
             if choice == "0":
                 # Go back
@@ -286,7 +288,7 @@ class NPCView(BaseView):
             except ValueError:
                 MessageView.show_error("Please enter a number.")
 
-            time.sleep(1)
+            BaseView.pause("BRIEF")
 
     @staticmethod
     def handle_quest_details(quest: NPCQuest, npc: NPC, player: Player):
@@ -295,10 +297,12 @@ class NPCView(BaseView):
             NPCView.show_quest_details(quest)
 
             if quest.completed:
-                input("\nThis quest is already completed. Press Enter to go back.")
+                BaseView.get_input(
+                    "\nThis quest is already completed. Press Enter to go back."
+                )
                 break
 
-            choice = input("\nEnter your choice: ").strip()
+            choice = BaseView.get_input("\nEnter your choice: ").strip()
 
             if choice == "0":
                 # Go back
@@ -321,7 +325,7 @@ class NPCView(BaseView):
                     # In a full implementation, we would add to player's active quests
                     # player.add_active_quest(quest)
 
-                    time.sleep(2)
+                    BaseView.pause("RESULT")
                     break
                 else:
                     # No specific dialogue found, use generic acceptance
@@ -333,32 +337,53 @@ class NPCView(BaseView):
                     # In a full implementation, we would add to player's active quests
                     # player.add_active_quest(quest)
 
-                    time.sleep(2)
+                    BaseView.pause("RESULT")
                     break
 
     @staticmethod
-    def handle_free_chat(npc: NPC, conversation_history: List[str]):
+    def handle_free_chat(
+        npc: NPC,
+        conversation_history: List[str],
+        context: Optional[ConversationContext] = None,
+    ):
         """Handle free-form chat with the NPC"""
         local_history = conversation_history.copy()
+        if context is None:
+            context = ConversationContext(npc)
 
         while True:
             NPCView.show_chat_interface(npc, local_history)
 
-            player_input = input("\nYou: ").strip()
+            player_input = BaseView.get_input("\nYou: ").strip()
 
             if player_input.lower() == "/exit":
+                context.remember()
                 break
 
             if not player_input:
                 continue
 
+            # Bring the prompt context up to date before this turn
+            context.sync(local_history)
+
             # Add player's message to history
             local_history.append(f"You: {player_input}")
 
-            # Generate NPC response
-            response = NPCGenerator.generate_npc_response(
-                npc, player_input, local_history
-            )
+            # Stream the NPC's reply onto the screen as it arrives
+            print(f"\n  {npc.name}: ", end="", flush=True)
+            chunks = []
+            for chunk in NPCGenerator.stream_npc_response(npc, player_input, context):
+                if not chunks:
+                    chunk = chunk.lstrip("\"' ")
+                    if not chunk:
+                        continue
+                chunks.append(chunk)
+                print(chunk, end="", flush=True)
+            response = "".join(chunks).strip().strip("\"'")
+            if not response:
+                response = NPCGenerator.fallback_npc_response(npc)
+                print(response, end="")
+            print()
 
             # Add NPC's response to history
             local_history.append(f"{npc.name}: {response}")
@@ -370,7 +395,7 @@ class NPCView(BaseView):
             # Show response and wait for player to continue
             BaseView.clear_screen()
             NPCView.show_chat_interface(npc, local_history)
-            input("\nPress Enter to continue...")
+            BaseView.get_input("\nPress Enter to continue...")
 
     @staticmethod
     def handle_quest_completion_check(quest: NPCQuest, npc: NPC, player: Player):
@@ -403,6 +428,6 @@ class NPCView(BaseView):
             # Improve relationship with NPC
             npc.update_relationship(15)
 
-            input("\nPress Enter to continue...")
+            BaseView.get_input("\nPress Enter to continue...")
             return True
         return False
@@ -174,7 +174,7 @@ class InventoryView(BaseView):
             print(f"  {sym['CURSOR']} U to unequip")
             print(f"  {sym['CURSOR']} 0 to return")
 
-            choice = input("\nChoice: ").strip().lower()
+            choice = BaseView.get_input("\nChoice: ").strip().lower()
 
             if choice == "0":
                 break
@@ -195,7 +195,9 @@ class InventoryView(BaseView):
                         print(f"{slot}: {item.name}")
 
                 slot = (
-                    input("\nEnter slot to unequip (or 0 to cancel): ").strip().lower()
+                    BaseView.get_input("\nEnter slot to unequip (or 0 to cancel): ")
+                    .strip()
+                    .lower()
                 )
                 if slot != "0" and slot in player.equipment:
                     player.unequip_item(slot)
@@ -237,7 +239,9 @@ class InventoryView(BaseView):
                 MessageView.show_error("No items equipped!")
                 return
 
-            choice = input("\nEnter number to unequip (0 to cancel): ").strip()
+            choice = BaseView.get_input(
+                "\nEnter number to unequip (0 to cancel): "
+            ).strip()
             if choice == "0":
                 return
 
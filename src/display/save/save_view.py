@@ -128,7 +128,7 @@ class SaveView(BaseView):
 
         while True:
             try:
-                choice = int(input("\nEnter your choice (1-2): "))
+                choice = int(BaseView.get_input("\nEnter your choice (1-2): "))
                 if choice == 1:
                     return True
                 elif choice == 2:
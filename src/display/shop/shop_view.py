@@ -123,14 +123,14 @@ class ShopView(BaseView):
         while True:
             BaseView.clear_screen()
             ShopView.show_shop_menu(shop, player)
-            shop_choice = input().strip()
+            shop_choice = BaseView.get_input().strip()
 
             if shop_choice == "1":  # Buy
                 print(f"\n{dec['SECTION']['START']}Purchase{dec['SECTION']['END']}")
                 try:
                     item_index = (
                         int(
-                            input(
+                            BaseView.get_input(
                                 f"  {sym['RUNE']} Enter item number to buy (0 to cancel): "
                             )
                         )
@@ -140,17 +140,17 @@ class ShopView(BaseView):
                         if item_index == -1:  # User entered 0
                             continue
                         shop.buy_item(player, item_index)
-                    input(f"\n{sym['INFO']} Press Enter to continue...")
+                    BaseView.get_input(f"\n{sym['INFO']} Press Enter to continue...")
                 except ValueError:
                     MessageView.show_error("Invalid choice!")
-                    input(f"\n{sym['INFO']} Press Enter to continue...")
+                    BaseView.get_input(f"\n{sym['INFO']} Press Enter to continue...")
 
             elif shop_choice == "2":  # Sell
-                inventory_view.show_inventory(player)
+                inventory_view.InventoryView.show_inventory(player)
                 try:
                     item_index = (
                         int(
-                            input(
+                            BaseView.get_input(
                                 f"\n{sym['RUNE']} Enter item number to sell (0 to cancel): "
                             )
                         )
@@ -161,15 +161,15 @@ class ShopView(BaseView):
                             continue
                         if len(player.inventory["items"]) > item_index:
                             shop.sell_item(player, item_index, 1)
-                    input(f"\n{sym['INFO']} Press Enter to continue...")
+                    BaseView.get_input(f"\n{sym['INFO']} Press Enter to continue...")
                 except ValueError:
                     MessageView.show_error("Invalid choice!")
-                    input(f"\n{sym['INFO']} Press Enter to continue...")
+                    BaseView.get_input(f"\n{sym['INFO']} Press Enter to continue...")
 
             elif shop_choice == "3":  # Refresh
                 if shop.refresh_inventory(player):
                     MessageView.show_success("Shop inventory refreshed!")
-                input(f"\n{sym['INFO']} Press Enter to continue...")
+                BaseView.get_input(f"\n{sym['INFO']} Press Enter to continue...")
 
             elif shop_choice == "4":  # Leave
                 break
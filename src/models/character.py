@@ -1,4 +1,4 @@
-import random
+from ..utils.rng import rng
 from typing import Dict, List, Optional, Any
 
 from ..display.common.message_view import MessageView
@@ -13,6 +13,9 @@ from .items.sets import SetBonus, ITEM_SETS
 from .base_types import ItemType
 from .effects.base import BaseEffect  # Use BaseEffect instead of ItemEffect
 
+# ITEM_SETS is a list; equipment refers to its set by name
+SETS_BY_NAME = {item_set.name: item_set for item_set in ITEM_SETS}
+
 
 class Character(GameEntity):
     def __init__(
@@ -122,7 +125,7 @@ class Character(GameEntity):
 
         # Apply new set bonuses
         for set_name, count in set_counts.items():
-            item_set = ITEM_SETS.get(set_name)
+            item_set = SETS_BY_NAME.get(set_name)
             if item_set:
                 active_bonuses = item_set.get_active_bonuses(count)
                 self._apply_set_bonuses(set_name, active_bonuses)
@@ -418,7 +421,7 @@ def get_fallback_enemy(player_level: int = 1) -> Enemy:
         },
     ]
 
-    enemy_data = random.choice(fallback_enemies)
+    enemy_data = rng.enemies.choice(fallback_enemies)
 
     return Enemy(
         name=enemy_data["name"],
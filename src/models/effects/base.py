@@ -3,7 +3,7 @@ from dataclasses import dataclass, field
 from typing import Dict, Any, Optional
 from uuid import uuid4
 from ..base_types import GameEntity, EffectTrigger, EffectType
-import random
+from ...utils.rng import rng
 
 
 @dataclass
@@ -21,7 +21,7 @@ class BaseEffect:
     def apply(
         self, target: GameEntity, source: Optional[GameEntity] = None
     ) -> Dict[str, Any]:
-        if random.random() <= self.chance:
+        if rng.combat.random() <= self.chance:
             return {"success": True, "message": f"{self.name} applied"}
         else:
             return {"success": False, "message": f"{self.name} failed to apply"}
@@ -1,7 +1,7 @@
 from typing import Dict, Optional, List, TYPE_CHECKING
 from .base import BaseEffect
 from ..base_types import EffectType, EffectTrigger
-import random
+from ...utils.rng import rng
 
 if TYPE_CHECKING:
     from ..character import Character
@@ -66,7 +66,7 @@ class OnHitEffect(BaseEffect):
         self.effect = effect
 
     def apply(self, target: "Character", source: Optional["Character"] = None) -> Dict:
-        if random.random() < self.proc_chance:
+        if rng.combat.random() < self.proc_chance:
             result = self.effect.apply(target, source)
             return {
                 "proc": True,
@@ -138,7 +138,7 @@ class VoidShieldEffect(BaseEffect):
     def apply(
         self, target: "Character", source: Optional["Character"], damage: int = 0
     ) -> Dict:
-        if random.random() < self.block_chance:
+        if rng.combat.random() < self.block_chance:
             return {"blocked": True, "message": f"Void Shield absorbs the attack!"}
         return {"blocked": False}
 
@@ -168,7 +168,7 @@ class VoidAbsorptionEffect(BaseEffect):
     def apply(
         self, target: "Character", source: Optional["Character"], damage: int = 0
     ) -> Dict:
-        if random.random() < self.proc_chance:
+        if rng.combat.random() < self.proc_chance:
             defense_boost = min(damage // 4, 5)  # Cap at 5 defense
             target.defense += defense_boost
             return {
@@ -214,7 +214,7 @@ class VoidBoltEffect(BaseEffect):
     def apply(
         self, target: "Character", source: Optional["Character"], damage: int = 0
     ) -> Dict:
-        if random.random() < self.proc_chance:
+        if rng.combat.random() < self.proc_chance:
             void_damage = int(source.magic_power * 0.5)
             target.health -= void_damage
             return {
@@ -238,7 +238,7 @@ class HopesCorruptionEffect(BaseEffect):
     def apply(
         self, target: "Character", source: Optional["Character"], damage: int = 0
     ) -> Dict:
-        if random.random() < self.proc_chance:
+        if rng.combat.random() < self.proc_chance:
             defense_reduction = 15
             target.defense -= defense_reduction
             return {
@@ -2,7 +2,7 @@ from typing import Dict, Optional, TYPE_CHECKING
 from dataclasses import dataclass, field
 from .base import BaseEffect
 from ..base_types import EffectTrigger, EffectType
-import random
+from ...utils.rng import rng
 
 if TYPE_CHECKING:
     from ..character import Character
@@ -35,7 +35,7 @@ class StatusEffect(BaseEffect):
         self.chance_to_apply = chance_to_apply
 
     def apply(self, target: "Character", source: Optional["Character"] = None) -> Dict:
-        if random.random() <= self.chance_to_apply:
+        if rng.combat.random() <= self.chance_to_apply:
             if self.stat_modifiers:
                 for stat, modifier in self.stat_modifiers.items():
                     current_value = getattr(target, stat, 0)
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from typing import Dict, Optional
-import random
+from ..utils.rng import rng
 
 
 @dataclass
@@ -14,7 +14,7 @@ class StatusEffect:
 
     def apply(self, target: "Character") -> bool:  # type: ignore
         """Attempts to apply the status effect to a target"""
-        if random.random() <= self.chance_to_apply:
+        if rng.combat.random() <= self.chance_to_apply:
             # If same effect exists, refresh duration
             if self.name in target.status_effects:
                 target.status_effects[self.name].duration = max(
@@ -1,34 +1,44 @@
 """Core AI functionality for generating game content using OpenAI's API."""
 
-from openai import OpenAI
 import json
 import os
-from typing import Optional
-from ..config.settings import AI_SETTINGS
-from ..utils.debug import debug_log
-from ..utils.json_cleaner import JSONCleaner
+import threading
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    Optional,
+    Type,
+    TypeVar,
+    TYPE_CHECKING,
+    Union,
+)
+from ..config.settings import AI_RESILIENCE_SETTINGS, AI_SETTINGS, GENERATION_TIMEOUT
+from ..utils.debug import debug, debug_log
+from ..utils.metrics import metrics
+from ..utils.response_parser import (
+    SchemaError,
+    extract_json,
+    json_schema,
+    parse_response,
+)
+from ..utils.tracing import tracer
+from .ai_resilience import CircuitBreaker, Hedger, LatencyTracker, backoff_delay
+from .ai_scheduler import Priority, scheduler
+from .prompts import CHAT_SYSTEM_PROMPT, Prompt, as_prompt
 import logging
 
+if TYPE_CHECKING:
+    from openai import OpenAI
+
 logger = logging.getLogger("ai")
 
-SYSTEM_PROMPT = (
-    "You are a dark fantasy RPG content generator that MUST return ONLY valid JSON.\n"
-    "Rules:\n"
-    "1. Return ONLY the JSON object, no other text\n"
-    '2. Use ONLY double quotes (") for ALL properties and values\n'
-    "3. NO special characters in property names or values\n"
-    "4. ALL numbers must be single integers (no ranges, no decimals, no quotes)\n"
-    "5. When given a range, pick ONE number within that range\n"
-    "6. NO trailing commas\n"
-    "7. NO comments or explanations\n"
-    "8. NO additional properties beyond the template\n"
-    "9. NO formatting symbols (%$, etc)\n"
-    "10. Property names must match EXACTLY as shown\n"
-    "11. Follow the EXACT structure of the template"
-)
+T = TypeVar("T")
 
 
-def setup_openai() -> Optional[OpenAI]:
+def setup_openai() -> Optional["OpenAI"]:
     """Initialize and return an OpenAI client instance.
 
     Returns:
@@ -36,14 +46,24 @@ def setup_openai() -> Optional[OpenAI]:
     """
     try:
         api_key = os.getenv("OPENAI_API_KEY")
+        base_url = os.getenv("OPENAI_BASE_URL") or AI_SETTINGS["BASE_URL"]
         logger.debug(f"API Key present: {bool(api_key)}")
 
+        if not api_key and base_url:
+            # Local OpenAI-compatible servers accept any key
+            api_key = "local"
         if not api_key:
             logger.error("No OpenAI API key found")
             return None
 
-        client = OpenAI(api_key=api_key)
-        logger.debug("OpenAI client initialized successfully")
+        # The SDK takes most of a second to import; only pay for it when used
+        from openai import OpenAI
+
+        # generate_content owns retries, backoff and the circuit breaker
+        client = OpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+        logger.debug(
+            f"OpenAI client initialized successfully ({base_url or 'default endpoint'})"
+        )
         return client
 
     except Exception:
@@ -51,72 +71,429 @@ def setup_openai() -> Optional[OpenAI]:
         return None
 
 
+AI_REQUEST_SECONDS = metrics.histogram(
+    "ai_request_seconds", "Latency of a single chat completion request"
+)
+AI_RETRIES = metrics.counter("ai_retries_total", "Generation attempts after the first")
+AI_TOKENS = metrics.counter("ai_tokens_total", "Tokens reported by the API")
+AI_FAILURES = metrics.counter(
+    "ai_failures_total", "Failed generation attempts by stage"
+)
+AI_PROMPT_TOKENS = metrics.histogram(
+    "ai_prompt_tokens", "Estimated prompt tokens per request by template"
+)
+AI_FIRST_CHUNK_SECONDS = metrics.histogram(
+    "ai_first_chunk_seconds", "Time from sending a streamed request to its first text"
+)
+AI_RESPONSES = metrics.counter(
+    "ai_responses_total", "Completed responses by template, output mode and outcome"
+)
+
+# Strongest first; a mode the provider rejects steps down to the next
+OUTPUT_MODES = ("json_schema", "json_object", "off")
+_output_mode = AI_SETTINGS["STRUCTURED_OUTPUT"]
+
+_client: Optional["OpenAI"] = None
+_client_lock = threading.Lock()
+
+breaker = CircuitBreaker(
+    window=AI_RESILIENCE_SETTINGS["BREAKER_WINDOW"],
+    failure_rate=AI_RESILIENCE_SETTINGS["BREAKER_FAILURE_RATE"],
+    min_calls=AI_RESILIENCE_SETTINGS["BREAKER_MIN_CALLS"],
+    cooldown=AI_RESILIENCE_SETTINGS["BREAKER_COOLDOWN"],
+)
+_latencies = LatencyTracker()
+_hedger = Hedger(_latencies)
+
+
+def get_client() -> Optional["OpenAI"]:
+    """Return the shared OpenAI client, creating it on first use.
+
+    The client keeps its HTTP connection pool between calls, so every
+    generation after the first skips client setup and the TLS handshake.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = setup_openai()
+    return _client
+
+
+def _retry_after(error: Exception) -> float:
+    """Seconds the provider asked us to wait, from a 429 response"""
+    response = getattr(error, "response", None)
+    try:
+        return float(response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return AI_RESILIENCE_SETTINGS["BACKOFF_MAX"]
+
+
+def _estimate_tokens(prompt: Prompt) -> int:
+    """Rough request size for the rate limiter, reconciled with real usage"""
+    AI_PROMPT_TOKENS.observe(prompt.tokens, template=prompt.template)
+    return prompt.tokens + AI_SETTINGS["MAX_TOKENS"]
+
+
+def _record_usage(usage, prompt: Prompt, estimated_tokens: int):
+    """Count reported tokens per template, including prefix cache hits"""
+    AI_TOKENS.inc(usage.prompt_tokens or 0, kind="prompt", template=prompt.template)
+    AI_TOKENS.inc(
+        usage.completion_tokens or 0, kind="completion", template=prompt.template
+    )
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None) or 0
+    if cached:
+        AI_TOKENS.inc(cached, kind="cached_prompt", template=prompt.template)
+    scheduler.reconcile(estimated_tokens, usage.total_tokens or 0)
+
+
+def _admit(
+    priority: Priority, tokens: int, session: str, deadline: float, attempt: int
+) -> bool:
+    """Wait for rate limit capacity and the circuit breaker before an attempt"""
+    # Checked before queueing so an open breaker costs no rate budget
+    if breaker.state == breaker.OPEN:
+        AI_FAILURES.inc(stage="circuit_open")
+        logger.warning("AI circuit breaker open; skipping generation")
+        return False
+    if not scheduler.acquire(
+        priority, tokens, session, timeout=deadline - time.monotonic()
+    ):
+        AI_FAILURES.inc(stage="deadline")
+        logger.warning(f"Generation deadline reached after {attempt} attempts")
+        return False
+    if not breaker.allow():
+        AI_FAILURES.inc(stage="circuit_open")
+        return False
+    return True
+
+
+def _record_request_error(error: Exception):
+    if getattr(error, "status_code", None) == 429:
+        # Provider rate limit: slow everyone down, not a health failure
+        scheduler.throttle(_retry_after(error))
+        breaker.record(True)
+    else:
+        breaker.record(False)
+    AI_FAILURES.inc(stage="request")
+
+
+def _response_format(schema: Optional[type]) -> Optional[Dict[str, Any]]:
+    """The ``response_format`` to request under the current output mode"""
+    if _output_mode == "json_schema" and schema is not None:
+        return {
+            "type": "json_schema",
+            "json_schema": {
+                "name": schema.__name__,
+                "schema": json_schema(schema),
+                "strict": True,
+            },
+        }
+    if _output_mode in ("json_schema", "json_object"):
+        return {"type": "json_object"}
+    return None
+
+
+def _downgrade_output_mode(error: Exception, rejected: str) -> bool:
+    """Step down from a ``response_format`` the endpoint refused"""
+    global _output_mode
+    message = str(error).lower()
+    if getattr(error, "status_code", None) != 400 or not (
+        "response_format" in message or rejected in message
+    ):
+        return False
+    fallback = OUTPUT_MODES[OUTPUT_MODES.index(rejected) + 1]
+    if OUTPUT_MODES.index(fallback) > OUTPUT_MODES.index(_output_mode):
+        _output_mode = fallback
+        logger.warning(
+            f"Endpoint rejected {rejected} output; using {fallback} from now on"
+        )
+    return True
+
+
+def _request_completion(
+    client: "OpenAI",
+    prompt: Prompt,
+    temperature: float,
+    deadline: float,
+    can_hedge: Optional[Callable[[], bool]] = None,
+    response_format: Optional[Dict[str, Any]] = None,
+):
+    """Send one chat completion, bounded by the remaining deadline"""
+    timeout = max(0.1, min(AI_SETTINGS["TIMEOUT"], deadline - time.monotonic()))
+    extra = {"response_format": response_format} if response_format else {}
+
+    def send():
+        start = time.perf_counter()
+        response = client.chat.completions.create(
+            model=AI_SETTINGS["MODEL"],
+            messages=[
+                {"role": "system", "content": prompt.system},
+                {"role": "user", "content": prompt.user},
+            ],
+            temperature=temperature,
+            max_tokens=AI_SETTINGS["MAX_TOKENS"],
+            presence_penalty=AI_SETTINGS["PRESENCE_PENALTY"],
+            frequency_penalty=AI_SETTINGS["FREQUENCY_PENALTY"],
+            timeout=timeout,
+            **extra,
+        )
+        elapsed = time.perf_counter() - start
+        AI_REQUEST_SECONDS.observe(elapsed)
+        _latencies.observe(elapsed)
+        return response
+
+    if AI_RESILIENCE_SETTINGS["HEDGE_ENABLED"]:
+        return _hedger.call(send, deadline, can_hedge)
+    return send()
+
+
+@metrics.timed(
+    "ai_generation_seconds",
+    "generate_content latency including retries",
+    outcome=lambda content: "ok" if content else "failed",
+)
+@tracer.traced("ai.generate_content")
 @debug_log
-def generate_content(prompt: str, retries: int = None) -> Optional[str]:
+def generate_content(
+    prompt: Union[str, Prompt],
+    retries: int = None,
+    timeout: Optional[float] = None,
+    priority: Priority = Priority.NORMAL,
+    session: str = "default",
+    schema: Optional[Type[T]] = None,
+) -> Union[str, T, None]:
     """Generate content using OpenAI's API with retry mechanism.
 
+    Retries share one deadline, back off between request errors, and are
+    skipped entirely while the circuit breaker is open, so callers fall
+    back to offline content quickly when the API is degraded. Requests use
+    the provider's structured-output mode (AI_SETTINGS["STRUCTURED_OUTPUT"]),
+    so responses arrive as valid JSON and retries are for request errors.
+
     Args:
-        prompt (str): The prompt to send to the AI
+        prompt (str | Prompt): A rendered template, or a bare prompt sent
+            with SYSTEM_PROMPT
         retries (int, optional): Number of retry attempts. Defaults to AI_SETTINGS["MAX_RETRIES"]
+        timeout (float, optional): Seconds for the whole call. Defaults to GENERATION_TIMEOUT
+        priority (Priority): Scheduling class; SPECULATIVE calls are skipped
+            while the rate limiter is under pressure
+        session (str): Requests are queued fairly across sessions
+        schema (type, optional): Dataclass from ``ai_schemas``, sent as the
+            JSON Schema and used to validate the response; responses that
+            do not fit are retried
 
     Returns:
-        Optional[str]: Generated content or None if all attempts fail
+        The ``schema`` instance, or without a schema the response's JSON
+        as compact text; None if all attempts fail
     """
     if retries is None:
         retries = AI_SETTINGS["MAX_RETRIES"]
+    deadline = time.monotonic() + (timeout or GENERATION_TIMEOUT)
 
-    client = setup_openai()
+    if priority == Priority.SPECULATIVE and scheduler.should_defer():
+        AI_FAILURES.inc(stage="deferred")
+        return None
+
+    client = get_client()
     if not client:
         logger.error("Failed to initialize OpenAI client")
         return None
 
     base_temperature = AI_SETTINGS["TEMPERATURE"]
+    # Decided once per call so a sampled call logs all of its payloads
+    log_payloads = debug.sample_ai_payload(logger)
+
+    prompt = as_prompt(prompt)
+    estimated_tokens = _estimate_tokens(prompt)
+
+    def can_hedge() -> bool:
+        return not scheduler.should_defer() and scheduler.acquire(
+            Priority.SPECULATIVE, estimated_tokens, session, timeout=0
+        )
 
     for attempt in range(retries):
+        if not _admit(priority, estimated_tokens, session, deadline, attempt):
+            return None
+        if attempt:
+            AI_RETRIES.inc()
+        response_format = _response_format(schema)
+        mode = response_format["type"] if response_format else "off"
         try:
-            current_temperature = base_temperature + (attempt * 0.1)
+            current_temperature = base_temperature
+            if response_format is None:
+                # Free-form output: vary the sample in case it was malformed
+                current_temperature += attempt * 0.1
+            response = _request_completion(
+                client,
+                prompt,
+                min(current_temperature, 1.2),
+                deadline,
+                can_hedge,
+                response_format,
+            )
+        except Exception as e:
+            if response_format and _downgrade_output_mode(e, mode):
+                # The endpoint answered; only the mode was wrong
+                breaker.record(True)
+                continue
+            _record_request_error(e)
+            logger.error(f"Error on attempt {attempt + 1}: {str(e)}")
+            if attempt + 1 < retries:
+                time.sleep(
+                    min(
+                        backoff_delay(attempt + 1),
+                        max(0.0, deadline - time.monotonic()),
+                    )
+                )
+            continue
+        breaker.record(True)
+
+        usage = getattr(response, "usage", None)
+        if usage:
+            _record_usage(usage, prompt, estimated_tokens)
+
+        message = response.choices[0].message
+        content = (message.content or "").strip()
 
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
+        if log_payloads:
+            logger.debug(f"Raw content received: {debug.truncate(content)}")
+
+        # Extract, repair and validate the JSON in a single pass
+        outcome = "ok"
+        try:
+            if getattr(message, "refusal", None):
+                outcome = "refused"
+                logger.error(f"Model refused the request: {message.refusal}")
+            elif schema is not None:
+                result = parse_response(content, schema)
+            else:
+                result = json.dumps(extract_json(content))
+        except SchemaError as e:
+            outcome = "schema_error"
+            AI_FAILURES.inc(stage="schema")
+            logger.error(f"Response did not match {schema.__name__}: {str(e)}")
+        except ValueError as e:
+            outcome = "parse_error"
+            AI_FAILURES.inc(stage="parse")
+            logger.error(f"JSON parsing failed after repair: {str(e)}")
+        AI_RESPONSES.inc(template=prompt.template, mode=mode, outcome=outcome)
+        if outcome == "ok":
+            return result
+        if log_payloads:
+            logger.debug(f"Failed content: {debug.truncate(content)}")
+        logger.warning(f"Response rejected on attempt {attempt + 1}")
+
+    logger.error("All generation attempts failed")
+    return None
+
+
+def stream_content(
+    prompt: Union[str, Prompt],
+    system_prompt: str = CHAT_SYSTEM_PROMPT,
+    retries: int = None,
+    timeout: Optional[float] = None,
+    priority: Priority = Priority.INTERACTIVE,
+    session: str = "default",
+) -> Iterator[str]:
+    """Stream a completion, yielding text chunks as the API produces them.
+
+    Admission, backoff and the circuit breaker work as in
+    ``generate_content``, but a request is only retried until its first
+    chunk arrives: once text has reached the player a failure just ends
+    the stream. Yields nothing if every attempt fails, so callers can
+    fall back on an empty result.
+
+    Args:
+        prompt (str | Prompt): A rendered template, or a bare prompt
+        system_prompt (str): Rules for a bare prompt; defaults to plain-text
+            chat, pass SYSTEM_PROMPT for JSON
+        retries (int, optional): Attempts before the first chunk. Defaults to AI_SETTINGS["MAX_RETRIES"]
+        timeout (float, optional): Seconds for the whole call. Defaults to GENERATION_TIMEOUT
+        priority (Priority): Scheduling class, interactive by default
+        session (str): Requests are queued fairly across sessions
+
+    Yields:
+        str: Text deltas in order
+    """
+    if retries is None:
+        retries = AI_SETTINGS["MAX_RETRIES"]
+    deadline = time.monotonic() + (timeout or GENERATION_TIMEOUT)
+
+    client = get_client()
+    if not client:
+        logger.error("Failed to initialize OpenAI client")
+        return
+
+    prompt = as_prompt(prompt, system_prompt)
+    estimated_tokens = _estimate_tokens(prompt)
+    for attempt in range(retries):
+        if not _admit(priority, estimated_tokens, session, deadline, attempt):
+            return
+        if attempt:
+            AI_RETRIES.inc()
+
+        start = time.perf_counter()
+        received = False
+        try:
+            stream = client.chat.completions.create(
+                model=AI_SETTINGS["MODEL"],
                 messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": prompt},
+                    {"role": "system", "content": prompt.system},
+                    {"role": "user", "content": prompt.user},
                 ],
-                temperature=min(current_temperature, 1.2),
+                temperature=AI_SETTINGS["TEMPERATURE"],
                 max_tokens=AI_SETTINGS["MAX_TOKENS"],
                 presence_penalty=AI_SETTINGS["PRESENCE_PENALTY"],
                 frequency_penalty=AI_SETTINGS["FREQUENCY_PENALTY"],
+                timeout=max(
+                    0.1, min(AI_SETTINGS["TIMEOUT"], deadline - time.monotonic())
+                ),
+                stream=True,
+                stream_options={"include_usage": True},
             )
-
-            content = response.choices[0].message.content.strip()
-
-            # Log the raw response
-            logger.debug(f"Raw content received: {content}")
-
-            # Clean and validate JSON
-            cleaned_content = JSONCleaner.clean_content(content)
-            if cleaned_content:
-                try:
-                    parsed = json.loads(cleaned_content)
-                    logger.debug(
-                        "Cleaned and parsed content: \n"
-                        f"{json.dumps(parsed, indent=2)}"
-                    )
-                    return cleaned_content
-                except json.JSONDecodeError as e:
-                    logger.error(f"JSON parsing failed after cleaning: {str(e)}")
-                    logger.debug(f"Failed content: {cleaned_content}")
+            for chunk in stream:
+                # The request timeout only bounds each read, so a slowly
+                # dripping stream is cut off here
+                if time.monotonic() > deadline:
+                    stream.close()
+                    raise TimeoutError("Stream passed its deadline")
+                usage = getattr(chunk, "usage", None)
+                if usage:
+                    _record_usage(usage, prompt, estimated_tokens)
+                if not chunk.choices:
                     continue
-            else:
-                logger.error("Content cleaning returned None")
-                logger.debug(f"Original content that failed cleaning: {content}")
-
-            logger.warning(f"Content cleaning failed on attempt {attempt + 1}")
-            continue
-
+                text = chunk.choices[0].delta.content
+                if not text:
+                    continue
+                if not received:
+                    received = True
+                    AI_FIRST_CHUNK_SECONDS.observe(time.perf_counter() - start)
+                yield text
+        except GeneratorExit:
+            # The caller stopped reading; the API itself was healthy
+            breaker.record(True)
+            stream.close()
+            raise
         except Exception as e:
-            logger.error(f"Error on attempt {attempt + 1}: {str(e)}")
+            _record_request_error(e)
+            logger.error(f"Streaming error on attempt {attempt + 1}: {str(e)}")
+            if received:
+                return
+            if attempt + 1 < retries:
+                time.sleep(
+                    min(
+                        backoff_delay(attempt + 1),
+                        max(0.0, deadline - time.monotonic()),
+                    )
+                )
             continue
 
-    logger.error("All generation attempts failed")
-    return None
+        elapsed = time.perf_counter() - start
+        AI_REQUEST_SECONDS.observe(elapsed)
+        _latencies.observe(elapsed)
+        breaker.record(True)
+        return
+
+    logger.error("All streaming attempts failed")
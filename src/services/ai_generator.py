@@ -1,12 +1,17 @@
-from typing import Optional, Dict, Any
+from typing import Optional
 from ..models.character_classes import CharacterClass
 from ..models.skills import Skill
-from ..models.character import Enemy, get_fallback_enemy
+from ..models.character import Enemy
 from ..config.settings import STAT_RANGES
 from .ai_core import generate_content
+from .ai_schemas import CharacterClassData, EnemyData
+from .prompts import prompts
 from .art_generator import generate_class_art, generate_enemy_art
+from .enemy_generator import generation_mode, procedural_enemies
+from ..utils.metrics import metrics
+from ..utils.rng import rng
+from ..utils.tracing import tracer
 import json
-import random
 import logging
 
 # Define fallback classes
@@ -38,10 +43,13 @@ FALLBACK_CLASSES = [
 
 logger = logging.getLogger("ai")
 
+ENEMIES_GENERATED = metrics.counter(
+    "enemies_generated_total", "Enemies generated by source (ai, procedural, fallback)"
+)
 
-def generate_character_class() -> Optional[CharacterClass]:
-    # First provide detailed context
-    context = """Create a UNIQUE dark fantasy character class.
+
+# The class prompt never changes, so it is compiled once at import
+CLASS_PROMPT_CONTEXT = """Create a UNIQUE dark fantasy character class.
 
 CRITICAL JSON RULES:
 1. Use ONLY the properties shown in the template
@@ -55,66 +63,70 @@ CRITICAL JSON RULES:
 9. NO additional or modified properties allowed
 10. Description should be a simple string describing the effect"""
 
-    # Then provide strict JSON structure with example values and valid ranges
-    json_template = {
-        "name": "example: Dark Harbinger",
-        "description": "example: An ancient guardian corrupted by twisted hope",
-        "base_health": f"pick ONE number between {STAT_RANGES['CLASS_HEALTH'][0]} and {STAT_RANGES['CLASS_HEALTH'][1]}",
-        "base_attack": f"pick ONE number between {STAT_RANGES['CLASS_ATTACK'][0]} and {STAT_RANGES['CLASS_ATTACK'][1]}",
-        "base_defense": f"pick ONE number between {STAT_RANGES['CLASS_DEFENSE'][0]} and {STAT_RANGES['CLASS_DEFENSE'][1]}",
-        "base_mana": f"pick ONE number between {STAT_RANGES['CLASS_MANA'][0]} and {STAT_RANGES['CLASS_MANA'][1]}",
-        "skills": [
-            {
-                "name": "example: Primary Skill",
-                "damage": f"pick ONE number between {STAT_RANGES['SKILL_DAMAGE'][0]} and {STAT_RANGES['SKILL_DAMAGE'][1]}",
-                "mana_cost": f"pick ONE number between {STAT_RANGES['SKILL_MANA_COST'][0]} and {STAT_RANGES['SKILL_MANA_COST'][1]}",
-                "cooldown": f"pick ONE number between {STAT_RANGES['SKILL_COOLDOWN'][0]} and {STAT_RANGES['SKILL_COOLDOWN'][1]}",
-                "description": "example: Primary attack description",
-            },
-            {
-                "name": "example: Secondary Skill",
-                "damage": f"pick ONE number between {STAT_RANGES['SKILL_DAMAGE'][0]} and {STAT_RANGES['SKILL_DAMAGE'][1]}",
-                "mana_cost": f"pick ONE number between {STAT_RANGES['SKILL_MANA_COST'][0]} and {STAT_RANGES['SKILL_MANA_COST'][1]}",
-                "cooldown": f"pick ONE number between {STAT_RANGES['SKILL_COOLDOWN'][0]} and {STAT_RANGES['SKILL_COOLDOWN'][1]}",
-                "description": "example: Secondary attack description",
-            },
-        ],
-    }
+# Strict JSON structure with example values and valid ranges
+CLASS_JSON_TEMPLATE = {
+    "name": "example: Dark Harbinger",
+    "description": "example: An ancient guardian corrupted by twisted hope",
+    "base_health": f"pick ONE number between {STAT_RANGES['CLASS_HEALTH'][0]} and {STAT_RANGES['CLASS_HEALTH'][1]}",
+    "base_attack": f"pick ONE number between {STAT_RANGES['CLASS_ATTACK'][0]} and {STAT_RANGES['CLASS_ATTACK'][1]}",
+    "base_defense": f"pick ONE number between {STAT_RANGES['CLASS_DEFENSE'][0]} and {STAT_RANGES['CLASS_DEFENSE'][1]}",
+    "base_mana": f"pick ONE number between {STAT_RANGES['CLASS_MANA'][0]} and {STAT_RANGES['CLASS_MANA'][1]}",
+    "skills": [
+        {
+            "name": "example: Primary Skill",
+            "damage": f"pick ONE number between {STAT_RANGES['SKILL_DAMAGE'][0]} and {STAT_RANGES['SKILL_DAMAGE'][1]}",
+            "mana_cost": f"pick ONE number between {STAT_RANGES['SKILL_MANA_COST'][0]} and {STAT_RANGES['SKILL_MANA_COST'][1]}",
+            "cooldown": f"pick ONE number between {STAT_RANGES['SKILL_COOLDOWN'][0]} and {STAT_RANGES['SKILL_COOLDOWN'][1]}",
+            "description": "example: Primary attack description",
+        },
+        {
+            "name": "example: Secondary Skill",
+            "damage": f"pick ONE number between {STAT_RANGES['SKILL_DAMAGE'][0]} and {STAT_RANGES['SKILL_DAMAGE'][1]}",
+            "mana_cost": f"pick ONE number between {STAT_RANGES['SKILL_MANA_COST'][0]} and {STAT_RANGES['SKILL_MANA_COST'][1]}",
+            "cooldown": f"pick ONE number between {STAT_RANGES['SKILL_COOLDOWN'][0]} and {STAT_RANGES['SKILL_COOLDOWN'][1]}",
+            "description": "example: Secondary attack description",
+        },
+    ],
+}
+
+CLASS_PROMPT = prompts.register(
+    "ai.character_class",
+    "{context}\n\nReturn ONLY valid JSON matching this EXACT structure (replace example values with creative content and higher stat values):\n{template}",
+    static={
+        "context": CLASS_PROMPT_CONTEXT,
+        "template": json.dumps(CLASS_JSON_TEMPLATE, indent=2),
+    },
+)
+
 
-    # Combine context and JSON template in prompt
-    prompt = f"{context}\n\nReturn ONLY valid JSON matching this EXACT structure (replace example values with creative content and higher stat values):\n{json.dumps(json_template, indent=2)}"
+def generate_character_class() -> Optional[CharacterClass]:
+    prompt = CLASS_PROMPT.render()
 
-    content = generate_content(prompt)
-    if not content:
+    data = generate_content(prompt, schema=CharacterClassData)
+    if not data:
         logger.error("No content generated from AI")
-        return random.choice(FALLBACK_CLASSES)
+        return rng.character.choice(FALLBACK_CLASSES)
 
     try:
-        # Parse the JSON content first
-        data = json.loads(content)
-        logger.debug(f"Successfully parsed JSON data: {json.dumps(data, indent=2)}")
-
-        # Create character class with processed skills
-        char_data = {
-            "name": str(data["name"]).strip(),
-            "description": str(data["description"]).strip(),
-            "base_health": int(data["base_health"]),
-            "base_attack": int(data["base_attack"]),
-            "base_defense": int(data["base_defense"]),
-            "base_mana": int(data["base_mana"]),
-            "skills": [
+        # Types are already checked by the schema; CharacterClass checks ranges
+        character_class = CharacterClass(
+            name=data.name,
+            description=data.description,
+            base_health=data.base_health,
+            base_attack=data.base_attack,
+            base_defense=data.base_defense,
+            base_mana=data.base_mana,
+            skills=[
                 Skill(
-                    name=str(skill["name"]).strip(),
-                    damage=int(skill["damage"]),
-                    mana_cost=int(skill["mana_cost"]),
-                    description=str(skill["description"]).strip(),
+                    name=skill.name,
+                    damage=skill.damage,
+                    mana_cost=skill.mana_cost,
+                    description=skill.description,
+                    cooldown=skill.cooldown,
                 )
-                for skill in data["skills"]
+                for skill in data.skills
             ],
-        }
-
-        # Create character class
-        character_class = CharacterClass(**char_data)
+        )
 
         # Generate and attach art
         art = generate_class_art(character_class.name, character_class.description)
@@ -125,51 +137,13 @@ CRITICAL JSON RULES:
 
     except Exception as e:
         logger.error(f"Error processing character class: {str(e)}")
-        logger.debug(f"Failed content was: {content}")
-        return random.choice(FALLBACK_CLASSES)
+        logger.debug(f"Failed class data was: {data}")
+        return rng.character.choice(FALLBACK_CLASSES)
 
 
-def _try_parse_enemy_data(content: str) -> Optional[Dict[str, Any]]:
-    """
-    Try to parse enemy data from AI response.
-    Returns parsed data or None if parsing failed.
-    """
-    try:
-        # Try to parse as JSON first
-        data = json.loads(content)
-        return data
-    except json.JSONDecodeError:
-        # If JSON parsing fails, try to extract JSON-like structure
-        # from the text using string manipulation
-        logger.warning(
-            "Failed to parse enemy data as JSON, attempting manual extraction"
-        )
-        try:
-            # Look for opening and closing braces
-            start_idx = content.find("{")
-            end_idx = content.rfind("}")
-
-            if start_idx >= 0 and end_idx > start_idx:
-                # Extract potential JSON string
-                json_str = content[start_idx : end_idx + 1]
-                # Try to parse this extracted part
-                data = json.loads(json_str)
-                return data
-            else:
-                logger.error("Could not find valid JSON structure in the response")
-                return None
-        except Exception as e:
-            logger.error(f"Error extracting enemy data: {str(e)}")
-            return None
-
-
-def generate_enemy(player_level: int) -> Enemy:
-    """Generate an enemy based on player level"""
-    try:
-        logger.info(f"Generating enemy for player level {player_level}")
-
-        # Generate enemy data
-        prompt = f"""Create a unique enemy for a dark fantasy game where the world is corrupted by a malevolent entity known as the God of Hope.
+ENEMY_PROMPT = prompts.register(
+    "ai.enemy",
+    """Create a unique enemy for a dark fantasy game where the world is corrupted by a malevolent entity known as the God of Hope.
 
 Player level: {player_level}
 
@@ -177,67 +151,60 @@ Return a JSON object with:
 {{
   "name": "Enemy name",
   "description": "Brief description (1-2 sentences)",
-  "health": number (between {60 + player_level * 10} and {100 + player_level * 15}),
-  "attack": number (between {8 + player_level * 2} and {12 + player_level * 3}),
-  "defense": number (between {3 + player_level} and {6 + player_level * 2}),
+  "health": number (between {health_min} and {health_max}),
+  "attack": number (between {attack_min} and {attack_max}),
+  "defense": number (between {defense_min} and {defense_max}),
   "level": number (around {player_level}, slightly higher or lower)
 }}
 
 Make the enemy thematically consistent with a world twisted by false hope.
-"""
+""",
+)
+
+
+@tracer.traced("ai.generate_enemy")
+def generate_enemy(player_level: int) -> Enemy:
+    """Generate an enemy based on player level"""
+    if generation_mode() == "procedural":
+        ENEMIES_GENERATED.inc(source="procedural")
+        return procedural_enemies.generate(player_level)
+
+    try:
+        logger.info(f"Generating enemy for player level {player_level}")
 
-        content = generate_content(prompt)
-        if not content:
-            logger.error("Failed to generate enemy content, using fallback")
-            return get_fallback_enemy(player_level)
+        # Generate enemy data
+        prompt = ENEMY_PROMPT.render(
+            player_level=player_level,
+            health_min=60 + player_level * 10,
+            health_max=100 + player_level * 15,
+            attack_min=8 + player_level * 2,
+            attack_max=12 + player_level * 3,
+            defense_min=3 + player_level,
+            defense_max=6 + player_level * 2,
+        )
 
-        # Parse enemy data
-        data = _try_parse_enemy_data(content)
+        # Parsed, validated and converted to integers by the schema
+        data = generate_content(prompt, schema=EnemyData)
         if not data:
-            logger.error("Failed to parse enemy data, using fallback")
-            return get_fallback_enemy(player_level)
-
-        # Validate required fields
-        required_fields = [
-            "name",
-            "description",
-            "health",
-            "attack",
-            "defense",
-            "level",
-        ]
-        for field in required_fields:
-            if field not in data:
-                logger.error(
-                    f"Enemy data missing required field: {field}, using fallback"
-                )
-                return get_fallback_enemy(player_level)
-
-        # Ensure fields are the correct types
-        try:
-            # Convert any string numbers to integers
-            for field in ["health", "attack", "defense", "level"]:
-                if isinstance(data[field], str):
-                    data[field] = int(data[field])
-        except (ValueError, TypeError):
-            logger.error("Error converting numeric fields to integers, using fallback")
-            return get_fallback_enemy(player_level)
+            logger.error("Failed to generate enemy data, using fallback")
+            return _fallback_enemy(player_level)
 
         # Generate ASCII art for the enemy
-        enemy_art = generate_enemy_art(data["name"], data["description"])
+        enemy_art = generate_enemy_art(data.name, data.description)
 
         # Calculate exp reward based on enemy level
         exp_multiplier = 15
-        exp_reward = data["level"] * exp_multiplier
+        exp_reward = data.level * exp_multiplier
 
         # Create and return enemy
+        ENEMIES_GENERATED.inc(source="ai")
         return Enemy(
-            name=data["name"],
-            description=data["description"],
-            health=data["health"],
-            attack=data["attack"],
-            defense=data["defense"],
-            level=data["level"],
+            name=data.name,
+            description=data.description,
+            health=data.health,
+            attack=data.attack,
+            defense=data.defense,
+            level=data.level,
             exp_reward=exp_reward,
             art=enemy_art,
         )
@@ -245,4 +212,10 @@ Make the enemy thematically consistent with a world twisted by false hope.
     except Exception as e:
         logger.error(f"Error generating enemy: {str(e)}", exc_info=True)
         # Return fallback enemy in case of any error
-        return get_fallback_enemy(player_level)
+        return _fallback_enemy(player_level)
+
+
+def _fallback_enemy(player_level: int) -> Enemy:
+    """A procedural enemy in place of one the model could not produce"""
+    ENEMIES_GENERATED.inc(source="fallback")
+    return procedural_enemies.generate(player_level)
@@ -0,0 +1,204 @@
+"""Failure handling for AI requests: backoff, circuit breaking and hedging."""
+
+import contextvars
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Optional, TypeVar
+
+from src.config.settings import AI_RESILIENCE_SETTINGS
+from src.utils.metrics import metrics
+
+logger = logging.getLogger("ai")
+
+T = TypeVar("T")
+
+BREAKER_STATE = metrics.gauge(
+    "ai_circuit_open", "1 while the AI circuit breaker is short-circuiting calls"
+)
+HEDGES = metrics.counter("ai_hedged_requests_total", "Duplicate requests by outcome")
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter for the given retry attempt"""
+    ceiling = min(
+        AI_RESILIENCE_SETTINGS["BACKOFF_MAX"],
+        AI_RESILIENCE_SETTINGS["BACKOFF_BASE"] * (2 ** max(0, attempt - 1)),
+    )
+    return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """Error-rate circuit breaker over a sliding window of request outcomes.
+
+    Closed: requests flow and outcomes are recorded. When at least
+    ``min_calls`` of the last ``window`` requests are recorded and the
+    failure rate reaches ``failure_rate``, the breaker opens and rejects
+    requests for ``cooldown`` seconds. After that a single trial request
+    is let through (half-open); its outcome closes or re-opens the breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        window: int = 20,
+        failure_rate: float = 0.5,
+        min_calls: int = 5,
+        cooldown: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.window = window
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self._clock = clock
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if (
+                self._state == self.OPEN
+                and self._clock() - self._opened_at >= self.cooldown
+            ):
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._clock() - self._opened_at < self.cooldown:
+                return False
+            # Cool-down over: let exactly one trial request through
+            if self._trial_in_flight:
+                return False
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = True
+            return True
+
+    def record(self, success: bool):
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._trial_in_flight = False
+                if success:
+                    self._close()
+                else:
+                    self._open()
+                return
+            self._outcomes.append(success)
+            failures = self._outcomes.count(False)
+            if (
+                self._state == self.CLOSED
+                and len(self._outcomes) >= self.min_calls
+                and failures / len(self._outcomes) >= self.failure_rate
+            ):
+                self._open()
+
+    def _open(self):
+        self._state = self.OPEN
+        self._opened_at = self._clock()
+        self._outcomes.clear()
+        BREAKER_STATE.set(1)
+        logger.warning(
+            f"AI circuit breaker opened; using fallbacks for {self.cooldown:.0f}s"
+        )
+
+    def _close(self):
+        self._state = self.CLOSED
+        self._outcomes.clear()
+        BREAKER_STATE.set(0)
+        logger.info("AI circuit breaker closed")
+
+
+class LatencyTracker:
+    """Recent request latencies, for choosing when to hedge"""
+
+    def __init__(self, size: int = 100):
+        self._samples: Deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float, min_samples: int = 1) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Hedger:
+    """Sends a duplicate request when the first is slower than usual.
+
+    The hedge delay is the configured percentile of recent latencies, so
+    only the slow tail gets a second request. Whichever request succeeds
+    first wins; the loser finishes in the background and is discarded.
+    """
+
+    def __init__(self, latencies: LatencyTracker, max_workers: int = 4):
+        self.latencies = latencies
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ai-hedge"
+        )
+
+    def hedge_delay(self) -> Optional[float]:
+        threshold = self.latencies.percentile(
+            AI_RESILIENCE_SETTINGS["HEDGE_PERCENTILE"],
+            AI_RESILIENCE_SETTINGS["HEDGE_MIN_SAMPLES"],
+        )
+        if threshold is None:
+            return None
+        return max(threshold, AI_RESILIENCE_SETTINGS["HEDGE_MIN_DELAY"])
+
+    def call(
+        self,
+        request: Callable[[], T],
+        deadline: float,
+        can_hedge: Optional[Callable[[], bool]] = None,
+    ) -> T:
+        """Run ``request``, hedging it if slow and ``can_hedge()`` allows"""
+        delay = self.hedge_delay()
+        if delay is None or delay >= deadline - time.monotonic():
+            return request()
+
+        # Each request runs in a copy of the caller's context so its spans
+        # stay children of the caller's span
+        primary = self._executor.submit(contextvars.copy_context().run, request)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+        if can_hedge and not can_hedge():
+            return primary.result(timeout=max(0.0, deadline - time.monotonic()))
+
+        HEDGES.inc(outcome="sent")
+        hedge = self._executor.submit(contextvars.copy_context().run, request)
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            remaining = deadline - time.monotonic()
+            done, pending = wait(
+                pending, timeout=max(0.0, remaining), return_when=FIRST_COMPLETED
+            )
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        HEDGES.inc(outcome="won")
+                    return future.result()
+                error = future.exception()
+        raise error or TimeoutError("AI request deadline exceeded")
@@ -0,0 +1,212 @@
+"""Client-side rate limiting and scheduling of AI requests."""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Callable, Deque, Dict, Optional
+
+from src.config.settings import AI_RATE_LIMITS
+from src.utils.metrics import metrics
+
+logger = logging.getLogger("ai")
+
+SCHEDULER_WAIT_SECONDS = metrics.histogram(
+    "ai_scheduler_wait_seconds", "Time requests spent queued by the rate limiter"
+)
+SCHEDULER_QUEUED = metrics.gauge(
+    "ai_scheduler_queued", "Requests waiting for rate limit capacity"
+)
+SCHEDULER_REJECTED = metrics.counter(
+    "ai_scheduler_rejected_total", "Requests that gave up or were deferred"
+)
+
+
+class Priority(IntEnum):
+    """Lower values are served first"""
+
+    INTERACTIVE = 0  # The player is waiting on this response
+    NORMAL = 1
+    SPECULATIVE = 2  # Prefetching and pool refills; yields under pressure
+
+
+class TokenBucket:
+    """Refills continuously at ``per_minute / 60`` units per second.
+
+    Not thread-safe on its own; the scheduler serializes access.
+    """
+
+    def __init__(
+        self,
+        per_minute: float,
+        burst: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = per_minute / 60.0
+        self.capacity = burst if burst is not None else per_minute
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def available(self) -> float:
+        self._refill()
+        return self.tokens
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` can be taken (capped at the capacity)"""
+        self._refill()
+        missing = min(amount, self.capacity) - self.tokens
+        return max(0.0, missing / self.rate) if self.rate else float("inf")
+
+    def take(self, amount: float):
+        self._refill()
+        # May go negative when actual usage exceeds the estimate
+        self.tokens -= amount
+
+
+@dataclass
+class _Ticket:
+    priority: Priority
+    session: str
+    tokens: int
+    enqueued: float = field(default_factory=time.monotonic)
+
+
+class AIScheduler:
+    """Admits AI requests under requests- and tokens-per-minute limits.
+
+    Waiting requests are served strictly by priority class; within a class
+    the session served least recently goes first, so one busy session
+    cannot starve the others. Speculative requests also have to leave a
+    reserve of capacity untouched, and ``should_defer`` tells prefetchers
+    to skip work altogether while the limiter is under pressure.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        speculative_reserve: float = 0.2,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.requests = TokenBucket(requests_per_minute, clock=clock)
+        self.tokens = TokenBucket(tokens_per_minute, clock=clock)
+        self.speculative_reserve = speculative_reserve
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._queues: Dict[Priority, Dict[str, Deque[_Ticket]]] = {
+            priority: {} for priority in Priority
+        }
+        self._served_seq: Dict[str, int] = {}
+        self._seq = 0
+        self._blocked_until = 0.0
+
+    def _waiting(self) -> int:
+        return sum(len(q) for queues in self._queues.values() for q in queues.values())
+
+    def _next_ticket(self) -> Optional[_Ticket]:
+        for priority in Priority:
+            queues = self._queues[priority]
+            if queues:
+                session = min(queues, key=lambda s: self._served_seq.get(s, -1))
+                return queues[session][0]
+        return None
+
+    def _wait_time(self, ticket: _Ticket) -> float:
+        blocked = max(0.0, self._blocked_until - self._clock())
+        requests, tokens = 1.0, float(ticket.tokens)
+        if ticket.priority == Priority.SPECULATIVE:
+            requests += self.requests.capacity * self.speculative_reserve
+            tokens += self.tokens.capacity * self.speculative_reserve
+        return max(
+            blocked, self.requests.wait_time(requests), self.tokens.wait_time(tokens)
+        )
+
+    def _remove(self, ticket: _Ticket):
+        queues = self._queues[ticket.priority]
+        queue = queues.get(ticket.session)
+        if queue and ticket in queue:
+            queue.remove(ticket)
+            if not queue:
+                del queues[ticket.session]
+
+    def acquire(
+        self,
+        priority: Priority = Priority.NORMAL,
+        tokens: int = 0,
+        session: str = "default",
+        timeout: Optional[float] = None,
+    ) -> bool:
+        """Block until the request may be sent; False if ``timeout`` expires"""
+        ticket = _Ticket(priority, session, tokens, self._clock())
+        deadline = None if timeout is None else self._clock() + timeout
+        with self._cond:
+            self._queues[priority].setdefault(session, deque()).append(ticket)
+            SCHEDULER_QUEUED.set(self._waiting())
+            try:
+                while True:
+                    wait = None
+                    if self._next_ticket() is ticket:
+                        wait = self._wait_time(ticket)
+                        if wait <= 0:
+                            self.requests.take(1)
+                            self.tokens.take(tokens)
+                            self._seq += 1
+                            self._served_seq[session] = self._seq
+                            SCHEDULER_WAIT_SECONDS.observe(
+                                self._clock() - ticket.enqueued,
+                                priority=priority.name.lower(),
+                            )
+                            return True
+                    if deadline is not None:
+                        remaining = deadline - self._clock()
+                        if remaining <= 0:
+                            SCHEDULER_REJECTED.inc(reason="timeout")
+                            return False
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._cond.wait(wait)
+            finally:
+                self._remove(ticket)
+                SCHEDULER_QUEUED.set(self._waiting())
+                self._cond.notify_all()
+
+    def should_defer(self) -> bool:
+        """Backpressure signal: True when speculative work should be skipped"""
+        with self._cond:
+            if self._blocked_until > self._clock():
+                return True
+            if any(self._queues[p] for p in (Priority.INTERACTIVE, Priority.NORMAL)):
+                return True
+            reserve = self.speculative_reserve
+            return (
+                self.requests.available() < self.requests.capacity * reserve
+                or self.tokens.available() < self.tokens.capacity * reserve
+            )
+
+    def reconcile(self, estimated: int, actual: int):
+        """Correct the token bucket once the real usage is known"""
+        with self._cond:
+            self.tokens.take(actual - estimated)
+            self._cond.notify_all()
+
+    def throttle(self, seconds: float):
+        """Pause all admissions, e.g. after the provider returned 429"""
+        with self._cond:
+            self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+        logger.warning(f"AI requests throttled for {seconds:.1f}s")
+
+
+scheduler = AIScheduler(
+    AI_RATE_LIMITS["REQUESTS_PER_MINUTE"],
+    AI_RATE_LIMITS["TOKENS_PER_MINUTE"],
+    AI_RATE_LIMITS["SPECULATIVE_RESERVE"],
+)
@@ -0,0 +1,137 @@
+"""Shapes of the JSON that generation prompts ask the model for.
+
+``generate_content(prompt, schema=...)`` sends each as a strict JSON Schema
+for the provider's structured-output mode, validates the response against
+it with ``src.utils.response_parser`` and returns the typed instance.
+They mirror the game models (``CharacterClass``, ``Skill``, ``NPCQuest``)
+minus runtime state such as cooldowns, ids and art.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class EnemyData:
+    """Response to the ``ai.enemy`` prompt"""
+
+    name: str
+    description: str
+    health: int
+    attack: int
+    defense: int
+    level: int
+
+
+@dataclass
+class SkillData:
+    name: str
+    damage: int
+    mana_cost: int
+    description: str
+    cooldown: int = 0
+
+
+@dataclass
+class CharacterClassData:
+    """Response to the ``ai.character_class`` prompt"""
+
+    name: str
+    description: str
+    base_health: int
+    base_attack: int
+    base_defense: int
+    base_mana: int
+    skills: List[SkillData]
+
+
+@dataclass
+class PuzzleReward:
+    type: str = "gold"
+    amount: int = 10
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"type": self.type, "amount": self.amount}
+
+
+@dataclass
+class PuzzleData:
+    """Response to the ``encounter.puzzle`` prompt"""
+
+    scene: str
+    puzzle: str
+    solution: str
+    reward: PuzzleReward = field(default_factory=PuzzleReward)
+    hints: List[str] = field(default_factory=list)
+
+
+@dataclass
+class NPCData:
+    """Response to the ``npc.data`` prompt"""
+
+    name: str
+    description: str = ""
+    lore: str = ""
+    faction: str = "Neutral"
+    level: Optional[int] = None
+    greeting: str = "Hello there, traveler."
+
+
+@dataclass
+class DialogueResponseData:
+    text: str
+    action: str = ""
+    relationship_change: int = 0
+
+
+@dataclass
+class DialogueData:
+    text: str
+    responses: List[DialogueResponseData] = field(default_factory=list)
+
+
+@dataclass
+class NPCDialogues:
+    """Response to the ``npc.dialogues`` prompt (a bare array also fits)"""
+
+    dialogues: List[DialogueData]
+
+
+@dataclass
+class QuestData:
+    name: str
+    description: str = ""
+    objective: str = ""
+    dialogue: Optional[str] = None
+    reward_gold: Optional[int] = None
+    reward_exp: Optional[int] = None
+    required_progress: int = 1
+    min_level: Optional[int] = None
+
+
+@dataclass
+class NPCQuests:
+    """Response to the ``npc.quests`` prompt (a bare array also fits)"""
+
+    quests: List[QuestData]
+
+
+@dataclass
+class ArtData:
+    """Response to the ``art.*`` prompts"""
+
+    ascii_art: List[str]
+
+    @classmethod
+    def from_text(cls, text: str) -> "ArtData":
+        """The art prompts ask for raw art, so accept a response with no JSON"""
+        lines = text.replace("```", "").strip("\n").splitlines()
+        if lines and lines[0].strip().lower() in ("ascii", "art", "text"):
+            lines = lines[1:]
+        if not any(line.strip() for line in lines):
+            raise ValueError("Empty art response")
+        return cls(ascii_art=lines)
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.ascii_art)
@@ -1,10 +1,19 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, TYPE_CHECKING, Union
 from dataclasses import dataclass
+from functools import lru_cache
 import logging
-from src.utils.json_cleaner import JSONCleaner
+from src.utils.metrics import metrics
+from src.utils.tracing import tracer
 from .ai_core import generate_content
+from .ai_schemas import ArtData
+from .prompts import Prompt, prompts
 import random
 
+if TYPE_CHECKING:
+    # numpy is only needed once art is actually normalized
+    import numpy as np
+    from src.utils.art_normalizer import ArtNormalizer
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,40 +27,38 @@ class ArtGenerationConfig:
     characters: str = "░▒▓█▀▄╱╲╳┌┐└┘│─├┤┬┴┼╭╮╯╰◣◢◤◥╱╲╳▁▂▃▅▆▇◆♦⚊⚋╍╌┄┅┈┉"
 
 
-LORE = {
-    "world": """In an age where hope became poison, darkness emerged as salvation.
-    The God of Hope's invasion brought not comfort, but corruption - a twisted force
-    that warps reality with false promises and maddening light. Those touched by
-    this 'Curse of Hope' become enslaved to eternal, desperate optimism, their minds
-    fractured by visions of impossible futures. The curse manifests physically,
-    marking its victims with radiant cracks in their flesh that leak golden light.
-
-    Only those who embrace shadow, who shield their eyes from hope's blinding rays,
-    maintain their sanity. They are the last bastion against the spreading taint,
-    warriors who understand that in this fallen realm, true salvation lies in the
-    comforting embrace of darkness.""",
-    "class": """Champions who've learned to weaponize shadow itself, these warriors
-    bear dark sigils that protect them from hope's corruption. Each class represents
-    a different approach to surviving in a world where optimism kills and despair
-    shields. Their powers draw from the void between false hopes, turning the
-    absence of light into a force of preservation.""",
-    "enemy": """Victims of the Curse of Hope, these beings are twisted parodies of
-    their former selves. Holy knights whose zealous hope turned to madness, common
-    folk whose desperate wishes mutated them, and ancient guardians whose protective
-    nature was perverted by the God of Hope's touch. They radiate a sickly golden
-    light from their wounds, and their mouths eternally smile even as they destroy
-    all they once loved.""",
-    "item": """Artifacts of power in this darkened realm take two forms: those
-    corrupted by the God of Hope's touch, glowing with insidious golden light and
-    whispering false promises; and those forged in pure darkness, their surfaces
-    drinking in light itself. The corrupted items offer tremendous power at the cost
-    of slowly succumbing to hope's curse, while shadow-forged gear helps resist the
-    spreading taint.""",
-}
+@lru_cache(maxsize=None)
+def _cached_normalizer(width: int, height: int, characters: str) -> "ArtNormalizer":
+    from src.utils.art_normalizer import ArtNormalizer
+
+    return ArtNormalizer(width, height, characters)
+
+
+def get_art_normalizer(
+    config: ArtGenerationConfig = ArtGenerationConfig(),
+) -> "ArtNormalizer":
+    """Return the shared normalizer for a config's dimensions and palette"""
+    return _cached_normalizer(config.width, config.height, config.characters)
+
 
+def normalize_art_array(
+    art: str, config: ArtGenerationConfig = ArtGenerationConfig()
+) -> "np.ndarray":
+    """Normalize art into a (height, width) array of code points.
 
+    The array form can be stored, compared with ``ArtNormalizer.diff`` and
+    rendered with ``ArtNormalizer.to_text`` without rebuilding strings.
+    """
+    return get_art_normalizer(config).to_array(art)
+
+
+@metrics.timed(
+    "art_generation_seconds",
+    "ASCII art generation latency including retries",
+    outcome=lambda art: "ok" if art else "failed",
+)
 def _generate_art(
-    prompt: str, config: ArtGenerationConfig = ArtGenerationConfig()
+    prompt: Union[str, Prompt], config: ArtGenerationConfig = ArtGenerationConfig()
 ) -> Optional[str]:
     """Internal function to handle art generation with retries and validation.
 
@@ -64,37 +71,13 @@ def _generate_art(
     """
     for attempt in range(config.max_retries):
         try:
-            content = generate_content(prompt)
-            if not content:
+            # Accepts {"ascii_art": [...]} as well as raw art
+            art = generate_content(prompt, schema=ArtData)
+            if not art:
                 continue
 
-            cleaned_art = JSONCleaner.clean_art_content(content)
-            if not cleaned_art:
-                continue
-
-            # Validate dimensions and characters
-            lines = cleaned_art.split("\n")
-            if len(lines) > config.height:
-                lines = lines[: config.height]
-
-            valid_chars = set(config.characters)
-            filtered_lines = []
-            for line in lines:
-                # Trim line to max width
-                line = line[: config.width]
-                # Filter out invalid characters
-                filtered_line = "".join(
-                    c if c in valid_chars or c in "║╔╗╚╝ " else " " for c in line
-                )
-                # Pad line to exact width
-                filtered_line = filtered_line.ljust(config.width)
-                filtered_lines.append(filtered_line)
-
-            # Pad to exact height
-            while len(filtered_lines) < config.height:
-                filtered_lines.append(" " * config.width)
-
-            return "\n".join(filtered_lines)
+            # Validate dimensions and characters, then trim and pad
+            return get_art_normalizer(config).normalize(art.text)
 
         except Exception as e:
             logger.error(f"Art generation attempt {attempt + 1} failed: {e}")
@@ -104,16 +87,15 @@ def _generate_art(
     return None
 
 
-def generate_enemy_art(enemy_name: str, enemy_description: str) -> str:
-    """Generate detailed ASCII art for corrupted enemies"""
-    prompt = f"""Create a corrupted being ASCII art for '{enemy_name}'.
+ENEMY_ART_PROMPT = prompts.register(
+    "art.enemy",
+    """Create a corrupted being ASCII art for '{enemy_name}'.
 
-World Lore: {LORE['world']}
-Enemy Lore: {LORE['enemy']}
+Draw on the world and enemy lore you were given.
 Creature Description: {enemy_description}
 
 Requirements:
-1. Use ONLY these characters: {ArtGenerationConfig.characters}
+1. Use ONLY these characters: {characters}
 2. Create EXACTLY 8 lines of art
 3. Each line must be EXACTLY 30 characters
 4. Focus on CORRUPTION features:
@@ -134,7 +116,18 @@ Example format:
 ║    ▀▀████▀▀████▀▀         ║
 ╚═══════════════════════════╝
 
-Return ONLY the raw ASCII art."""
+Return ONLY the raw ASCII art.""",
+    static={"characters": ArtGenerationConfig.characters},
+    lore=True,
+)
+
+
+@tracer.traced("art.generate_enemy_art")
+def generate_enemy_art(enemy_name: str, enemy_description: str) -> str:
+    """Generate detailed ASCII art for corrupted enemies"""
+    prompt = ENEMY_ART_PROMPT.render(
+        enemy_name=enemy_name, enemy_description=enemy_description
+    )
 
     try:
         # Use the _generate_art function to ensure proper formatting and validation
@@ -148,16 +141,15 @@ Return ONLY the raw ASCII art."""
         return get_default_enemy_art()
 
 
-def generate_item_art(item_name: str, description: str) -> Optional[str]:
-    """Generate detailed ASCII art for dark artifacts"""
-    prompt = f"""Create a dark artifact ASCII art for '{item_name}'.
+ITEM_ART_PROMPT = prompts.register(
+    "art.item",
+    """Create a dark artifact ASCII art for '{item_name}'.
 
-World Lore: {LORE['world']}
-Item Lore: {LORE['item']}
+Draw on the world and item lore you were given.
 Artifact Description: {description}
 
 Requirements:
-1. Use ONLY these characters: {ArtGenerationConfig.characters}
+1. Use ONLY these characters: {characters}
 2. Create EXACTLY 6 lines of art
 3. Each line must be EXACTLY 20 characters
 4. Focus on ARTIFACT features:
@@ -175,21 +167,28 @@ Example format:
 ║  ▀█▄░──░▄█▀   ║
 ╚════════════════╝
 
-Return ONLY the raw ASCII art."""
+Return ONLY the raw ASCII art.""",
+    static={"characters": ArtGenerationConfig.characters},
+    lore=True,
+)
+
+
+def generate_item_art(item_name: str, description: str) -> Optional[str]:
+    """Generate detailed ASCII art for dark artifacts"""
+    prompt = ITEM_ART_PROMPT.render(item_name=item_name, description=description)
 
     return _generate_art(prompt)
 
 
-def generate_class_art(class_name: str, description: str = "") -> str:
-    """Generate detailed ASCII art for character classes"""
-    prompt = f"""Create a dark fantasy character portrait ASCII art for '{class_name}'.
+CLASS_ART_PROMPT = prompts.register(
+    "art.class",
+    """Create a dark fantasy character portrait ASCII art for '{class_name}'.
 
-World Lore: {LORE['world']}
-Class Lore: {LORE['class']}
+Draw on the world and class lore you were given.
 Character Description: {description}
 
 Requirements:
-1. Use ONLY these characters: {ArtGenerationConfig.characters}
+1. Use ONLY these characters: {characters}
 2. Create EXACTLY 15 lines of art
 3. Each line must be EXACTLY 30 characters
 4. Focus on DARK CHAMPION features:
@@ -216,7 +215,15 @@ Example format:
 ║   ███▄▄░████░▄▄███             ║
 ╚════════════════════════════════╝
 
-Return ONLY the raw ASCII art."""
+Return ONLY the raw ASCII art.""",
+    static={"characters": ArtGenerationConfig.characters},
+    lore=True,
+)
+
+
+def generate_class_art(class_name: str, description: str = "") -> str:
+    """Generate detailed ASCII art for character classes"""
+    prompt = CLASS_ART_PROMPT.render(class_name=class_name, description=description)
 
     try:
         # Use the _generate_art function for consistent formatting
@@ -230,15 +237,15 @@ Return ONLY the raw ASCII art."""
         return get_default_class_art()
 
 
-def generate_ascii_portrait(character_name: str, character_description: str) -> str:
-    """Generate detailed ASCII art portrait for an NPC or character"""
-    prompt = f"""Create a detailed ASCII art portrait for a dark fantasy character named '{character_name}'.
+PORTRAIT_ART_PROMPT = prompts.register(
+    "art.portrait",
+    """Create a detailed ASCII art portrait for a dark fantasy character named '{character_name}'.
 
 Character Description: {character_description}
-World Lore: {LORE['world']}
+Draw on the world lore you were given.
 
 Requirements:
-1. Use ONLY these characters: {ArtGenerationConfig.characters}
+1. Use ONLY these characters: {characters}
 2. Create EXACTLY 13 lines of art
 3. Each line must be EXACTLY 35 characters
 4. Focus on CHARACTER features:
@@ -263,7 +270,17 @@ Example format:
 ║      ██▀▄▄▄▄▄██▄▄▄▄▄▀██           ║
 ╚═══════════════════════════════════╝
 
-Return ONLY the raw ASCII art."""
+Return ONLY the raw ASCII art.""",
+    static={"characters": ArtGenerationConfig.characters},
+    lore=True,
+)
+
+
+def generate_ascii_portrait(character_name: str, character_description: str) -> str:
+    """Generate detailed ASCII art portrait for an NPC or character"""
+    prompt = PORTRAIT_ART_PROMPT.render(
+        character_name=character_name, character_description=character_description
+    )
 
     try:
         content = _generate_art(prompt, ArtGenerationConfig(width=35, height=13))
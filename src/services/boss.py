@@ -1,10 +1,10 @@
 from typing import Optional, List, Dict
-from random import random, choice
 from src.models.boss_types import BOSS_ENEMIES
 from src.models.boss import Boss
 from src.models.character import Player
 from src.models.skills import Skill
 from src.models.base_types import EffectResult
+from src.utils.rng import rng
 
 
 class BossService:
@@ -20,7 +20,7 @@ class BossService:
                 if self._meets_requirements(boss.requirements, player):
                     if (
                         self.exploration_turns >= boss.requirements.min_turns
-                        or random() < boss.requirements.exploration_chance
+                        or rng.encounter.random() < boss.requirements.exploration_chance
                     ):
                         self.exploration_turns = 0
                         return boss
@@ -67,7 +67,7 @@ class BossService:
         else:
             # Basic attack if no skills available
             try:
-                damage = boss.attack + random.randint(-2, 2)
+                damage = boss.attack + rng.combat.randint(-2, 2)
                 player.health -= damage
                 return EffectResult(
                     damage=damage, skill_used="Basic Attack", status_effects=[]
@@ -128,7 +128,7 @@ class CharacterCreationService:
         """Handle class selection input"""
         while True:
             try:
-                choice = int(input("\nChoose your path (1-3): ")) - 1
+                choice = int(BaseView.get_input("\nChoose your path (1-3): ")) - 1
                 if 0 <= choice < len(classes):
                     return classes[choice]
                 print("  Invalid choice. Choose between 1-3.")
@@ -6,13 +6,14 @@ from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 
 from src.config.database import execute_query
+from src.utils.metrics import metrics
 from src.models.character import Player
 from src.models.character_classes import get_default_classes, CharacterClass
 from src.models.items.equipment import Equipment
 from src.models.items.consumable import Consumable
 from src.models.items.item import Item
 from src.models.base_types import ItemType, ItemRarity
-from src.services.encounter import EncounterService
+from src.utils.rng import rng
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +50,12 @@ class CharacterStorageService:
             return []
 
     @staticmethod
+    @metrics.timed(
+        "storage_seconds",
+        "Save/load latency",
+        outcome=lambda saved: "ok" if saved else "failed",
+        operation="save",
+    )
     def save_character(player: Player, slot_number: int) -> bool:
         """Save character to a specific slot"""
         try:
@@ -109,18 +116,22 @@ class CharacterStorageService:
                 character_id = cursor.fetchone()["id"]
 
                 # Save game state - boss encounter tracking
+                from src.services.encounter import EncounterService
+
                 encounter_service = EncounterService()
                 cursor.execute(
                     """
                     INSERT INTO game_state
-                    (character_id, encounters_until_boss, total_boss_interval, encounter_count)
-                    VALUES (%s, %s, %s, %s)
+                    (character_id, encounters_until_boss, total_boss_interval,
+                    encounter_count, rng_state)
+                    VALUES (%s, %s, %s, %s, %s)
                     """,
                     (
                         character_id,
                         encounter_service.encounters_until_boss,
                         encounter_service.total_boss_interval,
                         encounter_service.encounter_count,
+                        json.dumps(rng.get_state()),
                     ),
                 )
                 logger.info(
@@ -227,6 +238,12 @@ class CharacterStorageService:
             return False
 
     @staticmethod
+    @metrics.timed(
+        "storage_seconds",
+        "Save/load latency",
+        outcome=lambda player: "ok" if player else "failed",
+        operation="load",
+    )
     def load_character(slot_number: int) -> Optional[Player]:
         """Load character from a specific slot"""
         try:
@@ -372,6 +389,8 @@ class CharacterStorageService:
 
             if state_result:
                 # Update global EncounterService instance with loaded values
+                from src.services.encounter import EncounterService
+
                 encounter_service = EncounterService()
                 state_data = state_result[0]
 
@@ -393,6 +412,11 @@ class CharacterStorageService:
                     f"Loaded boss counter state (Progress: {encounter_service.encounters_until_boss}, Interval Forced by .env: {encounter_service.total_boss_interval})"
                 )
                 # --- END DEBUGGING MODIFICATION ---
+
+                # Continue the saved random streams where they left off
+                if state_data.get("rng_state"):
+                    rng.set_state(state_data["rng_state"])
+                    logger.info(f"Restored random streams (seed {rng.seed})")
             else:
                 logger.warning(
                     f"No game state found for character {character_id}, using default values"
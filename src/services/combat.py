@@ -9,12 +9,20 @@ from src.models.items.base import Item
 from src.models.items.consumable import Consumable
 from src.display.combat.combat_view import CombatView
 from src.display.common.message_view import MessageView
-from src.config.settings import GAME_BALANCE, DISPLAY_SETTINGS
-import random
+from src.config.settings import GAME_BALANCE
+from src.utils.rng import rng
 import time
 from src.display.themes.dark_theme import SYMBOLS as sym
 from src.services.shop import Shop
 from src.services.boss import BossService
+from src.services.combat_replay import CombatRecorder, record_combat
+from src.utils.metrics import metrics
+from src.utils.tracing import tracer
+
+COMBAT_TURN_SECONDS = metrics.histogram(
+    "combat_turn_seconds",
+    "Wall time from the player's action to the next prompt, pacing included",
+)
 
 
 class CombatResult(Enum):
@@ -34,7 +42,7 @@ def calculate_damage(
 
     # Add randomness
     rand_min, rand_max = GAME_BALANCE["DAMAGE_RANDOMNESS_RANGE"]
-    damage += random.randint(rand_min, rand_max)
+    damage += rng.combat.randint(rand_min, rand_max)
 
     # Trigger ON_HIT effects for attacker
     attacker.trigger_effects(EffectTrigger.ON_HIT, defender)
@@ -57,13 +65,14 @@ def process_status_effects(character: "Character") -> List[str]:
     return messages
 
 
+@tracer.traced("combat.rewards")
 def handle_combat_rewards(
     player: Player, enemy: Enemy, shop: Shop
 ) -> Tuple[int, List[Item]]:
     """Handle post-combat rewards including gold, items, and shop refresh"""
     # Calculate gold reward
     base_gold = enemy.level * GAME_BALANCE["GOLD_PER_LEVEL"]
-    gold_reward = random.randint(int(base_gold * 0.8), int(base_gold * 1.2))
+    gold_reward = rng.loot.randint(int(base_gold * 0.8), int(base_gold * 1.2))
 
     # Add gold to player
     player.inventory["Gold"] += gold_reward
@@ -81,24 +90,48 @@ def handle_combat_rewards(
     return gold_reward, dropped_items
 
 
+@tracer.traced("combat")
 def combat(
     player: Player, enemy: Enemy, combat_view: CombatView, shop: Shop
 ) -> Optional[bool]:
-    """Handle turn-based combat sequence."""
+    """Handle turn-based combat sequence, recorded for replay."""
+    with record_combat(player, enemy) as recorder:
+        result = combat_turns(player, enemy, combat_view, recorder)
+        if recorder:
+            recorder.finish(result, player, enemy)
+    return result
+
+
+def combat_turns(
+    player: Player,
+    enemy: Enemy,
+    combat_view: CombatView,
+    recorder: Optional[CombatRecorder] = None,
+) -> Optional[bool]:
+    """The combat rules: True on victory, False on retreat, None on defeat"""
     combat_log = []
     boss_service = BossService() if isinstance(enemy, Boss) else None
 
     while enemy.health > 0 and player.health > 0:
+        if recorder:
+            recorder.next_turn(player, enemy)
         BaseView.clear_screen()
         combat_view.show_combat_status(player, enemy, combat_log)
 
-        choice = input("\nChoose your action: ").strip()
+        choice = BaseView.get_input("\nChoose your action: ").strip()
+        turn_start = time.perf_counter()
         if choice == "1":  # Attack
             # Calculate damage with some randomization
-            player_damage = player.get_total_attack() + random.randint(-2, 2)
+            player_damage = player.get_total_attack() + rng.combat.randint(-2, 2)
 
             # Apply damage to the enemy
             enemy.health -= player_damage
+            BaseView.emit(
+                "show_damage",
+                damage=player_damage,
+                source=player.name,
+                target=enemy.name,
+            )
             combat_log.insert(
                 0, f"{sym['ATTACK']} You strike for {player_damage} damage!"
             )
@@ -107,7 +140,9 @@ def combat(
             combat_view.show_skills(player)
 
             try:
-                skill_choice = int(input("\nChoose skill (0 to cancel): ")) - 1
+                skill_choice = (
+                    int(BaseView.get_input("\nChoose skill (0 to cancel): ")) - 1
+                )
                 if skill_choice == -1:
                     continue
 
@@ -115,9 +150,16 @@ def combat(
                     skill = player.skills[skill_choice]
                     if player.mana >= skill.mana_cost:
                         # Calculate and apply skill damage
-                        skill_damage = skill.damage + random.randint(-3, 3)
+                        skill_damage = skill.damage + rng.combat.randint(-3, 3)
                         enemy.health -= skill_damage
                         player.mana -= skill.mana_cost
+                        BaseView.emit(
+                            "show_damage",
+                            damage=skill_damage,
+                            source=player.name,
+                            target=enemy.name,
+                            skill=skill.name,
+                        )
                         combat_log.insert(
                             0,
                             f"{sym['SKILL']} You cast {skill.name} for {skill_damage} damage!",
@@ -139,7 +181,7 @@ def combat(
             combat_view.show_combat_items(player)
 
             try:
-                item_choice = int(input("\nChoose item: ")) - 1
+                item_choice = int(BaseView.get_input("\nChoose item: ")) - 1
                 if item_choice == -1:  # User chose to return
                     continue
                 usable_items = [
@@ -173,12 +215,18 @@ def combat(
 
         elif choice == "4":  # Retreat
             escape_chance = 0.7 - (enemy.level * 0.05)
-            if random.random() < escape_chance:
+            if rng.combat.random() < escape_chance:
                 combat_view.show_retreat_attempt(success=True)
                 return False  # Successful retreat
             else:
-                enemy_damage = enemy.attack + random.randint(1, 3)
+                enemy_damage = enemy.attack + rng.combat.randint(1, 3)
                 player.health -= enemy_damage
+                BaseView.emit(
+                    "show_damage",
+                    damage=enemy_damage,
+                    source=enemy.name,
+                    target=player.name,
+                )
                 combat_view.show_retreat_attempt(
                     success=False, damage_taken=enemy_damage, enemy_name=enemy.name
                 )
@@ -194,7 +242,7 @@ def combat(
         BaseView.clear_screen()
         combat_view.show_combat_status(player, enemy, combat_log)
 
-        time.sleep(2)
+        BaseView.pause("COMBAT_ACTION")
 
         # Enemy's turn
         if enemy.health > 0:
@@ -205,13 +253,29 @@ def combat(
                     f"{sym['SKILL']} {enemy.name} uses {boss_result.skill_used} for {boss_result.damage} damage!",
                 )
                 player.health -= boss_result.damage
+                BaseView.emit(
+                    "show_damage",
+                    damage=boss_result.damage,
+                    source=enemy.name,
+                    target=player.name,
+                    skill=boss_result.skill_used,
+                )
                 for effect in boss_result.status_effects:
                     effect.apply(player)
+                    BaseView.emit(
+                        "status_effect", effect=effect.name, target=player.name
+                    )
                     combat_log.insert(0, f"{sym['EFFECT']} {effect.description}")
                 enemy.update_cooldowns()
             else:
-                enemy_damage = enemy.attack + random.randint(-1, 1)
+                enemy_damage = enemy.attack + rng.combat.randint(-1, 1)
                 player.health -= enemy_damage
+                BaseView.emit(
+                    "show_damage",
+                    damage=enemy_damage,
+                    source=enemy.name,
+                    target=player.name,
+                )
                 combat_log.insert(
                     0,
                     f"{sym['ATTACK']} {enemy.name} attacks for {enemy_damage} damage!",
@@ -224,11 +288,15 @@ def combat(
         # Refresh display after enemy turn and before loop check
         BaseView.clear_screen()
         combat_view.show_combat_status(player, enemy, combat_log)
-        time.sleep(
-            DISPLAY_SETTINGS.get("COMBAT_TURN_DELAY", 1.5)
-        )  # Add a small delay to see the result
+        BaseView.pause("COMBAT_TURN")  # Add a small delay to see the result
+        COMBAT_TURN_SECONDS.observe(
+            time.perf_counter() - turn_start, boss=isinstance(enemy, Boss)
+        )
 
-    return enemy.health <= 0  # True for victory, False shouldn't happen here
+    # The enemy's last blow can end the fight as well
+    if player.health <= 0:
+        return None
+    return enemy.health <= 0
 
 
 def handle_level_up(player: Player):
@@ -245,5 +313,5 @@ def handle_level_up(player: Player):
     player.attack += GAME_BALANCE["LEVEL_UP_ATTACK_INCREASE"]
     player.defense += GAME_BALANCE["LEVEL_UP_DEFENSE_INCREASE"]
     MessageView.show_success(f"🎉 Level Up! You are now level {player.level}!")
-    time.sleep(DISPLAY_SETTINGS["LEVEL_UP_DELAY"])
+    BaseView.pause("LEVEL_UP")
     CombatView.show_level_up(player)
@@ -0,0 +1,440 @@
+"""Combat recording and headless replay.
+
+``combat`` records every fight into ``COMBAT_REPLAY_SETTINGS["OUTPUT_DIR"]``
+as one JSONL file:
+
+* a header with the combatants and the combat stream's position, pickled
+  and compressed, plus a hash of their state;
+* one line per turn with the player's inputs, every draw from the combat
+  stream, the structured view events (damage, status effects) and the
+  state hash after the turn;
+* an end line with the outcome and the final hash.
+
+``replay_combat`` rebuilds the combatants from the header and runs the
+combat rules again with a null view, no pacing and the recorded inputs,
+then compares each turn with the log. A defeat can be stepped through
+after the fact, and a corpus of logs checks that a refactor of the combat
+loop still produces identical fights. The header is a pickle, but loading
+it only resolves classes defined in ``src.models``, so a log from a
+player's machine cannot run arbitrary code.
+
+Replays swap the process-wide ``BaseView.display``, so run them one at a
+time, never alongside a game or another replay in the same process.
+"""
+
+import base64
+import hashlib
+import io
+import json
+import logging
+import os
+import pickle
+import secrets
+import time
+import traceback
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import zip_longest
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.config.settings import COMBAT_REPLAY_SETTINGS
+from src.display.base.base_view import BaseView
+from src.display.base.display import Display, ScriptedDisplay
+from src.models.character import Character, Enemy, Player
+from src.models.items.consumable import Consumable
+from src.utils.rng import rng
+
+logger = logging.getLogger(__name__)
+
+LOG_VERSION = 1
+OUTCOMES = {True: "victory", False: "retreat", None: "defeat"}
+# Never pruned: these are the fights worth a post-mortem
+KEPT_OUTCOMES = ("defeat", "error")
+
+
+@lru_cache(maxsize=1)
+def _consumables() -> Dict[str, Consumable]:
+    """Predefined consumables by name; their use effects are closures"""
+    from src.models.items.common_consumables import COMMON_CONSUMABLES
+    from src.models.items.epic_consumables import EPIC_CONSUMABLES
+    from src.models.items.rare_items import RARE_CONSUMABLES
+    from src.services.item import ItemService
+
+    items = [
+        *ItemService().get_all_items(),
+        *COMMON_CONSUMABLES,
+        *RARE_CONSUMABLES,
+        *EPIC_CONSUMABLES,
+    ]
+    return {item.name: item for item in items if isinstance(item, Consumable)}
+
+
+class _SnapshotPickler(pickle.Pickler):
+    def persistent_id(self, obj):
+        if isinstance(obj, Consumable) and obj.name in _consumables():
+            return ("consumable", obj.name)
+        return None
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    def find_class(self, module: str, name: str):
+        # Snapshots only hold game models; anything else could run code
+        if (module == "src.models" or module.startswith("src.models.")) and (
+            "." not in name
+        ):
+            cls = super().find_class(module, name)
+            if isinstance(cls, type) and cls.__module__.startswith("src.models"):
+                return cls
+        raise pickle.UnpicklingError(f"Snapshot may not load {module}.{name}")
+
+    def persistent_load(self, pid):
+        kind, name = pid
+        if kind != "consumable" or name not in _consumables():
+            raise pickle.UnpicklingError(f"Unknown item reference {pid!r}")
+        return _consumables()[name]
+
+
+def _dump_snapshot(player: Player, enemy: Enemy) -> str:
+    buffer = io.BytesIO()
+    state = rng.stream("combat").getstate()
+    _SnapshotPickler(buffer, pickle.HIGHEST_PROTOCOL).dump((player, enemy, state))
+    return base64.b64encode(zlib.compress(buffer.getvalue())).decode("ascii")
+
+
+def _load_snapshot(text: str) -> Tuple[Player, Enemy, Any]:
+    data = zlib.decompress(base64.b64decode(text))
+    return _SnapshotUnpickler(io.BytesIO(data)).load()
+
+
+def _combatant_state(character: Character) -> Tuple:
+    return (
+        character.health,
+        character.max_health,
+        getattr(character, "mana", None),
+        character.attack,
+        character.defense,
+        tuple(
+            sorted(
+                (name, effect.duration, effect.tick_damage)
+                for name, effect in character.status_effects.items()
+            )
+        ),
+        tuple(
+            (skill.name, skill.current_cooldown)
+            for skill in getattr(character, "skills", None) or ()
+        ),
+        getattr(character, "current_phase", None),
+    )
+
+
+def state_hash(player: Player, enemy: Enemy) -> str:
+    """Short digest of everything a combat turn can change"""
+    state = (
+        _combatant_state(player),
+        _combatant_state(enemy),
+        tuple(item.name for item in player.inventory["items"]),
+    )
+    return hashlib.blake2b(repr(state).encode(), digest_size=8).hexdigest()
+
+
+def _plain(value: Any) -> Any:
+    """A JSON-friendly stand-in for a drawn value"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return str(getattr(value, "name", value))
+
+
+class CombatRecorder:
+    """Event log of one combat, filled in by ``record_combat``.
+
+    Without ``snapshot`` the header only carries the state hash, which is
+    all a replay needs to compare against.
+    """
+
+    def __init__(self, player: Player, enemy: Enemy, snapshot: bool = True):
+        self.header: Dict[str, Any] = {
+            "type": "combat",
+            "version": LOG_VERSION,
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "seed": rng.seed,
+            "player": {
+                "name": player.name,
+                "class": player.char_class.name,
+                "level": player.level,
+            },
+            "enemy": {
+                "name": enemy.name,
+                "level": enemy.level,
+                "boss": getattr(enemy, "is_boss", False),
+            },
+            "hash": state_hash(player, enemy),
+        }
+        if snapshot:
+            self.header["snapshot"] = _dump_snapshot(player, enemy)
+        self.turns: List[Dict[str, Any]] = []
+        self.end: Optional[Dict[str, Any]] = None
+        self._turn: Optional[Dict[str, Any]] = None
+
+    def next_turn(self, player: Player, enemy: Enemy):
+        """Close the running turn, if any, and start the next one"""
+        self._close_turn(player, enemy)
+        self._turn = {
+            "type": "turn",
+            "turn": len(self.turns) + 1,
+            "inputs": [],
+            "draws": [],
+            "events": [],
+        }
+
+    def _close_turn(self, player: Player, enemy: Enemy):
+        if self._turn is not None:
+            self._turn["hash"] = state_hash(player, enemy)
+            self.turns.append(self._turn)
+            self._turn = None
+
+    def input(self, answer: str):
+        if self._turn is not None:
+            self._turn["inputs"].append(answer)
+
+    def draw(self, method: str, value: Any):
+        if self._turn is not None:
+            self._turn["draws"].append([method, _plain(value)])
+
+    def event(self, name: str, data: Dict[str, Any]):
+        if self._turn is not None:
+            self._turn["events"].append([name, {k: _plain(v) for k, v in data.items()}])
+
+    def finish(
+        self,
+        result: Optional[bool],
+        player: Player,
+        enemy: Enemy,
+        error: Optional[BaseException] = None,
+    ):
+        self._close_turn(player, enemy)
+        self.end = {
+            "type": "end",
+            "outcome": "error" if error else OUTCOMES[result],
+            "turns": len(self.turns),
+            "hash": state_hash(player, enemy),
+        }
+        if error:
+            self.end["error"] = f"{type(error).__name__}: {error}"
+
+    def write(self, directory: Optional[str] = None) -> str:
+        directory = directory or COMBAT_REPLAY_SETTINGS["OUTPUT_DIR"]
+        os.makedirs(directory, exist_ok=True)
+        outcome = self.end["outcome"] if self.end else "error"
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(3)}-{outcome}"
+        path = os.path.join(directory, f"{name}.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            for line in [self.header, *self.turns, *([self.end] if self.end else [])]:
+                f.write(json.dumps(line) + "\n")
+        logger.debug(f"Combat log written to {path}")
+        _prune(directory, COMBAT_REPLAY_SETTINGS["KEEP"])
+        return path
+
+
+def _prune(directory: str, keep: int):
+    logs = sorted(Path(directory).glob("*.jsonl"), key=lambda p: p.stat().st_mtime)
+    disposable = [p for p in logs if not p.stem.endswith(KEPT_OUTCOMES)]
+    for path in disposable[: max(0, len(disposable) - keep)]:
+        try:
+            path.unlink()
+        except OSError as e:
+            logger.debug(f"Could not prune combat log {path}: {e}")
+
+
+class _RecordingTee(Display):
+    """Passes everything to the active display, noting inputs and events"""
+
+    def __init__(self, inner: Display, recorder: CombatRecorder):
+        self.inner = inner
+        self.recorder = recorder
+
+    def __getattr__(self, name: str):
+        return getattr(self.inner, name)
+
+    def open(self, debug_mode: bool = False) -> bool:
+        return self.inner.open(debug_mode)
+
+    def close(self):
+        self.inner.close()
+
+    def clear(self, debug_mode: bool = False):
+        self.inner.clear(debug_mode)
+
+    def read_input(self, prompt: str = "") -> str:
+        answer = self.inner.read_input(prompt)
+        self.recorder.input(answer)
+        return answer
+
+    def pause(self, category: str):
+        self.inner.pause(category)
+
+    def emit(self, name: str, data: Dict[str, Any]):
+        self.inner.emit(name, data)
+        self.recorder.event(name, data)
+
+
+@contextmanager
+def record_combat(
+    player: Player, enemy: Enemy, write: bool = True
+) -> Iterator[Optional[CombatRecorder]]:
+    """Record the combat run inside the block.
+
+    Yields None when recording is disabled or the combatants cannot be
+    snapshotted. The caller marks turns with ``next_turn`` and calls
+    ``finish``; an exception is recorded as an "error" outcome. With
+    ``write`` the log is saved when the block exits.
+    """
+    if write and not COMBAT_REPLAY_SETTINGS["ENABLED"]:
+        yield None
+        return
+    try:
+        recorder = CombatRecorder(player, enemy, snapshot=write)
+    except Exception as e:
+        logger.warning(f"Combat against {enemy.name} not recorded: {e}")
+        yield None
+        return
+
+    display = BaseView.display
+    BaseView.display = _RecordingTee(display, recorder)
+    try:
+        with rng.observe("combat", recorder.draw):
+            yield recorder
+    except BaseException as e:
+        if recorder.end is None:
+            recorder.finish(None, player, enemy, error=e)
+        raise
+    finally:
+        BaseView.display = display
+        if write:
+            try:
+                recorder.write()
+            except OSError as e:
+                logger.warning(f"Could not write combat log: {e}")
+
+
+class _NullCombatView:
+    """Accepts every ``CombatView`` call and draws nothing"""
+
+    def __getattr__(self, name: str):
+        return lambda *args, **kwargs: None
+
+
+@dataclass
+class ReplayResult:
+    path: str
+    outcome: str
+    replayed_outcome: Optional[str]
+    turns: int
+    seconds: float
+    divergence: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.divergence is None
+
+
+def load_log(
+    path: str,
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """Header, turns and end line (None if the log was cut short)"""
+    with open(path, encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    if not lines or lines[0].get("type") != "combat":
+        raise ValueError(f"{path} is not a combat log")
+    if lines[0].get("version") != LOG_VERSION:
+        raise ValueError(f"{path}: unsupported log version {lines[0].get('version')}")
+    end = lines[-1] if lines[-1].get("type") == "end" else None
+    turns = [line for line in lines if line.get("type") == "turn"]
+    return lines[0], turns, end
+
+
+def _compare(
+    header: Dict[str, Any],
+    turns: List[Dict[str, Any]],
+    end: Optional[Dict[str, Any]],
+    recorder: CombatRecorder,
+) -> Optional[str]:
+    """First difference between a log and its replay, if any"""
+    if recorder.header["hash"] != header["hash"]:
+        return f"initial state {recorder.header['hash']} != {header['hash']}"
+    replayed = json.loads(json.dumps(recorder.turns))
+    for expected, actual in zip_longest(turns, replayed):
+        if actual is None:
+            return f"replay ended before turn {expected['turn']}"
+        if expected is None:
+            return f"replay ran past turn {len(turns)}"
+        for key in ("inputs", "draws", "events", "hash"):
+            if expected[key] != actual[key]:
+                return (
+                    f"turn {expected['turn']} {key}: "
+                    f"{actual[key]!r} != {expected[key]!r}"
+                )
+    if end and recorder.end:
+        for key in ("outcome", "hash"):
+            if end[key] != recorder.end[key]:
+                return f"end {key}: {recorder.end[key]!r} != {end[key]!r}"
+    return None
+
+
+def replay_combat(path: str) -> ReplayResult:
+    """Re-run a recorded combat headless and check it against the log.
+
+    Not thread-safe: the replay takes over ``BaseView.display`` while it
+    runs and restores it afterwards.
+    """
+    from src.services.combat import combat_turns
+
+    header, turns, end = load_log(path)
+    try:
+        player, enemy, stream_state = _load_snapshot(header["snapshot"])
+    except (pickle.UnpicklingError, AttributeError, ImportError) as e:
+        raise ValueError(f"{path}: unreadable snapshot: {e}") from e
+    inputs = [answer for turn in turns for answer in turn["inputs"]]
+
+    stream = rng.stream("combat")
+    saved_state = stream.getstate()
+    previous_display = BaseView.display
+    display = ScriptedDisplay(inputs, capture_output=False)
+    recorder = None
+    crash = None
+    start = time.perf_counter()
+    try:
+        BaseView.display = display
+        display.open()
+        stream.setstate(stream_state)
+        with record_combat(player, enemy, write=False) as recorder:
+            result = combat_turns(player, enemy, _NullCombatView(), recorder)
+            recorder.finish(result, player, enemy)
+    except Exception:
+        # record_combat has noted an "error" outcome; keep the traceback
+        crash = traceback.format_exc()
+    finally:
+        seconds = time.perf_counter() - start
+        display.close()
+        BaseView.display = previous_display
+        stream.setstate(saved_state)
+    if recorder is None:
+        raise ValueError(f"{path}: the replay could not be recorded\n{crash or ''}")
+
+    divergence = _compare(header, turns, end, recorder)
+    replayed_error = recorder.end.get("error") if recorder.end else None
+    # A crash only replays faithfully if the log ended in the same error
+    if crash and (divergence or not end or end.get("error") != replayed_error):
+        divergence = f"{divergence or 'replay crashed'}\n{crash}"
+    return ReplayResult(
+        path=path,
+        outcome=end["outcome"] if end else "incomplete",
+        replayed_outcome=recorder.end["outcome"] if recorder.end else None,
+        turns=len(recorder.turns),
+        seconds=seconds,
+        divergence=divergence,
+    )
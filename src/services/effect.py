@@ -4,7 +4,7 @@ from ..models.character import Character
 from ..config.settings import GAME_BALANCE
 from ..display.effect.effect_view import EffectView
 from ..models.base_types import EffectTrigger
-import random
+from ..utils.rng import rng
 import logging
 
 logger = logging.getLogger(__name__)
@@ -85,7 +85,7 @@ class EffectService:
     def _check_resistance(self, target: Character, effect: BaseEffect) -> bool:
         """Check if effect is resisted"""
         resistance = target.get_resistance(effect.effect_type)
-        return random.random() < resistance
+        return rng.combat.random() < resistance
 
     def _process_trigger(
         self, character: Character, trigger: EffectTrigger, **kwargs
@@ -1,27 +1,75 @@
+from collections import deque
 from typing import Optional, Dict, List, Any, Tuple
-import random
+from src.utils.rng import rng
 import logging
 from src.models.character import Player, Enemy
 from src.services.ai_generator import generate_enemy
 from src.services.ai_core import generate_content
+from src.services.ai_schemas import PuzzleData
+from src.services.prompts import prompts
 from src.models.items.base import Item
 from src.models.base_types import EncounterType
 from src.utils.json_cleaner import JSONCleaner
 from src.services.npc_generator import NPCGenerator
 import json
-from enum import Enum, auto
 import os
 
 logger = logging.getLogger(__name__)
 
+# Encounter weights only look at the last few encounters; keeping more
+# would grow the singleton for as long as the session lasts
+ENCOUNTER_HISTORY_SIZE = 10
 
-class EncounterType(Enum):
-    COMBAT = auto()
-    PUZZLE = auto()
-    TREASURE = auto()
-    TRAP = auto()
-    NPC = auto()
-    BOSS = auto()
+
+PUZZLE_PROMPT = prompts.register(
+    "encounter.puzzle",
+    """Create a short, atmospheric puzzle encounter for a dark fantasy RPG.
+
+The player is exploring a world corrupted by the God of Hope.
+
+Return a JSON object with:
+1. A brief description of the puzzle scene
+2. The puzzle itself (riddle, pattern, etc.)
+3. The solution
+4. A reward (small amount of gold, minor item, or small HP/mana boost)
+5. 2-3 hints that can be provided if player struggles
+
+FORMAT:
+{{
+  "scene": "description of what the player encounters",
+  "puzzle": "the actual puzzle/riddle text",
+  "solution": "the answer or method to solve it",
+  "reward": {{"type": "gold|health|mana|exp", "amount": 10-30}},
+  "hints": ["hint1", "hint2"]
+}}""",
+)
+
+
+TREASURE_PROMPT = prompts.register(
+    "encounter.treasure",
+    """Create a detailed description of a hidden treasure the player discovers in a dark fantasy world.
+The world is corrupted by twisted hope, so treasure can be found in unusual or unsettling places.
+The treasure contains {gold_amount} gold coins.
+
+Return a JSON object with:
+{{
+  "description": "atmospheric 2-3 sentence description of finding the treasure"
+}}""",
+)
+
+
+TRAP_PROMPT = prompts.register(
+    "encounter.trap",
+    """Create a detailed description of a trap the player encounters in a dark fantasy world.
+The world is corrupted by twisted hope. The trap will cause {damage} damage.
+
+Return a JSON object with:
+{{
+  "description": "atmospheric 2-3 sentence description of the trap",
+  "triggered_text": "what happens when the trap is triggered",
+  "evaded_text": "what happens if the player successfully evades"
+}}""",
+)
 
 
 class EncounterService:
@@ -49,7 +97,7 @@ class EncounterService:
         self.boss_threshold = (
             boss_threshold  # Deprecated, boss timing now uses interval
         )
-        self.encounter_history = []
+        self.encounter_history = deque(maxlen=ENCOUNTER_HISTORY_SIZE)
         self.encounter_types = [
             EncounterType.COMBAT,
             EncounterType.PUZZLE,
@@ -101,7 +149,9 @@ class EncounterService:
         weights = self._calculate_encounter_weights()
 
         # Select encounter type based on weights
-        encounter_type = random.choices(self.encounter_types, weights=weights, k=1)[0]
+        encounter_type = rng.encounter.choices(
+            self.encounter_types, weights=weights, k=1
+        )[0]
 
         # Generate encounter based on type
         if encounter_type == EncounterType.COMBAT:
@@ -129,7 +179,7 @@ class EncounterService:
         if self.encounter_count >= min_threshold:
             # Increasing chance of boss encounter after min_threshold
             chance = min(0.95, (self.encounter_count - min_threshold + 1) * 0.2)
-            if random.random() < chance or self.encounter_count >= max_threshold:
+            if rng.encounter.random() < chance or self.encounter_count >= max_threshold:
                 self.encounter_count = 0  # Reset counter after boss
                 return True
         return False
@@ -153,7 +203,10 @@ class EncounterService:
 
             # If player had several combat encounters in a row, increase treasure chance
             if len(self.encounter_history) >= 3:
-                if all(e == EncounterType.COMBAT for e in self.encounter_history[-3:]):
+                if all(
+                    self.encounter_history[-i] == EncounterType.COMBAT
+                    for i in (1, 2, 3)
+                ):
                     weights = [40, 15, 30, 5, 10]  # Higher treasure chance
 
         return weights
@@ -174,62 +227,32 @@ class EncounterService:
         self.encounter_history.append(EncounterType.PUZZLE)
 
         # AI-generated puzzle
-        prompt = """Create a short, atmospheric puzzle encounter for a dark fantasy RPG.
-
-The player is exploring a world corrupted by the God of Hope.
+        prompt = PUZZLE_PROMPT.render()
 
-Return a JSON object with:
-1. A brief description of the puzzle scene
-2. The puzzle itself (riddle, pattern, etc.)
-3. The solution
-4. A reward (small amount of gold, minor item, or small HP/mana boost)
-5. 2-3 hints that can be provided if player struggles
-
-FORMAT:
-{
-  "scene": "description of what the player encounters",
-  "puzzle": "the actual puzzle/riddle text",
-  "solution": "the answer or method to solve it",
-  "reward": {"type": "gold|health|mana|exp", "amount": 10-30},
-  "hints": ["hint1", "hint2"]
-}"""
-
-        content = generate_content(prompt)
-        if not content:
+        data = generate_content(prompt, schema=PuzzleData)
+        if not data:
             return self._generate_fallback_puzzle()
 
-        try:
-            data = json.loads(content)
-            return {
-                "type": EncounterType.PUZZLE,
-                "scene": data["scene"],
-                "puzzle": data["puzzle"],
-                "solution": data["solution"],
-                "reward": data["reward"],
-                "hints": data["hints"],
-            }
-        except Exception as e:
-            logger.error(f"Error parsing puzzle encounter: {str(e)}")
-            return self._generate_fallback_puzzle()
+        return {
+            "type": EncounterType.PUZZLE,
+            "scene": data.scene,
+            "puzzle": data.puzzle,
+            "solution": data.solution,
+            "reward": data.reward.to_dict(),
+            "hints": data.hints,
+        }
 
     def _generate_treasure_encounter(self, player: Player) -> Dict[str, Any]:
         """Generate a treasure encounter"""
         self.encounter_history.append(EncounterType.TREASURE)
 
         # Calculate gold based on player level
-        gold_amount = random.randint(player.level * 10, player.level * 25)
+        gold_amount = rng.loot.randint(player.level * 10, player.level * 25)
 
         # Chance for an item with the gold
-        has_item = random.random() < 0.4
+        has_item = rng.loot.random() < 0.4
 
-        prompt = f"""Create a detailed description of a hidden treasure the player discovers in a dark fantasy world.
-The world is corrupted by twisted hope, so treasure can be found in unusual or unsettling places.
-The treasure contains {gold_amount} gold coins.
-
-Return a JSON object with:
-{{
-  "description": "atmospheric 2-3 sentence description of finding the treasure"
-}}"""
+        prompt = TREASURE_PROMPT.render(gold_amount=gold_amount)
 
         content = generate_content(prompt)
         treasure_desc = "You found a small hidden cache of treasure."
@@ -253,20 +276,12 @@ Return a JSON object with:
         self.encounter_history.append(EncounterType.TRAP)
 
         # Calculate damage based on player level (not too punishing)
-        damage = random.randint(
+        damage = rng.encounter.randint(
             int(player.max_health * 0.05), int(player.max_health * 0.15)
         )
 
         # AI-generated trap description
-        prompt = f"""Create a detailed description of a trap the player encounters in a dark fantasy world.
-The world is corrupted by twisted hope. The trap will cause {damage} damage.
-
-Return a JSON object with:
-{{
-  "description": "atmospheric 2-3 sentence description of the trap",
-  "triggered_text": "what happens when the trap is triggered",
-  "evaded_text": "what happens if the player successfully evades"
-}}"""
+        prompt = TRAP_PROMPT.render(damage=damage)
 
         content = generate_content(prompt)
         if not content:
@@ -276,7 +291,7 @@ Return a JSON object with:
                 "triggered_text": f"A hidden trap springs, dealing {damage} damage!",
                 "evaded_text": "You carefully avoid the trap mechanism.",
                 "damage": damage,
-                "difficulty": player.level + random.randint(1, 5),
+                "difficulty": player.level + rng.encounter.randint(1, 5),
             }
 
         try:
@@ -287,7 +302,7 @@ Return a JSON object with:
                 "triggered_text": data["triggered_text"],
                 "evaded_text": data["evaded_text"],
                 "damage": damage,
-                "difficulty": player.level + random.randint(1, 5),
+                "difficulty": player.level + rng.encounter.randint(1, 5),
             }
         except Exception as e:
             logger.error(f"Error parsing trap encounter: {str(e)}")
@@ -297,7 +312,7 @@ Return a JSON object with:
                 "triggered_text": f"A hidden trap springs, dealing {damage} damage!",
                 "evaded_text": "You carefully avoid the trap mechanism.",
                 "damage": damage,
-                "difficulty": player.level + random.randint(1, 5),
+                "difficulty": player.level + rng.encounter.randint(1, 5),
             }
 
     def _generate_npc_encounter(self, player: Player) -> Dict[str, Any]:
@@ -349,7 +364,7 @@ Return a JSON object with:
             },
         ]
 
-        puzzle = random.choice(puzzles)
+        puzzle = rng.encounter.choice(puzzles)
         puzzle["type"] = EncounterType.PUZZLE
         return puzzle
 
@@ -395,7 +410,7 @@ Return a JSON object with:
             },
         ]
 
-        return random.choice(npcs)
+        return rng.encounter.choice(npcs)
 
     def _generate_boss_interval(self) -> int:
         """Return the configured boss interval."""
@@ -483,7 +498,7 @@ Return a JSON object with:
             EncounterType.NPC,
         ]
 
-        return random.choices(encounter_types, weights=weights, k=1)[0]
+        return rng.encounter.choices(encounter_types, weights=weights, k=1)[0]
 
     def _generate_boss_encounter(self, player_level: int) -> Dict[str, Any]:
         """Generate a boss encounter"""
@@ -511,12 +526,12 @@ Return a JSON object with:
             "Corrupted Seraph",
         ]
 
-        boss_name = random.choice(boss_types)
+        boss_name = rng.encounter.choice(boss_types)
 
         # Boss stats are significantly higher than regular enemies
-        health = random.randint(70, 100) * boss_level
-        attack = random.randint(12, 18) * boss_level
-        defense = random.randint(8, 12) * boss_level
+        health = rng.encounter.randint(70, 100) * boss_level
+        attack = rng.encounter.randint(12, 18) * boss_level
+        defense = rng.encounter.randint(8, 12) * boss_level
 
         description = self._generate_boss_description(boss_name)
 
@@ -1,6 +1,5 @@
 from typing import Dict, Any, Optional, Tuple
-import random
-import time
+from src.utils.rng import rng
 import logging
 from src.models.character import Player, Enemy
 from src.models.base_types import EncounterType
@@ -15,7 +14,7 @@ from src.display.base.base_view import BaseView
 from src.services.boss import BossService
 from src.display.boss.boss_view import BossView
 from src.config.settings import GAME_BALANCE
-from src.config.settings import DISPLAY_SETTINGS
+from src.utils.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
@@ -36,9 +35,21 @@ class EncounterHandler:
         Returns:
             bool: False if player died, True otherwise
         """
+        with tracer.span("exploration", player_level=player.level) as span:
+            alive = self._explore(player, combat_view, boss_view, shop)
+            if span:
+                span.set_attribute("player_alive", alive)
+            return alive
+
+    def _explore(
+        self, player: Player, combat_view: CombatView, boss_view: BossView, shop: Shop
+    ) -> bool:
         # Generate regular encounter
-        encounter = self.encounter_service.get_next_encounter(player)
-        encounter_type = encounter.get("type")
+        with tracer.span("encounter.select") as span:
+            encounter = self.encounter_service.get_next_encounter(player)
+            encounter_type = encounter.get("type")
+            if span and encounter_type:
+                span.set_attribute("encounter_type", encounter_type.name)
 
         # Update the encounters_until_boss counter in EncounterService
         # This is the ONLY place where we should decrement the counter
@@ -92,15 +103,13 @@ class EncounterHandler:
                 "The time is not yet right... The Corruption stirs but does not fully manifest."
             )
             # We should NOT reset the boss counter here, let the player try again
-            time.sleep(2)
+            BaseView.pause("RESULT")
             return True  # Player didn't die, return to main menu
 
         # Show boss introduction/animation VIEW
         BaseView.clear_screen()
         boss_view.show_boss_encounter(boss)  # Use the BossView
-        time.sleep(
-            DISPLAY_SETTINGS.get("BOSS_INTRO_DELAY", 3)
-        )  # Add a delay after intro
+        BaseView.pause("BOSS_INTRO")
 
         # Combat with the specific boss
         combat_result = combat(
@@ -111,7 +120,7 @@ class EncounterHandler:
             MessageView.show_info(
                 f"You have fallen to the {boss.title}, {boss.name}..."
             )
-            time.sleep(2)
+            BaseView.pause("RESULT")
             return False
         elif combat_result:  # Victory
             exp_gained = boss.exp_reward  # Use boss specific exp reward
@@ -145,10 +154,10 @@ class EncounterHandler:
             # Check for level up
             if player.exp >= player.exp_to_level:
                 handle_level_up(player)
-            time.sleep(5)
+            BaseView.pause("BOSS_VICTORY")
         else:  # Retreat
             MessageView.show_info(f"You retreat from the powerful {boss.name}...")
-            time.sleep(2)
+            BaseView.pause("RESULT")
 
         return True  # Player is still alive
 
@@ -170,13 +179,13 @@ class EncounterHandler:
 
         if combat_result is None:  # Player died
             MessageView.show_error("You have fallen in battle...")
-            time.sleep(2)
+            BaseView.pause("RESULT")
             return False
         elif combat_result:  # Victory
             exp_gained = enemy.exp_reward
             player.exp += exp_gained
             MessageView.show_success(f"Victory! Gained {exp_gained} experience!")
-            time.sleep(2)
+            BaseView.pause("RESULT")
 
             # Handle combat rewards
             gold_gained, dropped_items = handle_combat_rewards(player, enemy, shop)
@@ -193,7 +202,7 @@ class EncounterHandler:
                 handle_level_up(player)
         else:  # Retreat
             MessageView.show_info("You retreat from battle...")
-            time.sleep(2)
+            BaseView.pause("RESULT")
 
         return True  # Player is still alive
 
@@ -209,10 +218,10 @@ class EncounterHandler:
         attempt = 0
 
         while attempt < max_attempts:
-            choice = input("\nChoose your action: ").strip()
+            choice = BaseView.get_input("\nChoose your action: ").strip()
 
             if choice == "1":  # Solve puzzle
-                answer = input("\nEnter your solution: ").strip().lower()
+                answer = BaseView.get_input("\nEnter your solution: ").strip().lower()
                 solution = encounter_data.get("solution", "").lower()
 
                 if answer == solution:
@@ -237,7 +246,7 @@ class EncounterHandler:
                         if player.exp >= player.exp_to_level:
                             handle_level_up(player)
 
-                    input()
+                    BaseView.get_input()
                     return True
                 else:
                     # Failure
@@ -245,7 +254,7 @@ class EncounterHandler:
                     print(
                         f"\nIncorrect solution! Attempts remaining: {max_attempts - attempt}"
                     )
-                    time.sleep(1)
+                    BaseView.pause("BRIEF")
 
             elif choice == "2":  # Request hint
                 if hints_given < len(encounter_data.get("hints", [])):
@@ -254,18 +263,18 @@ class EncounterHandler:
                     hints_given += 1
                 else:
                     print("\nNo more hints available!")
-                time.sleep(1.5)
+                BaseView.pause("MESSAGE")
 
             elif choice == "3":  # Skip puzzle
                 MessageView.show_info(
                     "You decide to move on without solving the puzzle."
                 )
-                time.sleep(1.5)
+                BaseView.pause("MESSAGE")
                 return True
 
         # Failed all attempts
         EncounterView.show_puzzle_failure()
-        input()
+        BaseView.get_input()
         return True
 
     def _handle_treasure_encounter(
@@ -286,7 +295,7 @@ class EncounterHandler:
             # This will be replaced with actual implementation
             pass
 
-        input()  # Wait for user input
+        BaseView.get_input()  # Wait for user input
         return True
 
     def _handle_trap_encounter(
@@ -296,7 +305,7 @@ class EncounterHandler:
         # Display trap
         EncounterView.show_encounter(encounter_data)
 
-        choice = input("\nChoose your action: ").strip()
+        choice = BaseView.get_input("\nChoose your action: ").strip()
 
         # Calculate success chance based on player level vs trap difficulty
         difficulty = encounter_data.get("difficulty", player.level + 2)
@@ -314,7 +323,7 @@ class EncounterHandler:
             if choice == "1":  # Disarm has higher risk/reward
                 success_chance = min(0.9, max(0.1, success_chance + 0.05))
 
-            success = random.random() < success_chance
+            success = rng.encounter.random() < success_chance
             EncounterView.show_trap_result(success, encounter_data)
 
             if not success:
@@ -338,7 +347,7 @@ class EncounterHandler:
             if player.health <= 0:
                 return False
 
-        input()  # Wait for user input
+        BaseView.get_input()  # Wait for user input
         return True
 
     def _handle_npc_encounter(
@@ -357,7 +366,7 @@ class EncounterHandler:
             for quest in npc.quests:
                 # In a full implementation, we'd have a better way to track quest progress
                 # For now, we'll randomly advance some quests for testing
-                if not quest.completed and random.random() < 0.2:
+                if not quest.completed and rng.encounter.random() < 0.2:
                     quest.progress += 1
                     if NPCView.handle_quest_completion_check(quest, npc, player):
                         # Quest was completed and rewards given
@@ -372,7 +381,7 @@ class EncounterHandler:
             options = encounter_data.get("options", [])
 
             try:
-                choice = int(input("\nChoose your response: ").strip())
+                choice = int(BaseView.get_input("\nChoose your response: ").strip())
 
                 if 1 <= choice <= len(options):
                     outcome = options[choice - 1].get("outcome", "Nothing happens.")
@@ -416,5 +425,5 @@ class EncounterHandler:
             except ValueError:
                 print("\nInvalid input. The NPC sighs and walks away.")
 
-            input()  # Wait for user input
+            BaseView.get_input()  # Wait for user input
             return True
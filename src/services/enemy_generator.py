@@ -0,0 +1,348 @@
+"""Procedural enemies, composed offline from the game's lore.
+
+Names and descriptions come from grammar tables of the Curse of Hope's
+victims, stats from the ``ENEMY_GENERATION`` ranges and level scaling, and
+art from a small library of silhouettes recoloured with art palette glyphs.
+No network, a few microseconds per enemy, and the same seed always yields
+the same sequence of enemies (see ``src.utils.rng``).
+
+``generate_enemy`` uses it when ``ENEMY_GENERATION["MODE"]`` is
+"procedural" (or AI enemy generation is disabled), and as the fallback
+whenever the model cannot produce an enemy.
+"""
+
+import logging
+import os
+import random
+from functools import lru_cache
+from itertools import product
+from typing import Dict, List, Optional, Tuple
+
+from src.config.settings import ENABLE_AI_ENEMY_GENERATION, ENEMY_GENERATION
+from src.models.character import Enemy
+from src.utils.rng import rng
+
+logger = logging.getLogger(__name__)
+
+MODES = ("ai", "procedural")
+
+# Shared by every archetype
+PREFIXES = [
+    "Gilded",
+    "Radiant",
+    "Smiling",
+    "Hopeful",
+    "Sunlit",
+    "Gleaming",
+    "Rapturous",
+    "Haloed",
+    "Beaming",
+    "Devout",
+]
+ORIGINS = [
+    "the Shattered Chapel",
+    "the Golden Wound",
+    "the Last Dawn",
+    "the Hollow Choir",
+    "the Ashen Vigil",
+    "the Drowned Cathedral",
+    "the Broken Promise",
+    "Endless Morning",
+]
+DETAILS = [
+    "radiant cracks split its flesh and leak golden light",
+    "its mouth is fixed in an endless smile",
+    "a sickly halo flickers above it",
+    "its eyes burn with visions of impossible futures",
+    "gilded veins pulse beneath its skin",
+    "it sheds motes of warm, poisonous light",
+]
+BEHAVIORS = [
+    "It promises salvation with every blow.",
+    "It hums a hymn of hope as it hunts.",
+    "It weeps with joy while it destroys.",
+    "It begs you to believe, then strikes.",
+    "It tears at the shadows that shield you.",
+    "It cannot stop smiling, even as it bleeds.",
+]
+
+# Each archetype: stat multipliers (health, attack, defense), creature
+# names, description openers and art silhouettes. In the silhouettes E is
+# an eye, B body, S shade, C a corruption crack and M the smiling mouth.
+ARCHETYPES: Dict[str, Dict] = {
+    "husk": {
+        "stats": (1.1, 1.0, 0.8),
+        "bases": ["Pilgrim", "Farmhand", "Widow", "Beggar", "Lamplighter", "Orphan"],
+        "subjects": [
+            "A villager whose desperate wish was answered",
+            "A starving pilgrim who prayed for deliverance too long",
+            "A grieving parent who still waits for a promised return",
+            "A common soul twisted by a single hopeful thought",
+        ],
+        "art": [
+            [
+                "   SBBBBBS   ",
+                "  SBE C EBS  ",
+                "   BBMMMBB   ",
+                " SBBBBCBBBBS ",
+                " B  BBCBB  B ",
+                "   BB   BB   ",
+            ],
+            [
+                "    SBBBS    ",
+                "   BE C EB   ",
+                "   SBMMMBS   ",
+                "  BBBBCBBBB  ",
+                " SB BBBCB BS ",
+                "   SB   BS   ",
+            ],
+        ],
+    },
+    "zealot": {
+        "stats": (1.0, 1.15, 1.1),
+        "bases": ["Paladin", "Crusader", "Templar", "Inquisitor", "Choirmaster"],
+        "subjects": [
+            "A holy knight whose zeal curdled into madness",
+            "A crusader sworn to a god that devoured its faith",
+            "A priest who preaches the gospel of the golden wound",
+            "A templar still guarding a shrine to false dawn",
+        ],
+        "art": [
+            [
+                "  C  CCC  C  ",
+                "   SBBBBBS   ",
+                "  BBE B EBB  ",
+                "  SBBMMMBBS  ",
+                " BBBBCBCBBBB ",
+                "  SBB   BBS  ",
+            ],
+            [
+                "    CCCCC    ",
+                "  SBBBBBBBS  ",
+                "  BSE B ESB  ",
+                "  BBBMMMBBB C",
+                " SBBBBCBBBBSC",
+                "  BBS   SBB C",
+            ],
+        ],
+    },
+    "guardian": {
+        "stats": (1.3, 0.85, 1.3),
+        "bases": ["Colossus", "Warden", "Sentinel", "Gatekeeper", "Idol", "Golem"],
+        "subjects": [
+            "An ancient protector perverted by the God of Hope's touch",
+            "A stone guardian that woke to defend a corrupted relic",
+            "A warden of the old ruins whose purpose has been rewritten",
+            "A colossal idol carved to hope and now filled with it",
+        ],
+        "art": [
+            [
+                " SBBBBBBBBBS ",
+                " BBE BBB EBB ",
+                " BBBBMMMBBBB ",
+                "SBBCBBBBBCBBS",
+                "BBBBBCBCBBBBB",
+                " BBBB   BBBB ",
+            ],
+            [
+                "  SBBBBBBBS  ",
+                " SBBEBBBEBBS ",
+                " BBBBMMMBBBB ",
+                "BBSBBBCBBBSBB",
+                "BB BBCBCBB BB",
+                "  SBBB BBBS  ",
+            ],
+        ],
+    },
+    "wraith": {
+        "stats": (0.8, 1.25, 0.7),
+        "bases": ["Specter", "Shade", "Wisp", "Apparition", "Revenant", "Phantom"],
+        "subjects": [
+            "The lingering spirit of a believer who died smiling",
+            "A specter bound to the last hope it ever held",
+            "A revenant that returned because it was promised it would",
+            "A flickering ghost of light where a person once stood",
+        ],
+        "art": [
+            [
+                "    SSSSS    ",
+                "  SSE C ESS  ",
+                "  SS MMM SS  ",
+                " SSSSSCSSSSS ",
+                "  SS SCS SS  ",
+                "   S  S  S   ",
+            ],
+            [
+                "   C SSS C   ",
+                "  SSSSSSSSS  ",
+                "  SE  C  ES  ",
+                "  SSSMMMSSS  ",
+                "   SSSCSSS   ",
+                "  S S S S S  ",
+            ],
+        ],
+    },
+    "beast": {
+        "stats": (1.1, 1.1, 0.9),
+        "bases": ["Hound", "Stag", "Wolf", "Raven", "Serpent", "Boar"],
+        "subjects": [
+            "A creature of the wilds gorged on corrupted light",
+            "A beast that followed its master into the golden dawn",
+            "An animal that wandered too close to a fallen shrine",
+            "A hunter of the old forests, now hunting for its god",
+        ],
+        "art": [
+            [
+                " S       S   ",
+                " BS     SB   ",
+                " SBBBBBBBBS  ",
+                "BE C BBBBBBB ",
+                " BMMBCBBCBBBS",
+                "  BB B  B BB ",
+            ],
+            [
+                "  S  S       ",
+                "  SBBBS      ",
+                " BE CBBBBBBS ",
+                " SBMMBBCBBBBB",
+                "   SBBBCBBBBS",
+                "   BB B B BB ",
+            ],
+        ],
+    },
+}
+
+# Glyphs for the silhouette letters, drawn from ArtGenerationConfig.characters
+GLYPHS = {
+    "E": "◆♦",
+    "B": "█▓",
+    "S": "░▒",
+    "C": "╱╲╳",
+    "M": "▀▄─╌",
+}
+GLYPH_SETS = list(product(*GLYPHS.values()))
+ART_WIDTH = 27
+
+
+def _frame(rows: List[str]) -> str:
+    border = "═" * ART_WIDTH
+    body = "\n".join(f"║{row.center(ART_WIDTH)}║" for row in rows)
+    return f"\n╔{border}╗\n{body}\n╚{border}╝\n"
+
+
+# Framed once; rendering only recolours the letters
+TEMPLATES: Dict[str, List[str]] = {
+    name: [_frame(rows) for rows in archetype["art"]]
+    for name, archetype in ARCHETYPES.items()
+}
+ARCHETYPE_NAMES = list(ARCHETYPES)
+
+
+@lru_cache(maxsize=None)
+def _render_art(archetype: str, variant: int, glyphs: Tuple[str, ...]) -> str:
+    table = str.maketrans(dict(zip(GLYPHS, glyphs)))
+    return TEMPLATES[archetype][variant].translate(table)
+
+
+def _pick(draw, options):
+    """``random.choice`` at a fraction of the cost; ``draw`` is ``rng.random``"""
+    return options[int(draw() * len(options))]
+
+
+def _between(draw, bounds: Tuple[int, int]) -> int:
+    low, high = bounds
+    return low + int(draw() * (high - low + 1))
+
+
+def generation_mode() -> str:
+    """How ``generate_enemy`` gets its enemies: "ai" or "procedural" """
+    if not ENABLE_AI_ENEMY_GENERATION:
+        return "procedural"
+    mode = os.getenv("ENEMY_GENERATION_MODE") or ENEMY_GENERATION["MODE"]
+    if mode not in MODES:
+        logger.warning(f"Unknown enemy generation mode '{mode}', using 'ai'")
+        return "ai"
+    return mode
+
+
+class ProceduralEnemyGenerator:
+    """Enemies from grammar tables and stat ranges, with no network.
+
+    Every choice comes from one ``random.Random``: the session's "enemies"
+    stream by default, or a private one when ``seed`` is given. Either way
+    the same seed produces identical enemies for the same sequence of
+    player levels.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self._private = None if seed is None else random.Random(seed)
+
+    @property
+    def rng(self) -> random.Random:
+        # Looked up per enemy so that ``rng.observe("enemies")`` sees the draws
+        return rng.enemies if self._private is None else self._private
+
+    def generate(self, player_level: int) -> Enemy:
+        draw = self.rng.random
+        level = max(1, player_level + _pick(draw, ENEMY_GENERATION["LEVEL_SPREAD"]))
+        archetype_name = _pick(draw, ARCHETYPE_NAMES)
+        archetype = ARCHETYPES[archetype_name]
+
+        health, attack, defense = self._stats(draw, level, archetype["stats"])
+        exp = ENEMY_GENERATION["EXP_REWARD"]
+        art = _render_art(
+            archetype_name,
+            int(draw() * len(TEMPLATES[archetype_name])),
+            _pick(draw, GLYPH_SETS),
+        )
+
+        return Enemy(
+            name=self._name(draw, archetype["bases"]),
+            description=(
+                f"{_pick(draw, archetype['subjects'])}; "
+                f"{_pick(draw, DETAILS)}. {_pick(draw, BEHAVIORS)}"
+            ),
+            health=health,
+            attack=attack,
+            defense=defense,
+            exp_reward=int(exp["BASE"] * (level + 1) * exp["MULTIPLIER"]),
+            level=level,
+            art=art,
+        )
+
+    @staticmethod
+    def _stats(
+        draw, level: int, multipliers: Tuple[float, float, float]
+    ) -> Tuple[int, int, int]:
+        scaling = ENEMY_GENERATION["LEVEL_SCALING"]
+        health = (
+            _between(draw, ENEMY_GENERATION["BASE_HEALTH_RANGE"])
+            + scaling["HEALTH_PER_LEVEL"] * level
+        )
+        attack = (
+            _between(draw, ENEMY_GENERATION["BASE_ATTACK_RANGE"])
+            + scaling["ATTACK_PER_LEVEL"] * level
+        )
+        defense = (
+            _between(draw, ENEMY_GENERATION["BASE_DEFENSE_RANGE"])
+            + scaling["DEFENSE_PER_LEVEL"] * level
+        )
+        health_factor, attack_factor, defense_factor = multipliers
+        return (
+            max(1, round(health * health_factor)),
+            max(1, round(attack * attack_factor)),
+            max(1, round(defense * defense_factor)),
+        )
+
+    @staticmethod
+    def _name(draw, bases: List[str]) -> str:
+        base = _pick(draw, bases)
+        form = draw()
+        if form < 0.5:
+            return f"{_pick(draw, PREFIXES)} {base}"
+        if form < 0.8:
+            return f"{base} of {_pick(draw, ORIGINS)}"
+        return f"{_pick(draw, PREFIXES)} {base} of {_pick(draw, ORIGINS)}"
+
+
+procedural_enemies = ProceduralEnemyGenerator()
@@ -1,4 +1,6 @@
-import random
+from ..utils.rng import rng
+from collections import defaultdict
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple, TYPE_CHECKING, Callable
 
 from ..models.items.base import ItemRarity, Item
@@ -138,7 +140,7 @@ class ItemService:
         if not rarity:
             rarity = ItemService._random_rarity()
         if not item_type:
-            item_type = random.choice(list(ItemType))
+            item_type = rng.loot.choice(list(ItemType))
 
         # Generate appropriate stats for the item type
         base_stats = ItemService._generate_base_stats(item_type)
@@ -167,7 +169,7 @@ class ItemService:
     @staticmethod
     def _random_rarity() -> ItemRarity:
         """Generate random rarity based on drop chances"""
-        roll = random.random()
+        roll = rng.loot.random()
         if roll < 0.01:
             return ItemRarity.LEGENDARY
         elif roll < 0.04:
@@ -201,7 +203,7 @@ class ItemService:
                 drops.append(item)
 
             # Chance for set piece on boss kills
-            if random.random() < DROP_SETTINGS["BOSS_SETTINGS"]["SET_PIECE_CHANCE"]:
+            if rng.loot.random() < DROP_SETTINGS["BOSS_SETTINGS"]["SET_PIECE_CHANCE"]:
                 set_piece = ItemService.generate_random_set_piece(
                     ItemService._get_rarity_with_boost(rarity_boost * 1.5)
                 )
@@ -209,7 +211,7 @@ class ItemService:
                     drops.append(set_piece)
 
         # Regular drop chance
-        elif random.random() < drop_chance:
+        elif rng.loot.random() < drop_chance:
             rarity = ItemService._get_rarity_with_boost(rarity_boost)
             item = ItemService.generate_random_item(rarity)
             drops.append(item)
@@ -219,7 +221,7 @@ class ItemService:
     @staticmethod
     def _get_rarity_with_boost(rarity_boost: float = 0.0) -> ItemRarity:
         """Get rarity with level-based boost"""
-        roll = random.random() + rarity_boost
+        roll = rng.loot.random() + rarity_boost
 
         for rarity, threshold in DROP_SETTINGS["RARITY_THRESHOLDS"].items():
             if roll >= threshold:
@@ -231,11 +233,11 @@ class ItemService:
     def _generate_base_stats(item_type: ItemType) -> Dict[str, int]:
         """Generate appropriate base stats for an item type"""
         if item_type == ItemType.WEAPON:
-            return {"attack": random.randint(3, 8)}
+            return {"attack": rng.loot.randint(3, 8)}
         elif item_type == ItemType.ARMOR:
             return {
-                "defense": random.randint(2, 6),
-                "max_health": random.randint(5, 15),
+                "defense": rng.loot.randint(2, 6),
+                "max_health": rng.loot.randint(5, 15),
             }
         elif item_type == ItemType.ACCESSORY:
             stat_choices = [
@@ -245,8 +247,8 @@ class ItemService:
                 "max_health",
                 "max_mana",
             ]
-            stat = random.choice(stat_choices)
-            return {stat: random.randint(2, 5)}
+            stat = rng.loot.choice(stat_choices)
+            return {stat: rng.loot.randint(2, 5)}
         return {}
 
     @staticmethod
@@ -282,7 +284,7 @@ class ItemService:
             return None
 
         # Choose a random set
-        chosen_set = random.choice(available_sets)
+        chosen_set = rng.loot.choice(available_sets)
 
         # Get first bonus stats as base stats for the piece
         base_stats = chosen_set.bonuses[0].stat_bonuses
@@ -312,3 +314,16 @@ class ItemService:
         all_items.extend(EPIC_ITEMS)
         all_items.extend(LEGENDARY_ITEMS)
         return all_items
+
+    @staticmethod
+    def get_catalog_index() -> Dict[Tuple[ItemType, ItemRarity], List[Item]]:
+        """Predefined items grouped by (item type, rarity), built once"""
+        return _build_catalog_index()
+
+
+@lru_cache(maxsize=1)
+def _build_catalog_index() -> Dict[Tuple[ItemType, ItemRarity], List[Item]]:
+    index: Dict[Tuple[ItemType, ItemRarity], List[Item]] = defaultdict(list)
+    for item in ItemService().get_all_items():
+        index[(item.item_type, item.rarity)].append(item)
+    return dict(index)
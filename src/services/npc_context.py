@@ -0,0 +1,179 @@
+"""Bounded prompt context for NPC free chat."""
+
+import contextvars
+import logging
+import threading
+from typing import Callable, List, Optional
+
+from src.config.settings import NPC_CHAT_SETTINGS
+from src.models.npc import NPC
+from src.services.ai_core import stream_content
+from src.services.ai_scheduler import Priority
+from src.services.prompts import CHAT_SYSTEM_PROMPT, Prompt, estimate_tokens, prompts
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+PROMPT_TOKENS = metrics.histogram(
+    "npc_prompt_tokens", "Estimated tokens in each NPC chat prompt"
+)
+CONTEXT_TRIMMED = metrics.counter(
+    "npc_context_trimmed_total", "Context entries dropped to fit the prompt budget"
+)
+SUMMARIES = metrics.counter("npc_summaries_total", "Conversation summaries by source")
+
+SUMMARY_PROMPT = prompts.register(
+    "npc.summary",
+    """Summarize a conversation between the player and {name} in a dark fantasy RPG.
+
+Summary so far:
+{summary}
+
+Messages since then:
+{messages}
+
+Write one short paragraph from {name}'s point of view that keeps names,
+promises, quests and anything the player revealed. Return ONLY the summary
+as plain text, at most {max_chars} characters.""",
+    rules=CHAT_SYSTEM_PROMPT,
+)
+
+
+class ConversationContext:
+    """What an NPC keeps of the current conversation, within a token budget.
+
+    The last ``RECENT_MESSAGES`` messages stay verbatim. Older ones are
+    folded into a running summary, regenerated in the background only once
+    ``SUMMARIZE_EVERY`` messages have aged out, so most turns cost no extra
+    request; until it lands the aged-out messages are used as they are.
+    ``build_prompt`` adds the NPC's memory, the summary and the recent
+    messages to a prompt, dropping the oldest material first when the
+    prompt would exceed ``PROMPT_TOKEN_BUDGET``.
+    """
+
+    def __init__(self, npc: NPC):
+        self.npc = npc
+        self.summary = ""
+        self.recent: List[str] = []
+        self._aged_out: List[str] = []
+        self._seen = 0
+        self._lock = threading.Lock()
+        self._summarizer: Optional[threading.Thread] = None
+
+    def sync(self, history: List[str]):
+        """Take in the messages appended to ``history`` since the last call"""
+        for message in history[self._seen :]:
+            self.add(message)
+        self._seen = len(history)
+
+    def add(self, message: str):
+        with self._lock:
+            self.recent.append(message)
+            overflow = len(self.recent) - NPC_CHAT_SETTINGS["RECENT_MESSAGES"]
+            if overflow > 0:
+                self._aged_out.extend(self.recent[:overflow])
+                del self.recent[:overflow]
+            due = len(self._aged_out) >= NPC_CHAT_SETTINGS["SUMMARIZE_EVERY"]
+        if due and not (self._summarizer and self._summarizer.is_alive()):
+            self._summarizer = threading.Thread(
+                target=contextvars.copy_context().run,
+                args=(self._summarize,),
+                name="npc-summary",
+                daemon=True,
+            )
+            self._summarizer.start()
+
+    def _summarize(self):
+        with self._lock:
+            previous = self.summary
+            messages = list(self._aged_out)
+        max_chars = NPC_CHAT_SETTINGS["SUMMARY_MAX_CHARS"]
+
+        prompt = SUMMARY_PROMPT.render(
+            name=self.npc.name,
+            summary=previous or "Nothing yet.",
+            messages="\n".join(messages),
+            max_chars=max_chars,
+        )
+        # Off-screen work: queue behind the reply the player is waiting for
+        summary = "".join(stream_content(prompt, priority=Priority.NORMAL)).strip()
+        source = "ai"
+        if not summary:
+            # Keep the most recent material rather than losing it
+            summary = " ".join([previous] + messages).strip()
+            source = "fallback"
+        if len(summary) > max_chars:
+            summary = "..." + summary[-max_chars:].split(" ", 1)[-1]
+
+        with self._lock:
+            self.summary = summary
+            del self._aged_out[: len(messages)]
+        SUMMARIES.inc(source=source)
+        logger.debug(
+            f"Summarized {len(messages)} messages with {self.npc.name} ({source})"
+        )
+
+    def render(self, budget: int) -> str:
+        """Context text for the prompt, at most ``budget`` tokens if possible"""
+        memory = self.npc.memory[-NPC_CHAT_SETTINGS["MEMORY_ITEMS"] :]
+        with self._lock:
+            summary = self.summary
+            older = list(self._aged_out)
+            recent = list(self.recent)
+
+        def compose() -> str:
+            parts = []
+            if memory:
+                notes = "\n".join(f"- {note}" for note in memory)
+                parts.append(f"What {self.npc.name} remembers of the player:\n{notes}")
+            earlier = [text for text in [summary] + older if text]
+            if earlier:
+                parts.append("Earlier in this conversation:\n" + "\n".join(earlier))
+            history = "\n".join(recent) if recent else "No previous conversation."
+            parts.append(f"Recent Conversation:\n{history}")
+            return "\n\n".join(parts)
+
+        text = compose()
+        while estimate_tokens(text) > budget:
+            # Oldest and least specific material goes first
+            if memory:
+                memory = memory[1:]
+                CONTEXT_TRIMMED.inc(section="memory")
+            elif older:
+                older.pop(0)
+                CONTEXT_TRIMMED.inc(section="unsummarized")
+            elif summary:
+                summary = ""
+                CONTEXT_TRIMMED.inc(section="summary")
+            elif len(recent) > 1:
+                recent.pop(0)
+                CONTEXT_TRIMMED.inc(section="recent")
+            else:
+                break
+            text = compose()
+        return text
+
+    def build_prompt(self, prompt_for: Callable[[str], Prompt]) -> Prompt:
+        """Fill ``prompt_for(context_text)`` with as much context as fits"""
+        fixed = prompt_for("").tokens
+        prompt = prompt_for(
+            self.render(NPC_CHAT_SETTINGS["PROMPT_TOKEN_BUDGET"] - fixed)
+        )
+        tokens = prompt.tokens
+        PROMPT_TOKENS.observe(tokens)
+        logger.debug(f"NPC chat prompt for {self.npc.name}: ~{tokens} tokens")
+        return prompt
+
+    def remember(self):
+        """Leave a short note about this conversation in ``NPC.memory``"""
+        summarizer = self._summarizer
+        if summarizer and summarizer.is_alive():
+            # A summary that lands after the note is written would be lost
+            summarizer.join(NPC_CHAT_SETTINGS["SUMMARY_WAIT"])
+        with self._lock:
+            note = self.summary
+            if not note:
+                said = [m[len("You: ") :] for m in self.recent if m.startswith("You: ")]
+                note = f"The player said: {'; '.join(said)}" if said else ""
+        if note:
+            self.npc.add_to_memory(note[: NPC_CHAT_SETTINGS["SUMMARY_MAX_CHARS"]])
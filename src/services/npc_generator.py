@@ -1,36 +1,170 @@
-import json
 import logging
-import random
-from typing import Optional, Dict, List, Any
+from src.utils.rng import rng
+from typing import Iterator, List, Optional
 import uuid
 
 from src.models.npc import NPC, NPCDialogue, NPCQuest
-from src.services.ai_core import generate_content
+from src.services.ai_core import generate_content, stream_content
+from src.services.ai_schemas import (
+    DialogueData,
+    NPCData,
+    NPCDialogues,
+    NPCQuests,
+    QuestData,
+)
+from src.services.ai_scheduler import Priority
+from src.services.prompts import CHAT_SYSTEM_PROMPT, Prompt, prompts
+from src.services.npc_context import ConversationContext
 from src.services.art_generator import generate_ascii_portrait
+from src.utils.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
-# Define world lore for context in AI prompts
-WORLD_LORE = """
-The world is corrupted by the twisted influence of the God of Hope. Once a benevolent deity, the God of Hope has undergone a perversion of its nature, bringing a corrupted form of hope that drives mortals to madness and despair.
-
-Key aspects of the world:
-1. The God of Hope's presence twists all it touches, corrupting beings with a perverted form of hope
-2. Many former holy sites and followers are now twisted by this corruption
-3. Some resist the corruption, hiding in shadows and searching for ways to cleanse the realm
-4. Ancient beings have awakened due to the corruption's spread
-5. The world is in a state of decay, with pockets of resistance fighting against the God of Hope's influence
-6. Those who embrace the corrupted hope gain power but lose their sanity and humanity
-7. Ruins of once-great civilizations dot the landscape, now haunted by corrupted entities
-8. Strange phenomena occur where reality itself seems to bend to the corrupted hope's influence
-9. The concept of true hope has been tainted, making genuine optimism rare and precious
-"""
+NPC_DATA_PROMPT = prompts.register(
+    "npc.data",
+    """Generate a unique NPC for a dark fantasy game where the world is corrupted by the God of Hope.
+
+Player Level: {player_level}
+NPC Faction: {faction}
+
+Use the world context you were given.
+
+Return JSON with:
+{{
+  "name": "NPC name",
+  "description": "Physical description (1-2 sentences)",
+  "lore": "NPC backstory (2-3 sentences)",
+  "faction": "{faction}",
+  "level": "NPC level (number close to player level)",
+  "greeting": "NPC's first greeting to player (1 sentence)"
+}}
+
+Make the NPC appropriate for the faction:
+- Corrupted: Influenced by the God of Hope, showing signs of corruption
+- Resistance: Fighting against the God of Hope's influence
+- Neutral: Trying to survive in this broken world
+- Transformed: Changed by corruption but not entirely lost
+
+IMPORTANT: The description, lore, and greeting should reflect the NPC's perspective on this corrupted world.""",
+    lore=True,
+)
+
+
+NPC_DIALOGUE_PROMPT = prompts.register(
+    "npc.dialogues",
+    """Create dialogue options for an NPC named {npc_name} in a dark fantasy world corrupted by the God of Hope.
+
+NPC Background:
+{npc_lore}
+
+Use the world context you were given.
+
+Generate 3 unique dialogue paths that the player might discuss with this NPC. Each should have 3 player response options.
+
+Return a JSON object with a "dialogues" array:
+{{
+  "dialogues": [
+    {{
+      "text": "What the NPC says",
+      "responses": [
+        {{
+          "text": "Player response option 1",
+          "action": "describe what happens (information gained, etc.)",
+          "relationship_change": number from -10 to +10
+        }},
+        {{
+          "text": "Player response option 2",
+          "action": "describe what happens",
+          "relationship_change": number from -10 to +10
+        }},
+        {{
+          "text": "Player response option 3",
+          "action": "describe what happens",
+          "relationship_change": number from -10 to +10
+        }}
+      ]
+    }},
+    ... (2 more dialogue objects)
+  ]
+}}
+
+Make dialogues thematically consistent with the dark fantasy setting and the NPC's background.""",
+    lore=True,
+)
+
+
+NPC_QUEST_PROMPT = prompts.register(
+    "npc.quests",
+    """Create 1-2 quests that NPC {npc_name} can offer the player in a dark fantasy world corrupted by the God of Hope.
+
+NPC Background:
+{npc_lore}
+
+Player Level: {player_level}
+
+Use the world context you were given.
+
+Return a JSON object with a "quests" array:
+{{
+  "quests": [
+    {{
+      "name": "Quest name",
+      "description": "What the quest is about (1-2 sentences)",
+      "objective": "What the player must do to complete it",
+      "dialogue": "How the NPC asks the player to do this quest",
+      "reward_gold": number (appropriate for player level),
+      "reward_exp": number (appropriate for player level),
+      "required_progress": number (how many things to collect/defeat),
+      "min_level": number (minimum player level, close to current)
+    }},
+    ... (optional second quest)
+  ]
+}}
+
+The quests should:
+1. Make sense for this NPC to offer based on their background
+2. Fit the dark, corrupted theme of the world
+3. Have reasonable rewards for the player's level
+4. Include activities like gathering corrupted items, defeating enemies, finding lost individuals, etc.""",
+    lore=True,
+)
+
+
+NPC_RESPONSE_PROMPT = prompts.register(
+    "npc.response",
+    """Generate a response from NPC {name} to the player's input in a dark fantasy RPG.
+
+NPC Information:
+Name: {name}
+Description: {description}
+Background: {lore}
+Faction: {faction}
+Relationship with player: {relationship}
+
+Use the world context you were given.
+
+{context_text}
+
+Player's Input: "{player_input}"
+
+Generate a single in-character response from {name} that:
+1. Maintains the NPC's personality and speaking style
+2. Acknowledges the player's input
+3. Fits the dark fantasy setting
+4. Reflects the NPC's faction and background
+5. Keeps dialogue concise (1-3 sentences)
+
+Return ONLY the NPC's dialogue response as plain text with no markup or quotation marks.""",
+    rules=CHAT_SYSTEM_PROMPT,
+    lore=True,
+)
 
 
 class NPCGenerator:
     """Handles generation of NPCs with AI assistance"""
 
     @staticmethod
+    @tracer.traced("npc.generate_npc")
     def generate_npc(player_level: int, faction: str = None) -> Optional[NPC]:
         """Generate a complete NPC with AI assistance"""
         try:
@@ -43,18 +177,18 @@ class NPCGenerator:
             # Create NPC instance
             npc = NPC(
                 id=str(uuid.uuid4()),
-                name=npc_data.get("name", "Unknown"),
-                description=npc_data.get("description", ""),
-                lore=npc_data.get("lore", ""),
-                faction=npc_data.get("faction", "Neutral"),
-                level=npc_data.get("level", player_level),
+                name=npc_data.name,
+                description=npc_data.description,
+                lore=npc_data.lore,
+                faction=npc_data.faction,
+                level=npc_data.level or player_level,
             )
 
             # Generate ASCII art for the NPC
             npc.ascii_art = NPCGenerator._generate_npc_art(npc.name, npc.description)
 
             # Generate default greeting
-            npc.default_greeting = npc_data.get("greeting", "Hello there, traveler.")
+            npc.default_greeting = npc_data.greeting
 
             # Generate dialogues
             dialogues_data = NPCGenerator._generate_npc_dialogues(npc.name, npc.lore)
@@ -62,23 +196,21 @@ class NPCGenerator:
                 for dialogue_data in dialogues_data:
                     dialogue = NPCDialogue(
                         id=str(uuid.uuid4()),
-                        text=dialogue_data.get("text", ""),
+                        text=dialogue_data.text,
                         responses=[
                             {
-                                "text": response.get("text", ""),
+                                "text": response.text,
                                 "next_dialogue": None,
-                                "action": response.get("action", ""),
-                                "relationship_change": response.get(
-                                    "relationship_change", 0
-                                ),
+                                "action": response.action,
+                                "relationship_change": response.relationship_change,
                             }
-                            for response in dialogue_data.get("responses", [])
+                            for response in dialogue_data.responses
                         ],
                     )
                     npc.dialogues.append(dialogue)
 
             # Generate quests if appropriate for the NPC
-            if random.random() < 0.7:  # 70% chance for NPC to have quests
+            if rng.encounter.random() < 0.7:  # 70% chance for NPC to have quests
                 quests_data = NPCGenerator._generate_npc_quests(
                     npc.name, npc.lore, player_level
                 )
@@ -86,18 +218,24 @@ class NPCGenerator:
                     for quest_data in quests_data:
                         quest = NPCQuest(
                             id=str(uuid.uuid4()),
-                            name=quest_data.get("name", "Unknown Quest"),
-                            description=quest_data.get("description", ""),
-                            objective=quest_data.get("objective", ""),
-                            reward_gold=quest_data.get(
-                                "reward_gold", random.randint(10, 50) * player_level
+                            name=quest_data.name or "Unknown Quest",
+                            description=quest_data.description,
+                            objective=quest_data.objective,
+                            reward_gold=(
+                                quest_data.reward_gold
+                                if quest_data.reward_gold is not None
+                                else rng.encounter.randint(10, 50) * player_level
                             ),
-                            reward_exp=quest_data.get(
-                                "reward_exp", random.randint(20, 100) * player_level
+                            reward_exp=(
+                                quest_data.reward_exp
+                                if quest_data.reward_exp is not None
+                                else rng.encounter.randint(20, 100) * player_level
                             ),
-                            required_progress=quest_data.get("required_progress", 1),
-                            available_at_level=quest_data.get(
-                                "min_level", player_level
+                            required_progress=quest_data.required_progress,
+                            available_at_level=(
+                                quest_data.min_level
+                                if quest_data.min_level is not None
+                                else player_level
                             ),
                         )
                         npc.quests.append(quest)
@@ -105,10 +243,8 @@ class NPCGenerator:
                         # Create quest dialogue
                         quest_dialogue = NPCDialogue(
                             id=str(uuid.uuid4()),
-                            text=quest_data.get(
-                                "dialogue",
-                                f"I need help with something: {quest.description}",
-                            ),
+                            text=quest_data.dialogue
+                            or f"I need help with something: {quest.description}",
                             responses=[
                                 {
                                     "text": "I'll help you with this task.",
@@ -134,60 +270,20 @@ class NPCGenerator:
             return None
 
     @staticmethod
-    def _generate_npc_data(
-        player_level: int, faction: str = None
-    ) -> Optional[Dict[str, Any]]:
+    @tracer.traced("npc.generate_npc_data")
+    def _generate_npc_data(player_level: int, faction: str = None) -> Optional[NPCData]:
         """Generate basic NPC data using AI"""
         factions = ["Corrupted", "Resistance", "Neutral", "Transformed"]
         if not faction:
-            faction = random.choice(factions)
-
-        prompt = f"""Generate a unique NPC for a dark fantasy game where the world is corrupted by the God of Hope.
-
-Player Level: {player_level}
-NPC Faction: {faction}
+            faction = rng.encounter.choice(factions)
 
-World Context:
-{WORLD_LORE}
+        prompt = NPC_DATA_PROMPT.render(player_level=player_level, faction=faction)
 
-Return JSON with:
-{{
-  "name": "NPC name",
-  "description": "Physical description (1-2 sentences)",
-  "lore": "NPC backstory (2-3 sentences)",
-  "faction": "{faction}",
-  "level": "NPC level (number close to player level)",
-  "greeting": "NPC's first greeting to player (1 sentence)"
-}}
-
-Make the NPC appropriate for the faction:
-- Corrupted: Influenced by the God of Hope, showing signs of corruption
-- Resistance: Fighting against the God of Hope's influence
-- Neutral: Trying to survive in this broken world
-- Transformed: Changed by corruption but not entirely lost
-
-IMPORTANT: The description, lore, and greeting should reflect the NPC's perspective on this corrupted world."""
-
-        content = generate_content(prompt)
-        if not content:
-            return None
-
-        try:
-            data = json.loads(content)
-
-            # Ensure level is an integer
-            if "level" in data and not isinstance(data["level"], int):
-                try:
-                    data["level"] = int(data["level"])
-                except ValueError:
-                    data["level"] = player_level
-
-            return data
-        except Exception as e:
-            logger.error(f"Error parsing NPC data: {str(e)}")
-            return None
+        # The schema coerces "level" to an integer
+        return generate_content(prompt, schema=NPCData)
 
     @staticmethod
+    @tracer.traced("npc.generate_npc_art")
     def _generate_npc_art(name: str, description: str) -> str:
         """Generate detailed ASCII art for the NPC"""
         try:
@@ -217,145 +313,60 @@ IMPORTANT: The description, lore, and greeting should reflect the NPC's perspect
 """
 
     @staticmethod
+    @tracer.traced("npc.generate_npc_dialogues")
     def _generate_npc_dialogues(
         npc_name: str, npc_lore: str
-    ) -> Optional[List[Dict[str, Any]]]:
+    ) -> Optional[List[DialogueData]]:
         """Generate dialogue options for the NPC"""
-        prompt = f"""Create dialogue options for an NPC named {npc_name} in a dark fantasy world corrupted by the God of Hope.
-
-NPC Background:
-{npc_lore}
+        prompt = NPC_DIALOGUE_PROMPT.render(npc_name=npc_name, npc_lore=npc_lore)
 
-World Context:
-{WORLD_LORE}
-
-Generate 3 unique dialogue paths that the player might discuss with this NPC. Each should have 3 player response options.
-
-Return a JSON array with:
-[
-  {{
-    "text": "What the NPC says",
-    "responses": [
-      {{
-        "text": "Player response option 1",
-        "action": "describe what happens (information gained, etc.)",
-        "relationship_change": number from -10 to +10
-      }},
-      {{
-        "text": "Player response option 2",
-        "action": "describe what happens",
-        "relationship_change": number from -10 to +10
-      }},
-      {{
-        "text": "Player response option 3",
-        "action": "describe what happens",
-        "relationship_change": number from -10 to +10
-      }}
-    ]
-  }},
-  ... (2 more dialogue objects)
-]
-
-Make dialogues thematically consistent with the dark fantasy setting and the NPC's background."""
-
-        content = generate_content(prompt)
-        if not content:
-            return None
-
-        try:
-            data = json.loads(content)
-            return data
-        except Exception as e:
-            logger.error(f"Error parsing NPC dialogues: {str(e)}")
-            return None
+        data = generate_content(prompt, schema=NPCDialogues)
+        return data.dialogues if data else None
 
     @staticmethod
+    @tracer.traced("npc.generate_npc_quests")
     def _generate_npc_quests(
         npc_name: str, npc_lore: str, player_level: int
-    ) -> Optional[List[Dict[str, Any]]]:
+    ) -> Optional[List[QuestData]]:
         """Generate quests that the NPC can offer"""
-        prompt = f"""Create 1-2 quests that NPC {npc_name} can offer the player in a dark fantasy world corrupted by the God of Hope.
-
-NPC Background:
-{npc_lore}
-
-Player Level: {player_level}
-
-World Context:
-{WORLD_LORE}
-
-Return a JSON array with:
-[
-  {{
-    "name": "Quest name",
-    "description": "What the quest is about (1-2 sentences)",
-    "objective": "What the player must do to complete it",
-    "dialogue": "How the NPC asks the player to do this quest",
-    "reward_gold": number (appropriate for player level),
-    "reward_exp": number (appropriate for player level),
-    "required_progress": number (how many things to collect/defeat),
-    "min_level": number (minimum player level, close to current)
-  }},
-  ... (optional second quest)
-]
-
-The quests should:
-1. Make sense for this NPC to offer based on their background
-2. Fit the dark, corrupted theme of the world
-3. Have reasonable rewards for the player's level
-4. Include activities like gathering corrupted items, defeating enemies, finding lost individuals, etc."""
+        prompt = NPC_QUEST_PROMPT.render(
+            npc_name=npc_name, npc_lore=npc_lore, player_level=player_level
+        )
 
-        content = generate_content(prompt)
-        if not content:
-            return None
-
-        try:
-            data = json.loads(content)
-            return data
-        except Exception as e:
-            logger.error(f"Error parsing NPC quests: {str(e)}")
-            return None
+        data = generate_content(prompt, schema=NPCQuests)
+        return data.quests if data else None
 
     @staticmethod
-    def generate_npc_response(
-        npc: NPC, player_input: str, conversation_history: List[str]
-    ) -> str:
-        """Generate a dynamic response from the NPC to player input"""
-        # Format conversation history
-        history_text = (
-            "\n".join(conversation_history[-5:])
-            if conversation_history
-            else "No previous conversation."
+    def _npc_response_prompt(npc: NPC, player_input: str, context_text: str) -> Prompt:
+        return NPC_RESPONSE_PROMPT.render(
+            name=npc.name,
+            description=npc.description,
+            lore=npc.lore,
+            faction=npc.faction,
+            relationship=(
+                "Positive"
+                if npc.relationship > 20
+                else "Negative" if npc.relationship < -20 else "Neutral"
+            ),
+            context_text=context_text,
+            player_input=player_input,
         )
 
-        prompt = f"""Generate a response from NPC {npc.name} to the player's input in a dark fantasy RPG.
-
-NPC Information:
-Name: {npc.name}
-Description: {npc.description}
-Background: {npc.lore}
-Faction: {npc.faction}
-Relationship with player: {"Positive" if npc.relationship > 20 else "Negative" if npc.relationship < -20 else "Neutral"}
-
-World Context:
-{WORLD_LORE}
-
-Recent Conversation:
-{history_text}
-
-Player's Input: "{player_input}"
-
-Generate a single in-character response from {npc.name} that:
-1. Maintains the NPC's personality and speaking style
-2. Acknowledges the player's input
-3. Fits the dark fantasy setting
-4. Reflects the NPC's faction and background
-5. Keeps dialogue concise (1-3 sentences)
-
-Return ONLY the NPC's dialogue response as plain text with no markup or quotation marks."""
-
-        content = generate_content(prompt)
-        if not content:
-            return f"{npc.name} stares at you silently."
+    @staticmethod
+    def stream_npc_response(
+        npc: NPC, player_input: str, context: ConversationContext
+    ) -> Iterator[str]:
+        """Stream the NPC's reply to player input as the text arrives.
+
+        Yields nothing if generation fails; see ``fallback_npc_response``.
+        """
+        prompt = context.build_prompt(
+            lambda context_text: NPCGenerator._npc_response_prompt(
+                npc, player_input, context_text
+            )
+        )
+        yield from stream_content(prompt, priority=Priority.INTERACTIVE)
 
-        return content.strip("\"')")
+    @staticmethod
+    def fallback_npc_response(npc: NPC) -> str:
+        return f"{npc.name} stares at you silently."
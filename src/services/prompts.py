@@ -0,0 +1,206 @@
+"""Prompt templates compiled once, with a shared lore prefix.
+
+Templates that draw on the game's lore (``lore=True``: art and NPCs) send
+it as one identical system prefix followed by the output rules, which
+providers that cache prompt prefixes can reuse across requests. The rest,
+including the frequent enemy and encounter prompts, send only the rules.
+Templates are parsed once at registration; rendering just joins the
+precompiled pieces with the call's values.
+"""
+
+from dataclasses import dataclass
+from string import Formatter
+from typing import Any, Dict, List, Optional, Union
+
+SYSTEM_PROMPT = (
+    "You are a dark fantasy RPG content generator that MUST return ONLY valid JSON.\n"
+    "Rules:\n"
+    "1. Return ONLY the JSON object, no other text\n"
+    '2. Use ONLY double quotes (") for ALL properties and values\n'
+    "3. NO special characters in property names or values\n"
+    "4. ALL numbers must be single integers (no ranges, no decimals, no quotes)\n"
+    "5. When given a range, pick ONE number within that range\n"
+    "6. NO trailing commas\n"
+    "7. NO comments or explanations\n"
+    "8. NO additional properties beyond the template\n"
+    "9. NO formatting symbols (%$, etc)\n"
+    "10. Property names must match EXACTLY as shown\n"
+    "11. Follow the EXACT structure of the template"
+)
+
+# Streamed chat replies are shown to the player as they arrive, so no JSON
+CHAT_SYSTEM_PROMPT = (
+    "You are a character in a dark fantasy RPG. Reply in character with "
+    "plain text only: no JSON, markup, stage directions or quotation marks."
+)
+
+LORE = {
+    "world": """In an age where hope became poison, darkness emerged as salvation.
+    The God of Hope's invasion brought not comfort, but corruption - a twisted force
+    that warps reality with false promises and maddening light. Those touched by
+    this 'Curse of Hope' become enslaved to eternal, desperate optimism, their minds
+    fractured by visions of impossible futures. The curse manifests physically,
+    marking its victims with radiant cracks in their flesh that leak golden light.
+
+    Only those who embrace shadow, who shield their eyes from hope's blinding rays,
+    maintain their sanity. They are the last bastion against the spreading taint,
+    warriors who understand that in this fallen realm, true salvation lies in the
+    comforting embrace of darkness.""",
+    "class": """Champions who've learned to weaponize shadow itself, these warriors
+    bear dark sigils that protect them from hope's corruption. Each class represents
+    a different approach to surviving in a world where optimism kills and despair
+    shields. Their powers draw from the void between false hopes, turning the
+    absence of light into a force of preservation.""",
+    "enemy": """Victims of the Curse of Hope, these beings are twisted parodies of
+    their former selves. Holy knights whose zealous hope turned to madness, common
+    folk whose desperate wishes mutated them, and ancient guardians whose protective
+    nature was perverted by the God of Hope's touch. They radiate a sickly golden
+    light from their wounds, and their mouths eternally smile even as they destroy
+    all they once loved.""",
+    "item": """Artifacts of power in this darkened realm take two forms: those
+    corrupted by the God of Hope's touch, glowing with insidious golden light and
+    whispering false promises; and those forged in pure darkness, their surfaces
+    drinking in light itself. The corrupted items offer tremendous power at the cost
+    of slowly succumbing to hope's curse, while shadow-forged gear helps resist the
+    spreading taint.""",
+}
+
+WORLD_LORE = """
+The world is corrupted by the twisted influence of the God of Hope. Once a benevolent deity, the God of Hope has undergone a perversion of its nature, bringing a corrupted form of hope that drives mortals to madness and despair.
+
+Key aspects of the world:
+1. The God of Hope's presence twists all it touches, corrupting beings with a perverted form of hope
+2. Many former holy sites and followers are now twisted by this corruption
+3. Some resist the corruption, hiding in shadows and searching for ways to cleanse the realm
+4. Ancient beings have awakened due to the corruption's spread
+5. The world is in a state of decay, with pockets of resistance fighting against the God of Hope's influence
+6. Those who embrace the corrupted hope gain power but lose their sanity and humanity
+7. Ruins of once-great civilizations dot the landscape, now haunted by corrupted entities
+8. Strange phenomena occur where reality itself seems to bend to the corrupted hope's influence
+9. The concept of true hope has been tainted, making genuine optimism rare and precious
+"""
+
+# Identical for every lore template, and first, so it forms the cacheable prefix
+SHARED_LORE = f"""Game lore, for reference in every request:
+
+World Lore: {LORE['world']}
+
+World Context:
+{WORLD_LORE.strip()}
+
+Class Lore: {LORE['class']}
+
+Enemy Lore: {LORE['enemy']}
+
+Item Lore: {LORE['item']}"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count: about four characters per token for English"""
+    return len(text) // 4
+
+
+@dataclass(frozen=True)
+class Prompt:
+    """A rendered prompt: the shared system prefix plus the per-call body"""
+
+    template: str
+    system: str
+    user: str
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.system) + estimate_tokens(self.user)
+
+    def __str__(self) -> str:
+        return self.user
+
+
+class PromptTemplate:
+    """A ``str.format``-style body parsed once into literal pieces.
+
+    ``static`` values (constants such as the art palette) are baked in at
+    compile time; the remaining fields must be passed to ``render``.
+    Field names must be plain identifiers, without format specs. ``lore``
+    puts ``SHARED_LORE`` ahead of the rules in the system message.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        body: str,
+        rules: str = SYSTEM_PROMPT,
+        static: Optional[Dict[str, Any]] = None,
+        lore: bool = False,
+    ):
+        self.name = name
+        self.system = f"{SHARED_LORE}\n\n{rules}" if lore else rules
+        self._literals: List[str] = []
+        self.fields: List[str] = []
+
+        static = static or {}
+        pending = []
+        for literal, field, spec, conversion in Formatter().parse(body):
+            pending.append(literal)
+            if field is None:
+                continue
+            if not field.isidentifier() or spec or conversion:
+                raise ValueError(f"Unsupported field {{{field}}} in prompt {name}")
+            if field in static:
+                pending.append(str(static[field]))
+            else:
+                self._literals.append("".join(pending))
+                self.fields.append(field)
+                pending = []
+        self._literals.append("".join(pending))
+        self._required = frozenset(self.fields)
+
+    def render(self, **values: Any) -> Prompt:
+        missing = self._required - values.keys()
+        if missing:
+            raise KeyError(f"Prompt {self.name} missing {', '.join(sorted(missing))}")
+        parts = [self._literals[0]]
+        for field, literal in zip(self.fields, self._literals[1:]):
+            parts.append(str(values[field]))
+            parts.append(literal)
+        return Prompt(self.name, self.system, "".join(parts))
+
+
+class PromptRegistry:
+    """All prompt templates by name"""
+
+    def __init__(self):
+        self._templates: Dict[str, PromptTemplate] = {}
+
+    def register(
+        self,
+        name: str,
+        body: str,
+        rules: str = SYSTEM_PROMPT,
+        static: Optional[Dict[str, Any]] = None,
+        lore: bool = False,
+    ) -> PromptTemplate:
+        if name in self._templates:
+            raise ValueError(f"Prompt template {name} is already registered")
+        template = PromptTemplate(name, body, rules, static, lore)
+        self._templates[name] = template
+        return template
+
+    def get(self, name: str) -> PromptTemplate:
+        return self._templates[name]
+
+    def render(self, name: str, **values: Any) -> Prompt:
+        return self._templates[name].render(**values)
+
+    def names(self) -> List[str]:
+        return sorted(self._templates)
+
+
+prompts = PromptRegistry()
+
+
+def as_prompt(prompt: Union[str, Prompt], rules: str = SYSTEM_PROMPT) -> Prompt:
+    """Wrap an untemplated prompt string; templated prompts pass through"""
+    if isinstance(prompt, Prompt):
+        return prompt
+    return Prompt("adhoc", rules, prompt)
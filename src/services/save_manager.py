@@ -1,12 +1,14 @@
 import logging
-import time
 from typing import Dict, List, Optional, Any, Tuple
 
 from src.config.database import init_database
+from src.display.base.base_view import BaseView
 from src.display.common.message_view import MessageView
 from src.display.save.save_view import SaveView
 from src.models.character import Player
 from src.services.character_storage import CharacterStorageService
+from src.services.startup import startup
+from src.utils.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
@@ -44,11 +46,18 @@ class SaveManager:
             return False
 
     @staticmethod
+    def is_available() -> bool:
+        """Whether saves work, waiting for a background initialize() first"""
+        startup.wait("database")
+        return SaveManager.save_system_available
+
+    @staticmethod
+    @tracer.traced("save.autosave")
     def handle_autosave(player: Player, slot_number: int) -> bool:
         """Quietly save the game without user interaction"""
         try:
             # Check if save system is available
-            if not SaveManager.save_system_available:
+            if not SaveManager.is_available():
                 return False
 
             # Get save slots to check if the slot exists
@@ -84,9 +93,9 @@ class SaveManager:
         """
         try:
             # Check if save system is available
-            if not SaveManager.save_system_available:
+            if not SaveManager.is_available():
                 MessageView.show_error("Save system is not available.")
-                time.sleep(1.5)
+                BaseView.pause("MESSAGE")
                 return False, None
 
             # Get available save slots
@@ -95,7 +104,7 @@ class SaveManager:
                 MessageView.show_error(
                     "Could not connect to the database. Save functionality is unavailable."
                 )
-                time.sleep(1.5)
+                BaseView.pause("MESSAGE")
                 return False, None
 
             while True:
@@ -103,7 +112,7 @@ class SaveManager:
                 SaveView.show_save_menu(player, save_slots)
 
                 try:
-                    choice = int(input().strip())
+                    choice = int(BaseView.get_input().strip())
 
                     if choice == 0:  # Back
                         return False, None
@@ -129,11 +138,11 @@ class SaveManager:
                         # Save the character
                         if CharacterStorageService.save_character(player, choice):
                             SaveView.show_success()
-                            time.sleep(1.5)
+                            BaseView.pause("MESSAGE")
                             return True, choice
                         else:
                             SaveView.show_save_error()
-                            time.sleep(1.5)
+                            BaseView.pause("MESSAGE")
                             return False, None
                     else:
                         MessageView.show_error(
@@ -146,7 +155,7 @@ class SaveManager:
         except Exception as e:
             logger.error(f"Error in save game flow: {str(e)}")
             SaveView.show_save_error()
-            time.sleep(1.5)
+            BaseView.pause("MESSAGE")
             return False, None
 
     @staticmethod
@@ -158,9 +167,9 @@ class SaveManager:
         """
         try:
             # Check if save system is available
-            if not SaveManager.save_system_available:
+            if not SaveManager.is_available():
                 MessageView.show_error("Save system is not available.")
-                time.sleep(1.5)
+                BaseView.pause("MESSAGE")
                 return None, None
 
             # Get available save slots
@@ -169,7 +178,7 @@ class SaveManager:
                 MessageView.show_error(
                     "Could not connect to the database. Load functionality is unavailable."
                 )
-                time.sleep(1.5)
+                BaseView.pause("MESSAGE")
                 return None, None
 
             while True:
@@ -177,7 +186,7 @@ class SaveManager:
                 SaveView.show_load_menu(save_slots)
 
                 try:
-                    choice = int(input().strip())
+                    choice = int(BaseView.get_input().strip())
 
                     if choice == 0:  # Back
                         return None, None
@@ -194,18 +203,18 @@ class SaveManager:
 
                         if not has_character:
                             MessageView.show_error("No saved character in this slot")
-                            time.sleep(1.5)
+                            BaseView.pause("MESSAGE")
                             continue
 
                         # Load the character
                         player = CharacterStorageService.load_character(choice)
                         if player:
                             MessageView.show_success(f"Welcome back, {player.name}!")
-                            time.sleep(1.5)
+                            BaseView.pause("MESSAGE")
                             return player, choice
                         else:
                             SaveView.show_load_error()
-                            time.sleep(1.5)
+                            BaseView.pause("MESSAGE")
                             continue
                     else:
                         MessageView.show_error(
@@ -218,7 +227,7 @@ class SaveManager:
         except Exception as e:
             logger.error(f"Error in load game flow: {str(e)}")
             SaveView.show_load_error()
-            time.sleep(1.5)
+            BaseView.pause("MESSAGE")
             return None, None
 
     @staticmethod
@@ -226,9 +235,9 @@ class SaveManager:
         """Handle delete save flow"""
         try:
             # Check if save system is available
-            if not SaveManager.save_system_available:
+            if not SaveManager.is_available():
                 MessageView.show_error("Save system is not available.")
-                time.sleep(1.5)
+                BaseView.pause("MESSAGE")
                 return False
 
             if not (1 <= slot_number <= 5):
@@ -239,7 +248,7 @@ class SaveManager:
             save_slots = CharacterStorageService.get_save_slots()
             if save_slots is None:
                 MessageView.show_error("Could not connect to the database.")
-                time.sleep(1.5)
+                BaseView.pause("MESSAGE")
                 return False
 
             slot_info = None
@@ -282,17 +291,17 @@ class SaveManager:
                 SaveView.show_start_menu()
 
                 try:
-                    choice = int(input().strip())
+                    choice = int(BaseView.get_input().strip())
 
                     if choice == 1:  # New Game
                         return (True, None, None)
 
                     elif choice == 2:  # Load Game
-                        if not SaveManager.save_system_available:
+                        if not SaveManager.is_available():
                             MessageView.show_error(
                                 "Save system is not available. Cannot load games."
                             )
-                            time.sleep(2)
+                            BaseView.pause("RESULT")
                             continue
 
                         player, slot = SaveManager.handle_load_game()
@@ -6,7 +6,9 @@ from src.models.items.base import Item, ItemType, ItemRarity
 from src.models.character import Player
 from src.display.common.message_view import MessageView
 from ..services.item import ItemService
-import random
+from src.utils.metrics import metrics
+from src.utils.tracing import tracer
+from src.utils.rng import rng
 from dataclasses import dataclass
 from typing import List
 
@@ -87,7 +89,7 @@ class Shop:
         self.sell_multiplier = SHOP_SETTINGS["SELL_MULTIPLIER"]
 
     def _random_shop_type(self) -> ShopType:
-        roll = random.random()
+        roll = rng.shop.random()
         cumulative = 0
         for shop_type, weight in SHOP_SETTINGS["SHOP_TYPE_WEIGHTS"].items():
             cumulative += weight
@@ -96,10 +98,11 @@ class Shop:
         return ShopType.GENERAL
 
     def _check_for_event(self) -> Optional[ShopEvent]:
-        if random.random() < SHOP_SETTINGS["SPECIAL_EVENT_CHANCE"]:
-            return random.choice(SHOP_EVENTS)
+        if rng.shop.random() < SHOP_SETTINGS["SPECIAL_EVENT_CHANCE"]:
+            return rng.shop.choice(SHOP_EVENTS)
         return None
 
+    @metrics.timed("shop_inventory_seconds", "Shop inventory generation latency")
     def generate_shop_inventory(self, post_combat: bool = False) -> List[ShopItem]:
         """Generate shop inventory based on shop type and events"""
         self.current_event = self._check_for_event()
@@ -142,7 +145,7 @@ class Shop:
                 "set_piece_chance"
             ]
 
-        if random.random() < set_chance:
+        if rng.shop.random() < set_chance:
             set_piece = self.item_service.generate_random_set_piece(
                 self._weighted_rarity_selection()
             )
@@ -155,8 +158,7 @@ class Shop:
         """Generate an item appropriate for the shop type"""
         rarity = self._weighted_rarity_selection()
 
-        # Get all available items from ItemService
-        all_items = self.item_service.get_all_items()
+        catalog = self.item_service.get_catalog_index()
 
         # Filter items based on shop type
         if self.shop_type == ShopType.BLACKSMITH:
@@ -168,20 +170,20 @@ class Shop:
         else:  # GENERAL
             valid_types = list(ItemType)
 
-        # Filter items by type and rarity
+        # Look up items by type and rarity
         suitable_items = [
             item
-            for item in all_items
-            if item.item_type in valid_types and item.rarity == rarity
+            for item_type in valid_types
+            for item in catalog.get((item_type, rarity), [])
         ]
 
         if not suitable_items:
             # Fallback to generate a random item if no suitable items found
             return self.item_service.generate_random_item(
-                rarity, random.choice(valid_types)
+                rarity, rng.shop.choice(valid_types)
             )
 
-        return random.choice(suitable_items)
+        return rng.shop.choice(suitable_items)
 
     def get_item_price(self, item: Item) -> int:
         """Calculate item price considering shop type and events"""
@@ -199,6 +201,7 @@ class Shop:
 
         return max(1, int(base_price))
 
+    @tracer.traced("shop.post_combat_refresh")
     def post_combat_refresh(self):
         """Refresh shop inventory after combat"""
         self.inventory = self.generate_shop_inventory(post_combat=True)
@@ -256,7 +259,7 @@ class Shop:
 
     def _weighted_rarity_selection(self) -> ItemRarity:
         """Select rarity based on weights"""
-        roll = random.random()
+        roll = rng.shop.random()
         cumulative = 0
         for rarity, weight in SHOP_SETTINGS["RARITY_WEIGHTS"].items():
             cumulative += weight
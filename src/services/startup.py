@@ -0,0 +1,110 @@
+"""Concurrent warm-up of slow startup work."""
+
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+STARTUP_STAGE_SECONDS = metrics.histogram(
+    "startup_stage_seconds", "Duration of each startup warm-up stage"
+)
+
+
+class StartupOrchestrator:
+    """Runs independent startup stages on a thread pool.
+
+    Stages are started together while the title screen is up; code that
+    needs one calls ``wait(name)`` and only blocks on that stage. Waiting
+    on a stage that was never started returns immediately, so the same
+    code paths work whether or not warm-up ran. Once every stage has
+    finished, their timings are logged and the pool is shut down.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self.timings: Dict[str, float] = {}
+        self._futures: Dict[str, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def start(self, stages: Dict[str, Callable[[], Any]]) -> "StartupOrchestrator":
+        """Submit every stage; returns immediately"""
+        submitted = []
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="startup"
+                )
+            for name, stage in stages.items():
+                if name not in self._futures:
+                    # Keep the caller's trace context in the worker
+                    self._futures[name] = self._executor.submit(
+                        contextvars.copy_context().run, self._run_stage, name, stage
+                    )
+                    submitted.append(self._futures[name])
+            self._pending += len(submitted)
+        # Outside the lock: a stage that already finished calls back at once
+        for future in submitted:
+            future.add_done_callback(self._stage_done)
+        logger.debug(f"Startup stages submitted: {', '.join(stages)}")
+        return self
+
+    def _run_stage(self, name: str, stage: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            return stage()
+        except Exception as e:
+            logger.error(f"Startup stage '{name}' failed: {str(e)}")
+            return None
+        finally:
+            self.timings[name] = time.perf_counter() - start
+            STARTUP_STAGE_SECONDS.observe(self.timings[name], stage=name)
+            logger.debug(f"Startup stage '{name}' took {self.timings[name]:.3f}s")
+
+    def _stage_done(self, future: Future):
+        with self._lock:
+            self._pending -= 1
+            if self._pending:
+                return
+        logger.info(self.report())
+        self.shutdown()
+
+    def started(self, name: str) -> bool:
+        return name in self._futures
+
+    def wait(self, name: str, timeout: Optional[float] = None) -> Any:
+        """Block until a stage finishes and return its result"""
+        future = self._futures.get(name)
+        if future is None:
+            return None
+        if not future.done():
+            start = time.perf_counter()
+            result = future.result(timeout)
+            logger.debug(
+                f"Waited {time.perf_counter() - start:.3f}s for startup stage '{name}'"
+            )
+            return result
+        return future.result()
+
+    def shutdown(self):
+        """Let running stages finish in the background and free the pool"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def report(self) -> str:
+        lines = ["Startup stages:"]
+        for name, seconds in sorted(self.timings.items(), key=lambda kv: -kv[1]):
+            lines.append(f"  {name:<14} {seconds * 1000:8.1f} ms")
+        return "\n".join(lines)
+
+
+startup = StartupOrchestrator()
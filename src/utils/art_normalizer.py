@@ -0,0 +1,89 @@
+"""Vectorized validation and normalization of generated ASCII art."""
+
+from typing import Sequence
+import numpy as np
+
+# Frame characters and blanks are always allowed, whatever the palette
+FRAME_CHARACTERS = "║╔╗╚╝ "
+
+SPACE = ord(" ")
+NEWLINE = ord("\n")
+
+
+class ArtNormalizer:
+    """Maps raw art text into a fixed ``height x width`` grid of code points.
+
+    Art is decoded once into a flat code point array, positioned into the
+    grid with index arithmetic, and filtered through a lookup-table mask of
+    allowed characters. Rows past ``height`` and columns past ``width`` are
+    trimmed; missing cells are padded with spaces.
+    """
+
+    def __init__(self, width: int, height: int, characters: str):
+        if width <= 0 or height <= 0:
+            raise ValueError("Width and height must be positive")
+        self.width = width
+        self.height = height
+
+        allowed = np.array(
+            sorted({ord(c) for c in characters + FRAME_CHARACTERS}), dtype=np.uint32
+        )
+        # The extra trailing slot is always False and absorbs out-of-range codes
+        self._lookup = np.zeros(int(allowed.max()) + 2, dtype=bool)
+        self._lookup[allowed] = True
+
+    def to_array(self, art: str) -> np.ndarray:
+        """Normalize a single piece of art into a (height, width) uint32 array"""
+        return self.to_array_batch([art])[0]
+
+    def to_array_batch(self, arts: Sequence[str]) -> np.ndarray:
+        """Normalize many pieces of art into a (n, height, width) uint32 array"""
+        grid = np.full((len(arts), self.height, self.width), SPACE, dtype=np.uint32)
+        if not arts:
+            return grid
+
+        # str length is in code points, so one encode covers the whole batch
+        lengths = np.fromiter(map(len, arts), dtype=np.int64, count=len(arts))
+        codes = np.frombuffer("".join(arts).encode("utf-32-le"), dtype=np.uint32)
+        if not len(codes):
+            return grid
+
+        positions = np.arange(len(codes), dtype=np.int64)
+        art_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+        # Row: newlines seen so far within the same piece of art
+        newline = codes == NEWLINE
+        newlines_before = np.concatenate(([0], np.cumsum(newline)))
+        row = newlines_before[:-1] - np.repeat(newlines_before[art_starts], lengths)
+
+        # Column: distance from the start of the current line
+        line_start = np.zeros(len(codes), dtype=bool)
+        line_start[art_starts[lengths > 0]] = True
+        line_start[1:] |= newline[:-1]
+        col = positions - np.maximum.accumulate(np.where(line_start, positions, 0))
+
+        keep = np.flatnonzero(~newline & (row < self.height) & (col < self.width))
+        art_index = np.repeat(np.arange(len(arts)), lengths)[keep]
+        cells = (art_index * self.height + row[keep]) * self.width + col[keep]
+
+        # Anything outside the palette stays a blank
+        kept = codes[keep]
+        valid = self._lookup[np.minimum(kept, len(self._lookup) - 1)]
+        grid.reshape(-1)[cells[valid]] = kept[valid]
+        return grid
+
+    def to_text(self, grid: np.ndarray) -> str:
+        """Render a (height, width) code point array back into art text"""
+        rows = np.empty((grid.shape[0], grid.shape[1] + 1), dtype="<u4")
+        rows[:, :-1] = grid
+        rows[:, -1] = NEWLINE
+        return rows.tobytes().decode("utf-32-le")[:-1]
+
+    def normalize(self, art: str) -> str:
+        """Validate, trim and pad art text in one pass"""
+        return self.to_text(self.to_array(art))
+
+    @staticmethod
+    def diff(before: np.ndarray, after: np.ndarray) -> np.ndarray:
+        """Return (row, col) coordinates of cells that differ between two grids"""
+        return np.argwhere(before != after)
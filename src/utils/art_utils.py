@@ -1,17 +1,36 @@
 from ..utils.pixel_art import PixelArt
 from typing import Tuple
+import numpy as np
 import os
 import logging
 
 
+def _circle_mask(art: PixelArt, cx: int, cy: int, radius: int) -> np.ndarray:
+    ys, xs = np.ogrid[: art.height, : art.width]
+    return (xs - cx) ** 2 + (ys - cy) ** 2 <= radius**2
+
+
+def _rectangle_mask(art: PixelArt, x: int, y: int, width: int, height: int):
+    mask = np.zeros((art.height, art.width), dtype=bool)
+    mask[max(0, y) : max(0, y + height), max(0, x) : max(0, x + width)] = True
+    return mask
+
+
+def _shift(mask: np.ndarray, dx: int, dy: int) -> np.ndarray:
+    """Move a mask by (dx, dy) without wrapping around the edges"""
+    shifted = np.zeros_like(mask)
+    h, w = mask.shape
+    shifted[max(0, dy) : h + min(0, dy), max(0, dx) : w + min(0, dx)] = mask[
+        max(0, -dy) : h - max(0, dy), max(0, -dx) : w - max(0, dx)
+    ]
+    return shifted
+
+
 def draw_circular_shape(
     art: PixelArt, cx: int, cy: int, color: Tuple[int, int, int], char: str
 ):
     radius = min(art.width, art.height) // 4
-    for y in range(cy - radius, cy + radius + 1):
-        for x in range(cx - radius, cx + radius + 1):
-            if (x - cx) ** 2 + (y - cy) ** 2 <= radius**2:
-                art.set_pixel(x, y, color, char=char)
+    art.fill(_circle_mask(art, cx, cy, radius), color, char=char)
 
 
 def draw_tall_shape(
@@ -19,9 +38,8 @@ def draw_tall_shape(
 ):
     width = art.width // 3
     height = art.height // 2
-    for y in range(cy - height, cy + height):
-        for x in range(cx - width, cx + width):
-            art.set_pixel(x, y, color, char=char)
+    mask = _rectangle_mask(art, cx - width, cy - height, 2 * width, 2 * height)
+    art.fill(mask, color, char=char)
 
 
 def add_feature(art: PixelArt, feature: str, color: Tuple[int, int, int], char: str):
@@ -43,10 +61,9 @@ def draw_default_shape(
     """Draw default rectangular shape"""
     width = art.width // 3
     height = art.height // 2
-    for y in range(cy - height // 2, cy + height // 2):
-        for x in range(cx - width // 2, cx + width // 2):
-            if 0 <= x < art.width and 0 <= y < art.height:
-                art.set_pixel(x, y, color, char=char)
+    x, y = cx - width // 2, cy - height // 2
+    mask = _rectangle_mask(art, x, y, cx + width // 2 - x, cy + height // 2 - y)
+    art.fill(mask, color, char=char)
 
 
 def add_glow_effect(art, x, y, color):
@@ -89,7 +106,12 @@ def load_ascii_art(filename: str) -> str:
 
 
 def draw_circle(
-    art: "PixelArt", center_x: int, center_y: int, radius: int, color: tuple
+    art: "PixelArt",
+    center_x: int,
+    center_y: int,
+    radius: int,
+    color: tuple,
+    char: str = "▀",
 ) -> None:
     """Draw a circle on the pixel art.
 
@@ -99,17 +121,19 @@ def draw_circle(
         center_y: Y coordinate of circle center
         radius: Radius of the circle
         color: RGB color tuple (r, g, b)
+        char: Glyph to draw with
     """
-    for y in range(max(0, center_y - radius), min(art.height, center_y + radius + 1)):
-        for x in range(
-            max(0, center_x - radius), min(art.width, center_x + radius + 1)
-        ):
-            if (x - center_x) ** 2 + (y - center_y) ** 2 <= radius**2:
-                art.set_pixel(x, y, color)
+    art.fill(_circle_mask(art, center_x, center_y, radius), color, char=char)
 
 
 def draw_rectangle(
-    art: "PixelArt", x: int, y: int, width: int, height: int, color: tuple
+    art: "PixelArt",
+    x: int,
+    y: int,
+    width: int,
+    height: int,
+    color: tuple,
+    char: str = "▀",
 ) -> None:
     """Draw a filled rectangle on the pixel art.
 
@@ -120,10 +144,9 @@ def draw_rectangle(
         width: Width of rectangle
         height: Height of rectangle
         color: RGB color tuple (r, g, b)
+        char: Glyph to draw with
     """
-    for cy in range(max(0, y), min(art.height, y + height)):
-        for cx in range(max(0, x), min(art.width, x + width)):
-            art.set_pixel(cx, cy, color)
+    art.fill(_rectangle_mask(art, x, y, width, height), color, char=char)
 
 
 def add_highlights(art: "PixelArt", color: tuple) -> None:
@@ -133,21 +156,12 @@ def add_highlights(art: "PixelArt", color: tuple) -> None:
         art: PixelArt object to add highlights to
         color: RGB color tuple (r, g, b) for highlights
     """
-    # Add highlights around the edges of existing pixels
-    for y in range(art.height):
-        for x in range(art.width):
-            if art.pixels[y][x][3] > 0:  # If pixel is not empty
-                # Add highlights to adjacent pixels
-                for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                    nx, ny = x + dx, y + dy
-                    if (
-                        0 <= nx < art.width
-                        and 0 <= ny < art.height
-                        and art.pixels[ny][nx][3] == 0
-                    ):  # If adjacent pixel is empty
-                        art.set_pixel(
-                            nx, ny, color, alpha=0.5
-                        )  # Semi-transparent highlight
+    # Highlight empty cells orthogonally adjacent to existing pixels
+    occupied = art.occupied()
+    edges = np.zeros_like(occupied)
+    for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+        edges |= _shift(occupied, dx, dy)
+    art.fill(edges & ~occupied, color, alpha=0.5)  # Semi-transparent highlight
 
 
 def add_shadows(art: "PixelArt", color: tuple) -> None:
@@ -157,18 +171,9 @@ def add_shadows(art: "PixelArt", color: tuple) -> None:
         art: PixelArt object to add shadows to
         color: RGB color tuple (r, g, b) for shadows
     """
-    # Add shadows below and to the right of existing pixels
-    for y in range(art.height - 1, -1, -1):  # Start from bottom
-        for x in range(art.width):
-            if art.pixels[y][x][3] > 0:  # If pixel is not empty
-                # Add shadow to bottom-right pixels
-                for dx, dy in [(1, 1), (0, 1), (1, 0)]:
-                    nx, ny = x + dx, y + dy
-                    if (
-                        0 <= nx < art.width
-                        and 0 <= ny < art.height
-                        and art.pixels[ny][nx][3] == 0
-                    ):  # If adjacent pixel is empty
-                        art.set_pixel(
-                            nx, ny, color, alpha=0.3
-                        )  # Semi-transparent shadow
+    # Shade empty cells below and to the right of existing pixels
+    occupied = art.occupied()
+    shade = np.zeros_like(occupied)
+    for dx, dy in [(1, 1), (0, 1), (1, 0)]:
+        shade |= _shift(occupied, dx, dy)
+    art.fill(shade & ~occupied, color, alpha=0.3)  # Semi-transparent shadow
@@ -1,12 +1,40 @@
 import os
-from typing import Optional, Union
+import sys
+import threading
+from typing import Optional, Set, Union, TYPE_CHECKING
 from src.config.settings import ENABLE_AI_ART_GENERATION
-from src.services.art_generator import (
-    generate_class_art,
-    generate_enemy_art,
-    generate_item_art,
-)
-from src.utils.pixel_art import PixelArt
+
+if TYPE_CHECKING:
+    from src.utils.pixel_art import PixelArt
+
+
+def _is_pixel_art(art) -> bool:
+    """isinstance check that doesn't import PixelArt (and numpy) itself"""
+    # Nothing can be a PixelArt until something that draws one imported it
+    pixel_art = sys.modules.get("src.utils.pixel_art")
+    return pixel_art is not None and isinstance(art, pixel_art.PixelArt)
+
+
+# Names of art files in data/art, scanned once instead of stat-ing per entity
+_art_manifest: Optional[Set[str]] = None
+# Startup scans on a worker thread while the game may already ask for art
+_art_manifest_lock = threading.Lock()
+
+
+def load_art_manifest() -> Set[str]:
+    """Return the set of saved art names, scanning data/art on first call"""
+    global _art_manifest
+    with _art_manifest_lock:
+        if _art_manifest is None:
+            try:
+                _art_manifest = {
+                    name[: -len(".txt")]
+                    for name in os.listdir("data/art")
+                    if name.endswith(".txt")
+                }
+            except FileNotFoundError:
+                _art_manifest = set()
+        return _art_manifest
 
 
 def convert_pixel_art_to_ascii(pixel_art):
@@ -24,7 +52,7 @@ def convert_pixel_art_to_ascii(pixel_art):
 
 def display_ascii_art(art):
     """Display ASCII art or PixelArt in the terminal."""
-    if isinstance(art, PixelArt):
+    if _is_pixel_art(art):
         print(art.render())
     elif isinstance(art, str):
         print(art)
@@ -32,16 +60,17 @@ def display_ascii_art(art):
         print("Unsupported art format")
 
 
-def save_ascii_art(art: Union[PixelArt, str], filename: str):
+def save_ascii_art(art: Union["PixelArt", str], filename: str):
     """Save ASCII art to file"""
     os.makedirs("data/art", exist_ok=True)
     safe_filename = filename.lower().replace("'", "").replace(" ", "_")
     filepath = f"data/art/{safe_filename}.txt"
 
     try:
-        content = art.render() if isinstance(art, PixelArt) else str(art)
+        content = art.render() if _is_pixel_art(art) else str(art)
         with open(filepath, "w", encoding="utf-8") as f:
             f.write(content)
+        load_art_manifest().add(safe_filename)
     except Exception as e:
         print(f"Error saving art: {e}")
 
@@ -64,10 +93,16 @@ def ensure_entity_art(entity_name: str, entity_type: str, description: str = "")
     safe_name = (
         f"{entity_type}_{entity_name.lower().replace(' ', '_').replace("'", '')}"
     )
-    art_path = os.path.join("data/art", f"{safe_name}.txt")
 
-    if not os.path.exists(art_path):
+    if safe_name not in load_art_manifest():
         if ENABLE_AI_ART_GENERATION:
+            # Pulls in the AI client stack, so only once art is missing
+            from src.services.art_generator import (
+                generate_class_art,
+                generate_enemy_art,
+                generate_item_art,
+            )
+
             art_func = {
                 "class": generate_class_art,
                 "enemy": generate_enemy_art,
@@ -1,8 +1,11 @@
 import logging
+import random
 from typing import Optional, Any
 import json
 from functools import wraps
 
+from src.config.settings import LOGGING_SETTINGS
+
 
 class DebugLogger:
     def __init__(self):
@@ -16,6 +19,24 @@ class DebugLogger:
     def disable(self):
         self.enabled = False
 
+    @staticmethod
+    def sample_ai_payload(logger: logging.Logger) -> bool:
+        """Whether to log full AI payloads for this call.
+
+        False when DEBUG is off for ``logger``, so callers can skip building
+        large strings entirely; otherwise sampled by AI_PAYLOAD_SAMPLE_RATE.
+        """
+        if not logger.isEnabledFor(logging.DEBUG):
+            return False
+        return random.random() < LOGGING_SETTINGS["AI_PAYLOAD_SAMPLE_RATE"]
+
+    @staticmethod
+    def truncate(payload: str) -> str:
+        limit = LOGGING_SETTINGS["AI_PAYLOAD_MAX_CHARS"]
+        if len(payload) <= limit:
+            return payload
+        return f"{payload[:limit]}... [{len(payload) - limit} more chars]"
+
     def log_ai_interaction(
         self,
         prompt: str,
@@ -24,7 +45,7 @@ class DebugLogger:
         attempt: int = 0,
         metadata: Optional[dict] = None,
     ):
-        if not self.enabled:
+        if not self.enabled or not self.sample_ai_payload(self.ai_logger):
             return
 
         self.ai_logger.debug("\n=== AI Interaction ===")
@@ -35,16 +56,16 @@ class DebugLogger:
             self.ai_logger.debug(json.dumps(metadata, indent=2))
 
         self.ai_logger.debug("\nPrompt:")
-        self.ai_logger.debug(prompt)
+        self.ai_logger.debug(self.truncate(prompt))
 
         if response:
             self.ai_logger.debug("\nResponse:")
-            self.ai_logger.debug(response)
+            self.ai_logger.debug(self.truncate(response))
 
             try:
                 parsed = json.loads(response)
                 self.ai_logger.debug("\nParsed JSON:")
-                self.ai_logger.debug(json.dumps(parsed, indent=2))
+                self.ai_logger.debug(self.truncate(json.dumps(parsed, indent=2)))
             except json.JSONDecodeError as e:
                 self._log_json_error(e, response)
 
@@ -53,7 +74,7 @@ class DebugLogger:
             self.ai_logger.error(str(error))
 
     def log_game_event(self, event_type: str, data: Any):
-        if not self.enabled:
+        if not self.enabled or not self.game_logger.isEnabledFor(logging.INFO):
             return
         self.game_logger.info(f"\n=== {event_type} ===")
         self.game_logger.info(json.dumps(data, indent=2))
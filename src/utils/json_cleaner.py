@@ -1,6 +1,8 @@
 from typing import Optional
 import json
 
+from src.utils.response_parser import repair_json
+
 
 class JSONCleaner:
     @staticmethod
@@ -11,31 +13,13 @@ class JSONCleaner:
             json.loads(content)
             return content
         except json.JSONDecodeError:
-            # Only clean if necessary
+            # Only repair if necessary; see src/utils/response_parser.py
+            repaired = repair_json(content)
+            if repaired is None:
+                return None
             try:
-                # Basic cleanup
-                cleaned = content.strip()
-                cleaned = cleaned.replace("'", '"')
-                cleaned = cleaned.replace("\n", " ")
-                cleaned = cleaned.replace(",}", "}")
-                cleaned = cleaned.replace(",]", "]")
-
-                # Validate JSON structure
-                data = json.loads(cleaned)
-
-                # Clean values while preserving structure
-                def clean_value(val):
-                    if isinstance(val, str):
-                        return val.strip().strip('"')
-                    elif isinstance(val, dict):
-                        return {k.strip(): clean_value(v) for k, v in val.items()}
-                    elif isinstance(val, list):
-                        return [clean_value(item) for item in val]
-                    return val
-
-                cleaned_data = clean_value(data)
-                return json.dumps(cleaned_data, indent=2)
-            except Exception:
+                return json.dumps(json.loads(repaired), indent=2)
+            except json.JSONDecodeError:
                 return None
 
     @staticmethod
@@ -0,0 +1,272 @@
+"""Lightweight in-process metrics: counters, gauges and histograms."""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.config.settings import METRICS_SETTINGS
+
+logger = logging.getLogger(__name__)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey, extra: Optional[Dict[str, str]] = None) -> str:
+    pairs = list(key) + sorted((extra or {}).items())
+    if not pairs:
+        return ""
+    body = ",".join(f'{k}="{_escape(v)}"' for k, v in pairs)
+    return "{" + body + "}"
+
+
+class Counter:
+    """Monotonically increasing value per label set"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, lock: threading.Lock):
+        self.name = name
+        self.help = help
+        self._lock = lock
+        self.values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self.values.get(_label_key(labels), 0)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        return [{"labels": dict(k), "value": v} for k, v in self.values.items()]
+
+    def prometheus(self) -> List[str]:
+        return [f"{self.name}{_format_labels(k)} {v:g}" for k, v in self.values.items()]
+
+
+class Gauge(Counter):
+    """Value that can go up and down"""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self.values[key] = value
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram:
+    """Latency/size distribution with count, sum and percentile summaries.
+
+    Keeps up to ``max_samples`` recent observations per label set for the
+    percentiles; count and sum always cover every observation.
+    """
+
+    kind = "summary"
+
+    def __init__(
+        self, name: str, help: str, lock: threading.Lock, max_samples: int = 2048
+    ):
+        self.name = name
+        self.help = help
+        self.max_samples = max_samples
+        self._lock = lock
+        self.samples: Dict[LabelKey, List[float]] = {}
+        self.counts: Dict[LabelKey, int] = {}
+        self.sums: Dict[LabelKey, float] = {}
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            samples = self.samples.setdefault(key, [])
+            count = self.counts.get(key, 0)
+            if len(samples) < self.max_samples:
+                samples.append(value)
+            else:
+                # Overwrite the oldest sample, ring-buffer style
+                samples[count % self.max_samples] = value
+            self.counts[key] = count + 1
+            self.sums[key] = self.sums.get(key, 0.0) + value
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    @staticmethod
+    def _quantile(ordered: List[float], q: float) -> float:
+        if not ordered:
+            return math.nan
+        index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+        return ordered[index]
+
+    def summary(self, **labels) -> Dict[str, float]:
+        key = _label_key(labels)
+        return self._summary(key)
+
+    def _summary(self, key: LabelKey) -> Dict[str, float]:
+        with self._lock:
+            ordered = sorted(self.samples.get(key, []))
+            count = self.counts.get(key, 0)
+            total = self.sums.get(key, 0.0)
+        result = {"count": count, "sum": total, "mean": total / count if count else 0}
+        for q in QUANTILES:
+            result[f"p{int(q * 100)}"] = self._quantile(ordered, q)
+        result["max"] = ordered[-1] if ordered else math.nan
+        return result
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        return [{"labels": dict(k), **self._summary(k)} for k in list(self.counts)]
+
+    def prometheus(self) -> List[str]:
+        lines = []
+        for key in list(self.counts):
+            summary = self._summary(key)
+            for q in QUANTILES:
+                value = summary[f"p{int(q * 100)}"]
+                lines.append(
+                    f"{self.name}{_format_labels(key, {'quantile': str(q)})} {value:g}"
+                )
+            lines.append(f"{self.name}_count{_format_labels(key)} {summary['count']}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {summary['sum']:g}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics for the running session"""
+
+    def __init__(self, prefix: str = "terminal_quest"):
+        self.prefix = prefix
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Any] = {}
+
+    def _get(self, cls, name: str, help: str):
+        full_name = f"{self.prefix}_{name}" if self.prefix else name
+        with self._lock:
+            metric = self._metrics.get(full_name)
+            if metric is None:
+                metric = cls(full_name, help, threading.Lock())
+                self._metrics[full_name] = metric
+        if not isinstance(metric, cls):
+            raise TypeError(f"Metric {full_name} is a {metric.kind}")
+        return metric
+
+    def counter(self, name: str, help: str = "") -> Counter:
+        return self._get(Counter, name, help)
+
+    def gauge(self, name: str, help: str = "") -> Gauge:
+        return self._get(Gauge, name, help)
+
+    def histogram(self, name: str, help: str = "") -> Histogram:
+        return self._get(Histogram, name, help)
+
+    def timed(
+        self,
+        name: str,
+        help: str = "",
+        outcome: Optional[Callable[[Any], str]] = None,
+        **labels,
+    ):
+        """Decorator recording call latency in seconds into a histogram.
+
+        ``outcome`` maps the return value to an ``outcome`` label, so a
+        function that signals failure by returning None/False can be split
+        into successful and failed calls. Exceptions are labelled "error".
+        """
+        histogram = self.histogram(name, help)
+
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                call_labels = dict(labels)
+                try:
+                    result = func(*args, **kwargs)
+                except Exception:
+                    if outcome:
+                        call_labels["outcome"] = "error"
+                    histogram.observe(time.perf_counter() - start, **call_labels)
+                    raise
+                if outcome:
+                    call_labels["outcome"] = outcome(result)
+                histogram.observe(time.perf_counter() - start, **call_labels)
+                return result
+
+            return wrapper
+
+        return decorator
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            metrics = dict(self._metrics)
+        return {
+            "started_at": self.started_at,
+            "duration_seconds": time.time() - self.started_at,
+            "metrics": {
+                name: {"type": m.kind, "help": m.help, "series": m.snapshot()}
+                for name, m in sorted(metrics.items())
+            },
+        }
+
+    def to_prometheus(self) -> str:
+        with self._lock:
+            metrics = dict(self._metrics)
+        lines = []
+        for name, metric in sorted(metrics.items()):
+            if metric.help:
+                lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.prometheus())
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: Optional[str] = None, fmt: Optional[str] = None) -> str:
+        """Write all metrics to a Prometheus text file or a JSON dump"""
+        fmt = fmt or METRICS_SETTINGS["EXPORT_FORMAT"]
+        path = path or METRICS_SETTINGS["EXPORT_PATH"]
+        if not path.endswith((".prom", ".json")):
+            path += ".prom" if fmt == "prometheus" else ".json"
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            if fmt == "prometheus":
+                f.write(self.to_prometheus())
+            else:
+                json.dump(self.snapshot(), f, indent=2, default=str)
+        logger.info(f"Metrics exported to {path}")
+        return path
+
+    def export_on_exit(self) -> Optional[str]:
+        """Export if enabled in settings; never raises"""
+        if not METRICS_SETTINGS["EXPORT_ON_EXIT"] or not self._metrics:
+            return None
+        try:
+            return self.export()
+        except Exception as e:
+            logger.error(f"Failed to export metrics: {str(e)}")
+            return None
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,162 @@
+"""Central pacing for on-screen waits."""
+
+import logging
+import math
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from src.config.settings import PACING_SETTINGS
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+PACING_SECONDS = metrics.counter(
+    "pacing_seconds_total", "Wall-clock seconds spent in deliberate waits"
+)
+
+
+def configured_speed() -> float:
+    """The GAME_SPEED environment variable, else ``PACING_SETTINGS["SPEED"]``"""
+    value = os.getenv("GAME_SPEED")
+    if value:
+        try:
+            speed = float(value)
+        except ValueError:
+            speed = math.nan
+        if math.isfinite(speed):
+            return speed
+        logger.warning(f"Invalid GAME_SPEED '{value}', using normal speed")
+        return 1.0
+    return PACING_SETTINGS["SPEED"]
+
+
+@dataclass
+class PacingStats:
+    """Per-category totals for one session"""
+
+    count: int = 0
+    requested: float = 0.0  # Nominal seconds at speed 1.0
+    slept: float = 0.0  # Wall-clock seconds actually spent waiting
+    skipped: int = 0
+
+
+class Pacer:
+    """Turns named delay categories into waits.
+
+    Delays come from ``PACING_SETTINGS["DELAYS"]`` and are scaled by a
+    global speed multiplier, which the ``GAME_SPEED`` environment variable
+    overrides. A speed of 0 is zero-delay mode: nothing sleeps, but the
+    requested time is still counted so sessions can be compared.
+    """
+
+    def __init__(
+        self,
+        speed: Optional[float] = None,
+        skip_on_keypress: Optional[bool] = None,
+        delays: Optional[Dict[str, float]] = None,
+    ):
+        if speed is None:
+            speed = configured_speed()
+        if skip_on_keypress is None:
+            skip_on_keypress = PACING_SETTINGS["SKIP_ON_KEYPRESS"]
+        self.speed = max(0.0, speed)
+        self.skip_on_keypress = skip_on_keypress
+        self.delays = dict(PACING_SETTINGS["DELAYS"])
+        if delays:
+            self.delays.update(delays)
+        self.stats: Dict[str, PacingStats] = {}
+
+    @property
+    def zero_delay(self) -> bool:
+        return self.speed == 0
+
+    def delay_for(self, category: str) -> float:
+        """Nominal delay for a category, before the speed multiplier"""
+        if category not in self.delays:
+            logger.warning(f"Unknown pacing category: {category}")
+        return self.delays.get(category, self.delays["MESSAGE"])
+
+    def wait(self, category: str) -> float:
+        """Wait for a category's delay; returns the seconds actually spent"""
+        requested = self.delay_for(category)
+        stats = self.stats.setdefault(category, PacingStats())
+        stats.count += 1
+        stats.requested += requested
+
+        duration = requested * self.speed
+        if duration <= 0:
+            return 0.0
+
+        start = time.perf_counter()
+        if self.skip_on_keypress and self._wait_for_key(duration):
+            stats.skipped += 1
+        slept = time.perf_counter() - start
+        stats.slept += slept
+        PACING_SECONDS.inc(slept, category=category)
+        return slept
+
+    def _wait_for_key(self, seconds: float) -> bool:
+        """Sleep up to ``seconds``; True if a keypress ended it early"""
+        stream = sys.stdin
+        try:
+            interactive = stream.isatty()
+        except (AttributeError, ValueError):
+            interactive = False
+        if not interactive:
+            time.sleep(seconds)
+            return False
+
+        if os.name == "nt":
+            import msvcrt
+
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                if msvcrt.kbhit():
+                    while msvcrt.kbhit():
+                        msvcrt.getwch()
+                    return True
+                time.sleep(0.02)
+            return False
+
+        import select
+        import termios
+        import tty
+
+        fd = stream.fileno()
+        saved = termios.tcgetattr(fd)
+        try:
+            # cbreak delivers single keys without waiting for Enter
+            tty.setcbreak(fd)
+            ready, _, _ = select.select([fd], [], [], seconds)
+            if ready:
+                os.read(fd, 1024)
+            return bool(ready)
+        finally:
+            termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+
+    @property
+    def total_requested(self) -> float:
+        return sum(s.requested for s in self.stats.values())
+
+    @property
+    def total_slept(self) -> float:
+        return sum(s.slept for s in self.stats.values())
+
+    def summary(self) -> str:
+        """Human-readable per-category report of time spent waiting"""
+        lines = [
+            f"Pacing: {self.total_slept:.1f}s slept of "
+            f"{self.total_requested:.1f}s requested (speed {self.speed:g})"
+        ]
+        for category, stats in sorted(
+            self.stats.items(), key=lambda item: item[1].slept, reverse=True
+        ):
+            lines.append(
+                f"  {category:<16} x{stats.count:<4} "
+                f"{stats.slept:7.1f}s slept {stats.requested:7.1f}s requested "
+                f"{stats.skipped} skipped"
+            )
+        return "\n".join(lines)
@@ -1,6 +1,18 @@
 from dataclasses import dataclass
-from typing import List, Tuple
-import random
+from typing import List, Optional, Tuple
+import numpy as np
+
+# One record per cell: glyph, foreground/background RGB and coverage
+PIXEL_DTYPE = np.dtype(
+    [
+        ("char", "<U1"),
+        ("fg", np.uint8, (3,)),
+        ("bg", np.uint8, (3,)),
+        ("alpha", np.float32),
+    ]
+)
+
+RESET = "\x1b[0m"
 
 
 @dataclass
@@ -8,6 +20,7 @@ class Pixel:
     char: str
     fg_color: Tuple[int, int, int]
     bg_color: Tuple[int, int, int] = (0, 0, 0)
+    alpha: float = 1.0
 
 
 class PixelArt:
@@ -18,9 +31,9 @@ class PixelArt:
             raise ValueError("Width and height must be positive")
         self.width = width
         self.height = height
-        self.pixels: List[List[Pixel]] = [
-            [Pixel("▀", (0, 0, 0)) for _ in range(width)] for _ in range(height)
-        ]
+        # Empty cells have zero alpha; drawing ops use that to find edges
+        self.pixels = np.zeros((height, width), dtype=PIXEL_DTYPE)
+        self.pixels["char"] = "▀"
 
     def set_pixel(
         self,
@@ -29,20 +42,76 @@ class PixelArt:
         fg_color: Tuple[int, int, int],
         bg_color: Tuple[int, int, int] = (0, 0, 0),
         char: str = "▀",
+        alpha: float = 1.0,
     ):
         if 0 <= x < self.width and 0 <= y < self.height:
-            self.pixels[y][x] = Pixel(char, fg_color, bg_color)
+            self.pixels[y, x] = (char, fg_color, bg_color, alpha)
+
+    def get_pixel(self, x: int, y: int) -> Optional[Pixel]:
+        """Return a copy of a single cell, or None when out of bounds"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        cell = self.pixels[y, x]
+        return Pixel(
+            str(cell["char"]),
+            tuple(int(c) for c in cell["fg"]),
+            tuple(int(c) for c in cell["bg"]),
+            float(cell["alpha"]),
+        )
+
+    def fill(
+        self,
+        mask: np.ndarray,
+        fg_color: Tuple[int, int, int],
+        bg_color: Tuple[int, int, int] = (0, 0, 0),
+        char: str = "▀",
+        alpha: float = 1.0,
+    ):
+        """Paint every cell selected by a (height, width) boolean mask"""
+        self.pixels[mask] = (char, fg_color, bg_color, alpha)
+
+    def occupied(self) -> np.ndarray:
+        """Boolean mask of cells that have been drawn on"""
+        return self.pixels["alpha"] > 0
+
+    def _blended_fg(self) -> np.ndarray:
+        """Foreground colors with alpha blended over the background"""
+        alpha = self.pixels["alpha"][..., None]
+        fg = self.pixels["fg"].astype(np.float32)
+        bg = self.pixels["bg"].astype(np.float32)
+        return np.rint(fg * alpha + bg * (1 - alpha)).astype(np.uint8)
 
     def render(self) -> str:
+        """Render to 24-bit ANSI, emitting escapes only where colors change"""
+        fg = self._blended_fg()
+        bg = self.pixels["bg"]
+
+        # Pack RGB into one integer per cell so runs are a single comparison
+        weights = np.array([1 << 16, 1 << 8, 1], dtype=np.uint32)
+        fg_key = fg.astype(np.uint32) @ weights
+        bg_key = bg.astype(np.uint32) @ weights
+
+        fg_change = np.ones((self.height, self.width), dtype=bool)
+        bg_change = np.ones((self.height, self.width), dtype=bool)
+        fg_change[:, 1:] = fg_key[:, 1:] != fg_key[:, :-1]
+        bg_change[:, 1:] = bg_key[:, 1:] != bg_key[:, :-1]
+        run_starts = fg_change | bg_change
+
+        fg_rows = fg.tolist()
+        bg_rows = bg.tolist()
         output = []
-        for row in self.pixels:
-            line = []
-            for pixel in row:
-                fg_r, fg_g, fg_b = pixel.fg_color
-                bg_r, bg_g, bg_b = pixel.bg_color
-                line.append(
-                    f"\x1b[38;2;{fg_r};{fg_g};{fg_b}m"
-                    f"\x1b[48;2;{bg_r};{bg_g};{bg_b}m{pixel.char}"
-                )
-            output.append("".join(line) + "\x1b[0m")
+        for y in range(self.height):
+            chars = "".join(self.pixels["char"][y].tolist())
+            starts = np.flatnonzero(run_starts[y]).tolist()
+            line: List[str] = []
+            for i, start in enumerate(starts):
+                end = starts[i + 1] if i + 1 < len(starts) else self.width
+                if fg_change[y, start]:
+                    r, g, b = fg_rows[y][start]
+                    line.append(f"\x1b[38;2;{r};{g};{b}m")
+                if bg_change[y, start]:
+                    r, g, b = bg_rows[y][start]
+                    line.append(f"\x1b[48;2;{r};{g};{b}m")
+                line.append(chars[start:end])
+            output.append("".join(line) + RESET)
         return "\n".join(output)
@@ -0,0 +1,254 @@
+"""Session profiling for bug reports.
+
+``python main.py --profile`` (or ``GAME_PROFILE=sample``) records the whole
+session and writes the results to ``logs/`` on exit:
+
+- ``sample``: a background thread samples every thread's stack and writes
+  collapsed stacks (``*.collapsed``), loadable by flamegraph.pl, speedscope
+  or inferno. Overhead is low enough for normal play.
+- ``cprofile``: deterministic profiling of the game thread to a ``.prof``
+  file plus a text report.
+- ``both``: runs the two together.
+
+Subsystem filters (``--profile-filter combat,ai``) keep only stacks and
+report rows that touch those parts of the code.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.config.settings import PROFILING_SETTINGS
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("sample", "cprofile", "both")
+
+# Path fragments identifying each subsystem's frames
+SUBSYSTEMS: Dict[str, Tuple[str, ...]] = {
+    "combat": (
+        "src/services/combat.py",
+        "src/services/boss.py",
+        "src/services/effect.py",
+        "src/services/set_bonus.py",
+        "src/models/",
+        "src/display/combat/",
+    ),
+    "ai": (
+        "src/services/ai_core.py",
+        "src/services/ai_generator.py",
+        "src/services/ai_resilience.py",
+        "src/services/ai_scheduler.py",
+        "src/services/ai_schemas.py",
+        "src/services/art_generator.py",
+        "src/services/npc_context.py",
+        "src/services/npc_generator.py",
+        "src/services/prompts.py",
+        "src/utils/json_cleaner.py",
+        "src/utils/response_parser.py",
+        "/openai/",
+        "/httpx/",
+    ),
+    "persistence": (
+        "src/services/character_storage.py",
+        "src/services/save_manager.py",
+        "src/config/database.py",
+        "/psycopg2/",
+    ),
+    "display": (
+        "src/display/",
+        "src/utils/pixel_art.py",
+        "src/utils/art_utils.py",
+        "src/utils/ascii_art.py",
+    ),
+}
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_filters(value: Optional[str]) -> List[str]:
+    """Split a comma separated subsystem list, rejecting unknown names"""
+    names = [name.strip() for name in (value or "").split(",") if name.strip()]
+    unknown = [name for name in names if name not in SUBSYSTEMS]
+    if unknown:
+        raise ValueError(
+            f"Unknown profile subsystem(s): {', '.join(unknown)} "
+            f"(choose from {', '.join(SUBSYSTEMS)})"
+        )
+    return names
+
+
+def _short_path(filename: str) -> str:
+    filename = filename.replace(os.sep, "/")
+    root = REPO_ROOT.replace(os.sep, "/") + "/"
+    if filename.startswith(root):
+        return filename[len(root) :]
+    marker = "site-packages/"
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    return filename.rsplit("/", 1)[-1]
+
+
+class StackSampler:
+    """Samples all thread stacks at a fixed interval into collapsed form"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._labels: Dict[object, Tuple[str, str]] = {}
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run, name="profile-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _frame_label(self, frame) -> Tuple[str, str]:
+        code = frame.f_code
+        label = self._labels.get(code)
+        if label is None:
+            path = "/" + code.co_filename.replace(os.sep, "/")
+            name = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+            # Semicolons separate frames in the collapsed format
+            label = (name.replace(";", ":"), path)
+            self._labels[code] = label
+        return label
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._frame_label(frame))
+                    frame = frame.f_back
+                stack.reverse()
+                thread = names.get(thread_id, str(thread_id))
+                self.stacks[(thread, tuple(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self, patterns: Iterable[str] = ()) -> List[str]:
+        """Lines of ``thread;frame;frame count`` for the matching stacks"""
+        patterns = tuple(patterns)
+        lines = []
+        for (thread, stack), count in self.stacks.most_common():
+            if patterns and not any(
+                pattern in path for _, path in stack for pattern in patterns
+            ):
+                continue
+            frames = ";".join(name for name, _ in stack)
+            lines.append(f"{thread};{frames} {count}")
+        return lines
+
+
+class SessionProfiler:
+    """Profiles a play session and exports the results on ``stop()``"""
+
+    def __init__(
+        self,
+        mode: str = "sample",
+        subsystems: Iterable[str] = (),
+        output_dir: Optional[str] = None,
+    ):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+        self.mode = mode
+        self.subsystems = list(subsystems)
+        self.output_dir = output_dir or PROFILING_SETTINGS["OUTPUT_DIR"]
+        self._profile = None
+        self._sampler: Optional[StackSampler] = None
+        self._started = 0.0
+
+    @property
+    def patterns(self) -> List[str]:
+        return [p for name in self.subsystems for p in SUBSYSTEMS[name]]
+
+    def start(self) -> "SessionProfiler":
+        self._started = time.perf_counter()
+        if self.mode in ("sample", "both"):
+            self._sampler = StackSampler(PROFILING_SETTINGS["SAMPLE_INTERVAL"])
+            self._sampler.start()
+        if self.mode in ("cprofile", "both"):
+            import cProfile
+
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        logger.info(
+            f"Profiling session ({self.mode}"
+            f"{', ' + ','.join(self.subsystems) if self.subsystems else ''})"
+        )
+        return self
+
+    def stop(self) -> List[str]:
+        """Stop profiling and write the artifacts; returns their paths"""
+        if self._profile:
+            self._profile.disable()
+        if self._sampler:
+            self._sampler.stop()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        stem = os.path.join(
+            self.output_dir,
+            f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            + (f"_{'-'.join(self.subsystems)}" if self.subsystems else ""),
+        )
+        paths = []
+        try:
+            if self._profile:
+                paths.extend(self._export_cprofile(stem))
+            if self._sampler:
+                paths.append(self._export_collapsed(stem))
+        except Exception as e:
+            logger.error(f"Failed to export profile: {str(e)}")
+        logger.info(
+            f"Profiled {time.perf_counter() - self._started:.1f}s; "
+            f"wrote {', '.join(paths) or 'nothing'}"
+        )
+        return paths
+
+    def _export_cprofile(self, stem: str) -> List[str]:
+        import io
+        import pstats
+        import re
+
+        prof_path = f"{stem}.prof"
+        self._profile.dump_stats(prof_path)
+
+        report = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=report)
+        stats.sort_stats("cumulative")
+        restrictions = [PROFILING_SETTINGS["REPORT_ROWS"]]
+        if self.patterns:
+            # pstats matches restrictions against "path:line(function)"
+            restrictions.insert(0, "|".join(re.escape(p) for p in self.patterns))
+        stats.print_stats(*restrictions)
+        report_path = f"{stem}.txt"
+        with open(report_path, "w", encoding="utf-8") as f:
+            f.write(report.getvalue())
+        return [prof_path, report_path]
+
+    def _export_collapsed(self, stem: str) -> str:
+        path = f"{stem}.collapsed"
+        lines = self._sampler.collapsed(self.patterns)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + ("\n" if lines else ""))
+        logger.info(
+            f"Collected {self._sampler.samples} samples, {len(lines)} distinct stacks"
+        )
+        return path
@@ -0,0 +1,421 @@
+"""Single-pass extraction and schema validation of JSON in AI responses.
+
+Models wrap JSON in code fences and chatter, use single quotes, leave
+trailing commas, write Python literals, forget to escape newlines and get
+cut off mid-object. ``repair_json`` fixes all of that in one scan from the
+first brace to its match, so ``extract_json`` never parses a response more
+than twice (a failed fast path on untouched text, then the repair).
+``parse_response`` then checks the data against a dataclass schema,
+coercing near misses such as ``"12"`` for an int, and returns the typed
+object. ``json_schema`` turns the same dataclass into the JSON Schema
+sent with structured-output requests.
+"""
+
+import dataclasses
+import json
+import re
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+from src.utils.metrics import metrics
+
+T = TypeVar("T")
+
+JSON_REPAIRS = metrics.counter(
+    "ai_json_repairs_total", "Responses that were not valid JSON as received"
+)
+
+_CLOSERS = {"{": "}", "[": "]"}
+# Tokens after which a value (not a comma) is expected
+_EXPECTS_VALUE = {"{", "[", ",", ":"}
+# A quote inside a string only ends it when one of these comes next
+_AFTER_STRING = {",", ":", "}", "]", "/"}
+_STRING_STOP = {
+    '"': re.compile(r'[\\"\n\r\t]'),
+    "'": re.compile(r"[\\'\"\n\r\t]"),
+}
+# Strings with nothing to repair, read in one match
+_PLAIN_STRING = {
+    '"': re.compile(r'"[^\\"\n\r\t]*"'),
+    "'": re.compile(r"'([^\\'\"\n\r\t]*)'"),
+}
+_STRING_ESCAPES = {'"': '\\"', "\n": "\\n", "\r": "\\r", "\t": "\\t"}
+_VALID_ESCAPE = re.compile(r'\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4})')
+# One token of possibly broken JSON, after any whitespace; no group at the end
+_TOKEN = re.compile(
+    r"""[ \t\r\n]*(?:
+        (?P<separator>[,:])
+      | (?P<close>[}\]])
+      | (?P<string>["'])
+      | (?P<open>[{\[])
+      | (?P<number>[-+.0-9][-+.0-9eE]*)
+      | (?P<word>[^\W\d]\w*)
+      | (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+      | (?P<other>.)
+    )?""",
+    re.S | re.X,
+)
+_NUMBER = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?")
+_BARE_VALUE = re.compile(r"[^,}\]\n]+")
+_LITERALS = {
+    "true": "true",
+    "false": "false",
+    "null": "null",
+    "True": "true",
+    "False": "false",
+    "None": "null",
+}
+_INTEGER = re.compile(r"-?\d+")
+
+
+class SchemaError(ValueError):
+    """The response was JSON, but not the shape the prompt asked for"""
+
+
+def _ends_string(text: str, i: int) -> bool:
+    """Whether a quote just before ``text[i]`` closes the string it is in"""
+    n = len(text)
+    j = i
+    while j < n and text[j] in " \t\r\n":
+        j += 1
+    if j == n or text[j] in _AFTER_STRING:
+        return True
+    # Another string on a new line: the model left out a comma
+    return text[j] in "\"'" and "\n" in text[i:j]
+
+
+def _read_string(text: str, i: int, quote: str) -> Tuple[str, int]:
+    """Read the string opening at ``text[i]`` as a double-quoted JSON token"""
+    plain = _PLAIN_STRING[quote].match(text, i)
+    if plain and _ends_string(text, plain.end()):
+        token = plain.group() if quote == '"' else f'"{plain.group(1)}"'
+        return token, plain.end()
+
+    parts = ['"']
+    stop = _STRING_STOP[quote]
+    i += 1
+    while True:
+        match = stop.search(text, i)
+        if not match:
+            # Cut off mid-string: keep what arrived
+            parts.append(text[i:])
+            parts.append('"')
+            return "".join(parts), len(text)
+        j = match.start()
+        parts.append(text[i:j])
+        char = text[j]
+        if char == "\\":
+            escape = _VALID_ESCAPE.match(text, j)
+            if escape:
+                parts.append(escape.group())
+                i = escape.end()
+            elif text.startswith("\\'", j):
+                parts.append("'")
+                i = j + 2
+            else:
+                parts.append("\\\\")
+                i = j + 1
+        elif char == quote:
+            i = j + 1
+            if _ends_string(text, i):
+                parts.append('"')
+                return "".join(parts), i
+            # An apostrophe or unescaped quote inside the text
+            parts.append('\\"' if quote == '"' else "'")
+        else:
+            parts.append(_STRING_ESCAPES[char])
+            i = j + 1
+
+
+def _drop_dangling(out: List[str], closer: str):
+    """Remove trailing commas and keys left without a value"""
+    while len(out) > 1:
+        last = out[-1]
+        if last == ",":
+            out.pop()
+        elif last == ":":
+            del out[-2:]
+        elif closer == "}" and last[0] == '"' and out[-2] in ("{", ","):
+            out.pop()
+        else:
+            break
+
+
+def repair_json(text: str) -> Optional[str]:
+    """The outermost JSON object or array in ``text``, repaired in one scan.
+
+    Returns None when there is no ``{`` or ``[`` at all. The result is
+    usually, but not always, valid JSON; ``extract_json`` parses it.
+    """
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if not starts:
+        return None
+
+    out: List[str] = []
+    closers: List[str] = []
+    i = min(starts)
+    while True:
+        match = _TOKEN.match(text, i)
+        kind = match.lastgroup
+        if kind is None:
+            # Ran out of input: the response was truncated
+            for closer in reversed(closers):
+                _drop_dangling(out, closer)
+                out.append(closer)
+            break
+        i = match.end()
+        if kind == "separator":
+            out.append(match.group(kind))
+            continue
+        if kind == "close":
+            _drop_dangling(out, closers[-1])
+            out.append(closers.pop())
+            if not closers:
+                break
+            continue
+        if kind in ("comment", "other"):
+            continue
+
+        # A value or key; supply the comma if the model left it out
+        if out and out[-1] not in _EXPECTS_VALUE:
+            out.append(",")
+        if kind == "string":
+            token, i = _read_string(text, match.start(kind), match.group(kind))
+        elif kind == "open":
+            token = match.group(kind)
+            closers.append(_CLOSERS[token])
+        elif kind == "number":
+            # "10-30" and "+5" become 10 and 5; nothing usable is dropped
+            number = _NUMBER.match(match.group(kind).lstrip("+"))
+            if not number:
+                if out[-1] == ",":
+                    out.pop()
+                continue
+            token = number.group()
+        elif out[-1] == ":":
+            # Unquoted value: everything up to the next delimiter
+            bare = _BARE_VALUE.match(text, match.start(kind))
+            i = bare.end()
+            value = bare.group().strip()
+            token = _LITERALS.get(value) or json.dumps(value)
+        else:
+            word = match.group(kind)
+            token = _LITERALS.get(word) or json.dumps(word)
+        out.append(token)
+    return "".join(out)
+
+
+def extract_json(text: str) -> Any:
+    """Parse the JSON value in a response; raises ValueError if there is none"""
+    stripped = text.strip()
+    if stripped[:1] in ("{", "["):
+        try:
+            return json.loads(stripped)
+        except json.JSONDecodeError:
+            pass
+    repaired = repair_json(text)
+    if repaired is None:
+        JSON_REPAIRS.inc(outcome="no_json")
+        raise ValueError("No JSON object or array in the response")
+    try:
+        data = json.loads(repaired)
+    except json.JSONDecodeError:
+        JSON_REPAIRS.inc(outcome="failed")
+        raise
+    JSON_REPAIRS.inc(outcome="repaired")
+    return data
+
+
+def _to_int(value: Any) -> int:
+    if isinstance(value, bool):
+        raise ValueError(f"expected an integer, got {value!r}")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return round(value)
+    if isinstance(value, str):
+        match = _INTEGER.search(value)
+        if match:
+            return int(match.group())
+    raise ValueError(f"expected an integer, got {value!r}")
+
+
+def _to_float(value: Any) -> float:
+    if isinstance(value, bool):
+        raise ValueError(f"expected a number, got {value!r}")
+    return float(value)
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+        return value.strip().lower() == "true"
+    raise ValueError(f"expected true or false, got {value!r}")
+
+
+def _to_str(value: Any) -> str:
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    raise ValueError(f"expected text, got {type(value).__name__}")
+
+
+def _converter(hint: Any) -> Callable[[Any], Any]:
+    """Build the validating conversion for one annotated type"""
+    origin = get_origin(hint)
+    args = get_args(hint)
+    if hint is Any:
+        return lambda value: value
+    if origin is Union:
+        inner = _converter(next(a for a in args if a is not type(None)))
+        return lambda value: None if value is None else inner(value)
+    if origin is list:
+        item = _converter(args[0]) if args else (lambda value: value)
+        split_text = bool(args) and args[0] is str
+
+        def convert_list(value: Any) -> list:
+            if isinstance(value, str) and split_text:
+                value = value.splitlines()
+            elif not isinstance(value, list):
+                value = [value]
+            return [item(v) for v in value]
+
+        return convert_list
+    if origin is dict or hint is dict:
+
+        def convert_dict(value: Any) -> dict:
+            if not isinstance(value, dict):
+                raise ValueError(f"expected an object, got {type(value).__name__}")
+            return value
+
+        return convert_dict
+    if dataclasses.is_dataclass(hint):
+        return lambda value: validate(value, hint)
+    simple = {int: _to_int, float: _to_float, bool: _to_bool, str: _to_str}
+    if hint in simple:
+        return simple[hint]
+    raise TypeError(f"Unsupported schema type: {hint}")
+
+
+@lru_cache(maxsize=None)
+def _schema_fields(schema: type) -> Tuple[Tuple[str, Callable[[Any], Any], bool], ...]:
+    """(name, converter, required) for each field, compiled once per schema"""
+    hints = get_type_hints(schema)
+    return tuple(
+        (
+            f.name,
+            _converter(hints[f.name]),
+            f.default is dataclasses.MISSING
+            and f.default_factory is dataclasses.MISSING,
+        )
+        for f in dataclasses.fields(schema)
+        if f.init
+    )
+
+
+def _json_type(hint: Any) -> Dict[str, Any]:
+    if get_origin(hint) is Union:
+        inner = _json_type(next(a for a in get_args(hint) if a is not type(None)))
+        if isinstance(inner.get("type"), str):
+            return dict(inner, type=[inner["type"], "null"])
+        return {"anyOf": [inner, {"type": "null"}]}
+    if get_origin(hint) is list:
+        return {"type": "array", "items": _json_type(get_args(hint)[0])}
+    if dataclasses.is_dataclass(hint):
+        return json_schema(hint)
+    simple = {int: "integer", float: "number", bool: "boolean", str: "string"}
+    if hint in simple:
+        return {"type": simple[hint]}
+    raise TypeError(f"No strict JSON Schema for {hint}")
+
+
+@lru_cache(maxsize=None)
+def json_schema(schema: type) -> Dict[str, Any]:
+    """JSON Schema for a dataclass, in the strict structured-output subset.
+
+    Strict mode wants every property required and no others allowed, so
+    fields with defaults are listed too; ``Optional`` ones become
+    nullable, and ``validate`` treats null as "use the default". A
+    ``description`` in a field's metadata is passed on to the model.
+    Cached; do not modify the result.
+    """
+    hints = get_type_hints(schema)
+    properties = {}
+    for f in dataclasses.fields(schema):
+        if not f.init:
+            continue
+        prop = _json_type(hints[f.name])
+        if "description" in f.metadata:
+            prop = dict(prop, description=f.metadata["description"])
+        properties[f.name] = prop
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+def validate(data: Any, schema: Type[T]) -> T:
+    """Check parsed JSON against a dataclass schema and build the instance.
+
+    Unknown keys are ignored, keys are matched case-insensitively when
+    the exact name is missing, and optional fields fall back to their
+    defaults. A bare array fills a schema whose only field is a list.
+    Raises ``SchemaError`` when the data does not fit.
+    """
+    name = schema.__name__
+    fields = _schema_fields(schema)
+    if isinstance(data, list) and len(fields) == 1:
+        data = {fields[0][0]: data}
+    if not isinstance(data, dict):
+        raise SchemaError(f"{name} expects an object, got {type(data).__name__}")
+    folded: Optional[Dict[str, Any]] = None
+    values: Dict[str, Any] = {}
+    for field_name, convert, required in fields:
+        value = data.get(field_name)
+        if value is None and field_name not in data:
+            if folded is None:
+                folded = {str(k).strip().lower(): v for k, v in data.items()}
+            value = folded.get(field_name)
+        if value is None:
+            if required:
+                raise SchemaError(f"{name} is missing {field_name}")
+            continue
+        try:
+            values[field_name] = convert(value)
+        except (TypeError, ValueError) as e:
+            raise SchemaError(f"{name}.{field_name}: {e}") from None
+    return schema(**values)
+
+
+def parse_response(text: str, schema: Type[T]) -> T:
+    """Extract, repair and validate a response in one pass.
+
+    Schemas that define a ``from_text`` classmethod accept responses with
+    no JSON in them at all (raw ASCII art, for instance). Raises
+    ``ValueError`` (``SchemaError`` for shape problems) on failure.
+    """
+    try:
+        data = extract_json(text)
+    except ValueError:
+        from_text = getattr(schema, "from_text", None)
+        if from_text is None:
+            raise
+        return from_text(text)
+    return validate(data, schema)
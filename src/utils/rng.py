@@ -0,0 +1,155 @@
+"""Seeded random number streams, one per game subsystem.
+
+Each stream is a ``random.Random`` seeded from the session seed and the
+stream's name, so combat rolls cannot shift loot or shop results and a
+whole session can be replayed from a single seed. The stream objects live
+as long as the process: reseeding or restoring a save updates them in
+place, so modules may keep a reference.
+
+The seed and every stream's position are stored with each save
+(``get_state``/``set_state``). Bulk sampling, e.g. in simulations, can
+take a NumPy ``Generator`` seeded from a stream with ``numpy``.
+"""
+
+import hashlib
+import logging
+import os
+import random
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, Optional
+
+from src.config.settings import RNG_SETTINGS
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+STREAMS = ("combat", "loot", "shop", "encounter", "enemies", "character")
+
+
+def derive_seed(seed: int, name: str) -> int:
+    """64-bit seed for stream ``name``, independent of the other streams"""
+    digest = hashlib.sha256(f"{seed}:{name}".encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+class ObservedStream:
+    """Forwards to a stream and reports every draw as ``(method, result)``"""
+
+    def __init__(self, stream: random.Random, report: Callable[[str, Any], None]):
+        self._stream = stream
+        self._report = report
+
+    def __getattr__(self, name: str):
+        return getattr(self._stream, name)
+
+    def random(self) -> float:
+        value = self._stream.random()
+        self._report("random", value)
+        return value
+
+    def randint(self, a: int, b: int) -> int:
+        value = self._stream.randint(a, b)
+        self._report("randint", value)
+        return value
+
+    def uniform(self, a: float, b: float) -> float:
+        value = self._stream.uniform(a, b)
+        self._report("uniform", value)
+        return value
+
+    def choice(self, seq):
+        value = self._stream.choice(seq)
+        self._report("choice", value)
+        return value
+
+    def choices(self, population, weights=None, *, cum_weights=None, k=1):
+        value = self._stream.choices(population, weights, cum_weights=cum_weights, k=k)
+        self._report("choices", value)
+        return value
+
+
+class RNGService:
+    """The session seed and the streams derived from it"""
+
+    def __init__(self, seed: Optional[int] = None):
+        self._streams: Dict[str, random.Random] = {
+            name: random.Random() for name in STREAMS
+        }
+        self.combat = self._streams["combat"]
+        self.loot = self._streams["loot"]
+        self.shop = self._streams["shop"]
+        self.encounter = self._streams["encounter"]
+        self.enemies = self._streams["enemies"]
+        self.character = self._streams["character"]
+        self.seed = 0
+        self.reseed(seed)
+
+    def reseed(self, seed: Optional[int] = None) -> int:
+        """Restart every stream from ``seed`` (a fresh one if None)"""
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(63)
+        self.seed = seed
+        for name, stream in self._streams.items():
+            stream.seed(derive_seed(seed, name))
+        return seed
+
+    def stream(self, name: str) -> random.Random:
+        return self._streams[name]
+
+    @contextmanager
+    def observe(
+        self, name: str, report: Callable[[str, Any], None]
+    ) -> Iterator[ObservedStream]:
+        """Report each draw from stream ``name`` while the block runs.
+
+        Only code that looks the stream up as ``rng.<name>`` at draw time
+        is observed, which is how every caller in the game uses it.
+        """
+        observed = ObservedStream(self._streams[name], report)
+        previous = getattr(self, name)
+        setattr(self, name, observed)
+        try:
+            yield observed
+        finally:
+            setattr(self, name, previous)
+
+    def numpy(self, name: str) -> "np.random.Generator":
+        """A NumPy generator for bulk draws, seeded by one draw from ``name``"""
+        import numpy as np
+
+        return np.random.default_rng(self._streams[name].getrandbits(64))
+
+    def get_state(self) -> Dict[str, Any]:
+        """JSON-serializable seed and stream positions"""
+        streams = {}
+        for name, stream in self._streams.items():
+            version, internal, gauss_next = stream.getstate()
+            streams[name] = [version, list(internal), gauss_next]
+        return {"seed": self.seed, "streams": streams}
+
+    def set_state(self, state: Dict[str, Any]):
+        """Restore ``get_state`` output; missing streams restart from the seed"""
+        self.reseed(state["seed"])
+        for name, saved in state.get("streams", {}).items():
+            if name not in self._streams:
+                logger.warning(f"Ignoring unknown random stream '{name}'")
+                continue
+            version, internal, gauss_next = saved
+            self._streams[name].setstate((version, tuple(internal), gauss_next))
+
+
+def configured_seed() -> Optional[int]:
+    """The GAME_SEED environment variable, else ``RNG_SETTINGS["SEED"]``"""
+    value = os.getenv("GAME_SEED")
+    if value:
+        try:
+            return int(value)
+        except ValueError:
+            logger.warning(f"Invalid GAME_SEED '{value}', using a random seed")
+            return None
+    return RNG_SETTINGS["SEED"]
+
+
+rng = RNGService(configured_seed())
@@ -0,0 +1,170 @@
+"""Span-based tracing exported as JSON lines.
+
+Spans follow the OpenTelemetry shape (trace/span ids, parent id, start and
+end times, attributes, status) so the file can be loaded by OTel tooling,
+but nothing here depends on the OpenTelemetry SDK.
+"""
+
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import wraps
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.config.settings import TRACING_SETTINGS
+
+logger = logging.getLogger(__name__)
+
+
+def _iso(ns: int) -> str:
+    return datetime.fromtimestamp(ns / 1e9, tz=timezone.utc).isoformat()
+
+
+@dataclass
+class Span:
+    """One timed operation within a trace"""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    start_ns: int = 0
+    end_ns: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = "UNSET"
+    status_description: str = ""
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        status = {"status_code": self.status}
+        if self.status_description:
+            status["description"] = self.status_description
+        return {
+            "name": self.name,
+            "context": {"trace_id": self.trace_id, "span_id": self.span_id},
+            "parent_id": self.parent_id,
+            "start_time": _iso(self.start_ns),
+            "end_time": _iso(self.end_ns),
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "status": status,
+        }
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """Creates nested spans and appends finished ones to a JSONL file.
+
+    Finished spans are buffered and written when a root span ends, so a
+    whole exploration step costs one flush. The file rotates like the game
+    log (``MAX_BYTES``/``BACKUP_COUNT``). Tracing is a no-op when disabled
+    in ``TRACING_SETTINGS``.
+    """
+
+    def __init__(self, path: Optional[str] = None, enabled: Optional[bool] = None):
+        self.path = path or TRACING_SETTINGS["EXPORT_PATH"]
+        self.enabled = TRACING_SETTINGS["ENABLED"] if enabled is None else enabled
+        self._pending: List[Span] = []
+        self._lock = threading.Lock()
+        self._writer: Optional[RotatingFileHandler] = None
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Optional[Span]]:
+        """Time the enclosed block as a child of the current span"""
+        if not self.enabled:
+            yield None
+            return
+
+        parent = _current_span.get()
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else secrets.token_hex(16),
+            span_id=secrets.token_hex(8),
+            parent_id=parent.span_id if parent else None,
+            attributes=attributes,
+        )
+        token = _current_span.set(span)
+        span.start_ns = time.time_ns()
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "ERROR"
+            span.status_description = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            _current_span.reset(token)
+            if span.status == "UNSET":
+                span.status = "OK"
+            self._finish(span, is_root=parent is None)
+
+    def traced(self, name: Optional[str] = None, **attributes):
+        """Decorator wrapping each call in a span"""
+
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name, **attributes):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def current_span(self) -> Optional[Span]:
+        return _current_span.get()
+
+    def _finish(self, span: Span, is_root: bool):
+        with self._lock:
+            self._pending.append(span)
+        if is_root:
+            self.flush()
+
+    def flush(self):
+        """Append buffered spans to the export file"""
+        with self._lock:
+            spans, self._pending = self._pending, []
+        if not spans:
+            return
+        try:
+            writer = self._get_writer()
+            for span in spans:
+                line = json.dumps(span.to_dict(), default=str)
+                writer.handle(logging.makeLogRecord({"msg": line}))
+        except Exception as e:
+            logger.error(f"Failed to export {len(spans)} spans: {str(e)}")
+
+    def _get_writer(self) -> RotatingFileHandler:
+        with self._lock:
+            if self._writer is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._writer = RotatingFileHandler(
+                    self.path,
+                    maxBytes=TRACING_SETTINGS["MAX_BYTES"],
+                    backupCount=TRACING_SETTINGS["BACKUP_COUNT"],
+                    encoding="utf-8",
+                    delay=True,
+                )
+                self._writer.setFormatter(logging.Formatter("%(message)s"))
+            return self._writer
+
+
+tracer = Tracer()